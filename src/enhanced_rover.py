@@ -1,58 +1,84 @@
 # src/enhanced_rover.py
-from typing import List, Optional, Set, Tuple
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 from hexrover.compat.plateau_compat import Plateau
+from hexrover.instrumentation import Instrumentation, RoverMetrics
+from hexrover.kernel import CODES, DELTAS, DX, DY, HEADINGS, LEFT, LEFT_OF, RIGHT, RIGHT_OF, TOKENS, long_runs, move_run
+from hexrover.optimizer import count_turns, optimize_commands
+from hexrover.ports import STOP_BOUNDARY, STOP_COLLISION
+from mission_trace import STEP_BLOCKED, STEP_LEFT, STEP_MOVED, STEP_RIGHT, MissionTraceWriter, RoverTrack
+
+
+class RoverStatistics(NamedTuple):
+    """One rover's statistics. This replaced a dict: read fields as attributes, or call _asdict()
+    where a mapping is needed (key lookup, `in`, JSON)."""
+    rover_id: str
+    final_position: str
+    moves_made: int
+    turns_made: int
+    blocked_moves: int
+    total_commands: int
+    path_length: int
+    unique_positions: int
 
 
 class EnhancedRover:
-    """Enhanced rover with collision detection and advanced features"""
+    """Enhanced rover with collision detection and advanced features.
 
-    DIRECTIONS = ["N", "E", "S", "W"]
+    With `optimize`, execute_commands collapses turn runs first (hexrover.optimizer):
+    the final state is the same, but path_history only holds the turns that ran.
+    turn_count keeps counting the original turns unless `count_original_turns` is off.
+    """
 
-    def __init__(self, x: int, y: int, heading: str, plateau: Plateau, rover_id: str = ""):
+    DIRECTIONS = list(HEADINGS)
+
+    def __init__(self, x: int, y: int, heading: str, plateau: Plateau, rover_id: str = "",
+                 optimize: bool = False, count_original_turns: bool = True):
         self.x = x
         self.y = y
         self.heading = heading
         self.plateau = plateau
         self.rover_id = rover_id
+        self.optimize = optimize
+        self.count_original_turns = count_original_turns
         self.move_count = 0
         self.turn_count = 0
         self.path_history: List[Tuple[int, int, str]] = [(x, y, heading)]
         self.blocked_moves = 0
+        # Cells stood on, kept as moves happen so visit queries and counts are O(1)
+        self._visited: Dict[Tuple[int, int], None] = {(x, y): None}
+        # Set by MissionControl so every successful move keeps its index current
+        self.occupancy: Optional['OccupancyIndex'] = None
 
     def turn_left(self):
         """Turn rover left (counter-clockwise)"""
-        idx = (self.DIRECTIONS.index(self.heading) - 1) % 4
-        self.heading = self.DIRECTIONS[idx]
+        self.heading = LEFT_OF[self.heading]
         self.turn_count += 1
         self.path_history.append((self.x, self.y, self.heading))
 
     def turn_right(self):
         """Turn rover right (clockwise)"""
-        idx = (self.DIRECTIONS.index(self.heading) + 1) % 4
-        self.heading = self.DIRECTIONS[idx]
+        self.heading = RIGHT_OF[self.heading]
         self.turn_count += 1
         self.path_history.append((self.x, self.y, self.heading))
 
     def get_next_position(self) -> Tuple[int, int]:
         """Get the position the rover would move to (without actually moving)"""
-        if self.heading == "N":
-            return self.x, self.y + 1
-        elif self.heading == "E":
-            return self.x + 1, self.y
-        elif self.heading == "S":
-            return self.x, self.y - 1
-        else:  # "W"
-            return self.x - 1, self.y
-
-    def can_move(self, other_rovers: Optional[List['EnhancedRover']] = None) -> bool:
+        dx, dy = DELTAS[self.heading]
+        return self.x + dx, self.y + dy
+
+    def can_move(self, other_rovers: Optional[List['EnhancedRover']] = None,
+                 occupancy: Optional['OccupancyIndex'] = None) -> bool:
         """Check if rover can move forward without collision"""
         new_x, new_y = self.get_next_position()
 
-        # Check plateau boundaries
-        if not self.plateau.is_within_bounds(new_x, new_y):
+        # Check plateau boundaries and obstacles
+        if not self.plateau.is_free(new_x, new_y):
             return False
 
         # Check collision with other rovers
+        if occupancy is not None:
+            return not occupancy.is_occupied(new_x, new_y, exclude=self)
         if other_rovers:
             for other in other_rovers:
                 if other != self and other.x == new_x and other.y == new_y:
@@ -60,60 +86,287 @@ class EnhancedRover:
 
         return True
 
-    def move(self, other_rovers: Optional[List['EnhancedRover']] = None) -> bool:
+    def move(self, other_rovers: Optional[List['EnhancedRover']] = None,
+             occupancy: Optional['OccupancyIndex'] = None) -> bool:
         """Move rover forward if possible. Returns True if moved, False if blocked."""
-        if self.can_move(other_rovers):
-            self.x, self.y = self.get_next_position()
-            self.move_count += 1
-            self.path_history.append((self.x, self.y, self.heading))
+        if self.can_move(other_rovers, occupancy):
+            self.advance()
             return True
         else:
             self.blocked_moves += 1
             return False
 
-    def execute_commands(self, commands: str, other_rovers: Optional[List['EnhancedRover']] = None):
-        """Execute a sequence of commands with collision detection"""
+    def advance(self):
+        """Step onto the next cell unconditionally (the caller has already cleared the move)"""
+        self.x, self.y = self.get_next_position()
+        if self.occupancy is not None:
+            self.occupancy.relocate(self)
+        self.move_count += 1
+        self.path_history.append((self.x, self.y, self.heading))
+        self._visited[self.x, self.y] = None
+
+    def execute_commands(self, commands: str, other_rovers: Optional[List['EnhancedRover']] = None,
+                         occupancy: Optional['OccupancyIndex'] = None, track: Optional[RoverTrack] = None):
+        """Execute a sequence of commands with collision detection, recording each step into `track`"""
+        if self.optimize:
+            optimized = optimize_commands(commands)
+            if self.count_original_turns:
+                self.turn_count += count_turns(commands) - count_turns(optimized)
+            commands = optimized
+        if (track is None and not other_rovers and (occupancy is None or occupancy is self.occupancy)
+                and self.plateau.obstacles is None and long_runs(commands)):
+            self._execute_runs(commands, occupancy)
+            return
+        if track is not None:
+            for cmd in commands:
+                if cmd == "L":
+                    self.turn_left()
+                    track.record(STEP_LEFT)
+                elif cmd == "R":
+                    self.turn_right()
+                    track.record(STEP_RIGHT)
+                elif cmd == "M":
+                    track.record(STEP_MOVED if self.move(other_rovers, occupancy) else STEP_BLOCKED)
+            return
         for cmd in commands:
             if cmd == "L":
                 self.turn_left()
             elif cmd == "R":
                 self.turn_right()
             elif cmd == "M":
-                self.move(other_rovers)
+                self.move(other_rovers, occupancy)
+
+    def _execute_runs(self, commands: str, occupancy: Optional['OccupancyIndex'] = None):
+        """execute_commands on a plateau without obstacles: each run of moves is clamped at the
+        edge in O(1) (hexrover.kernel.move_run), then in front of the first rover in its way
+        (OccupancyIndex.clear_steps), and its cells are added to the history in one go"""
+        max_x, max_y = self.plateau.max_x, self.plateau.max_y
+        x, y, h = self.x, self.y, CODES[self.heading]
+        history, visited = self.path_history, self._visited
+        explored = self.occupancy.explored if self.occupancy is not None else None
+        moves = blocked = turns = 0
+        for token in TOKENS.findall(commands):
+            if token[0] == "M":
+                k = len(token)
+                _, _, moved = move_run(x, y, h, k, max_x, max_y)
+                if moved and occupancy is not None:
+                    moved = occupancy.clear_steps(x, y, h, moved, exclude=self)
+                if moved:
+                    dx, dy, heading = DX[h], DY[h], HEADINGS[h]
+                    cells = [(x + dx * i, y + dy * i) for i in range(1, moved + 1)]
+                    history.extend([(cx, cy, heading) for cx, cy in cells])
+                    visited.update(dict.fromkeys(cells))
+                    if explored is not None:
+                        explored.update(cells)
+                    x, y = x + dx * moved, y + dy * moved
+                moves += moved
+                blocked += k - moved
+                continue
+            for cmd in token:
+                if cmd == "L":
+                    h = LEFT[h]
+                elif cmd == "R":
+                    h = RIGHT[h]
+                else:
+                    continue
+                turns += 1
+                history.append((x, y, HEADINGS[h]))
+        self.x, self.y, self.heading = x, y, HEADINGS[h]
+        if self.occupancy is not None and moves:
+            self.occupancy.relocate(self)
+        self.move_count += moves
+        self.blocked_moves += blocked
+        self.turn_count += turns
 
     def get_position(self) -> str:
         """Get current position as string"""
         return f"{self.x} {self.y} {self.heading}"
 
-    def get_statistics(self) -> dict:
+    def get_statistics(self) -> RoverStatistics:
         """Get rover movement statistics"""
-        return {
-            'rover_id': self.rover_id,
-            'final_position': self.get_position(),
-            'moves_made': self.move_count,
-            'turns_made': self.turn_count,
-            'blocked_moves': self.blocked_moves,
-            'total_commands': self.move_count + self.turn_count,
-            'path_length': len(self.path_history),
-            'unique_positions': len(set((x, y) for x, y, _ in self.path_history))
-        }
+        return RoverStatistics(self.rover_id, self.get_position(), self.move_count, self.turn_count,
+                               self.blocked_moves, self.move_count + self.turn_count,
+                               len(self.path_history), len(self._visited))
 
     def has_visited_position(self, x: int, y: int) -> bool:
         """Check if rover has visited a specific position"""
-        return any(pos_x == x and pos_y == y for pos_x, pos_y, _ in self.path_history)
+        return (x, y) in self._visited
 
     def get_visited_positions(self) -> Set[Tuple[int, int]]:
         """Get all positions visited by this rover"""
-        return set((x, y) for x, y, _ in self.path_history)
+        return set(self._visited)
+
+
+class OccupancyIndex:
+    """Cell -> rovers lookup so collision checks don't scan the whole fleet.
+
+    clear_steps() also keeps rovers sorted by row and by column, built on first use and
+    kept current from then on: a run of moves finds the first rover in its way by bisect.
+    """
+
+    def __init__(self):
+        self._cells: Dict[Tuple[int, int], List[EnhancedRover]] = {}
+        self._where: Dict[int, Tuple[int, int]] = {}
+        self._order: Dict[int, int] = {}
+        # Every cell a registered rover has stood on: the fleet's explored area
+        self.explored: Set[Tuple[int, int]] = set()
+        # row -> sorted xs and column -> sorted ys of every registered rover (one per rover)
+        self._rows: Optional[Dict[int, List[int]]] = None
+        self._cols: Optional[Dict[int, List[int]]] = None
+
+    @classmethod
+    def from_rovers(cls, rovers: List[EnhancedRover]) -> 'OccupancyIndex':
+        """Build an index from the rovers' current positions, in fleet order"""
+        index = cls()
+        for rover in rovers:
+            index.add(rover)
+        return index
+
+    def add(self, rover: EnhancedRover):
+        """Register a rover at its current position"""
+        self._order.setdefault(id(rover), len(self._order))
+        self._place(rover)
+
+    def relocate(self, rover: EnhancedRover):
+        """Move a registered rover's entry to its current position"""
+        old = self._where[id(rover)]
+        bucket = self._cells[old]
+        bucket.remove(rover)
+        if not bucket:
+            del self._cells[old]
+        rows, cols = self._rows, self._cols
+        if rows is not None and cols is not None:
+            x, y = old
+            rows[y].remove(x)
+            cols[x].remove(y)
+        self._place(rover)
+
+    def clear_steps(self, x: int, y: int, h: int, steps: int, exclude: Optional[EnhancedRover] = None) -> int:
+        """How many of `steps` moves from (x, y) along heading code h (hexrover.kernel) end
+        before the first rover in the way, ignoring `exclude`'s entry (it may lag behind while
+        it runs). Only valid while the other indexed rovers stand still, such as during one
+        rover's turn in MissionControl.execute_mission."""
+        rows, cols = self._rows, self._cols
+        if rows is None or cols is None:
+            rows, cols = {}, {}
+            for cx, cy in self._where.values():
+                insort(rows.setdefault(cy, []), cx)
+                insort(cols.setdefault(cx, []), cy)
+            self._rows, self._cols = rows, cols
+        own = self._where.get(id(exclude))
+        own_at: Optional[int] = None  # exclude's coordinate along the line, if it stands on it
+        if h & 1:  # E or W: along the row
+            line, at = rows.get(y), x
+            if own is not None and own[1] == y:
+                own_at = own[0]
+        else:
+            line, at = cols.get(x), y
+            if own is not None and own[0] == x:
+                own_at = own[1]
+        if not line:
+            return steps
+        if h < 2:  # N or E: coordinates increase
+            i = bisect_right(line, at)
+            if i < len(line) and line[i] == own_at:
+                i += 1  # skip one entry: another rover may share the cell
+            return steps if i == len(line) else min(steps, line[i] - at - 1)
+        i = bisect_left(line, at)
+        if i and line[i - 1] == own_at:
+            i -= 1
+        return steps if i == 0 else min(steps, at - line[i - 1] - 1)
+
+    def occupant(self, x: int, y: int) -> Optional[EnhancedRover]:
+        """Get the first rover registered at a cell, if any"""
+        bucket = self._cells.get((x, y))
+        return bucket[0] if bucket else None
+
+    def is_occupied(self, x: int, y: int, exclude: Optional[EnhancedRover] = None) -> bool:
+        """Check if a cell holds any rover other than `exclude`"""
+        bucket = self._cells.get((x, y))
+        if not bucket:
+            return False
+        return len(bucket) > 1 or bucket[0] is not exclude
+
+    def collisions(self) -> List[Tuple[EnhancedRover, EnhancedRover]]:
+        """Pairs of rovers sharing a cell, ordered by registration like a pairwise scan"""
+        order = self._order
+        pairs = []
+        for bucket in self._cells.values():
+            if len(bucket) < 2:
+                continue
+            ranked = sorted(bucket, key=lambda rover: order[id(rover)])
+            for i, rover1 in enumerate(ranked):
+                for rover2 in ranked[i + 1:]:
+                    pairs.append((rover1, rover2))
+        pairs.sort(key=lambda pair: (order[id(pair[0])], order[id(pair[1])]))
+        return pairs
+
+    def _place(self, rover: EnhancedRover):
+        cell = (rover.x, rover.y)
+        self._cells.setdefault(cell, []).append(rover)
+        self._where[id(rover)] = cell
+        self.explored.add(cell)
+        rows, cols = self._rows, self._cols
+        if rows is not None and cols is not None:
+            insort(rows.setdefault(cell[1], []), cell[0])
+            insort(cols.setdefault(cell[0], []), cell[1])
+
+
+class StepCounter:
+    """Counts a rover's steps into its RoverMetrics, passing them on to a trace track if given.
+
+    Stands in for a RoverTrack, so instrumented missions reuse the per-step hook that
+    traces already have and uninstrumented ones pay nothing.
+    """
+
+    def __init__(self, metrics: RoverMetrics, rover: EnhancedRover, track: Optional[RoverTrack] = None):
+        self.metrics = metrics
+        self.rover = rover
+        self.track = track
+
+    def record(self, code: int):
+        metrics = self.metrics
+        if code == STEP_MOVED:
+            metrics.forwards += 1
+        elif code == STEP_BLOCKED:
+            metrics.forwards += 1
+            # the rover is still in front of whatever stopped it
+            blocked_by_rover = self.rover.plateau.is_free(*self.rover.get_next_position())
+            metrics.stop(STOP_COLLISION if blocked_by_rover else STOP_BOUNDARY)
+        else:
+            metrics.turns += 1
+        if self.track is not None:
+            self.track.record(code)
+
+
+class _CountingTrace:
+    """MissionTraceWriter stand-in for the lockstep scheduler: hands out StepCounters"""
+
+    def __init__(self, instrumentation: Instrumentation, trace: Optional[MissionTraceWriter]):
+        self.instrumentation = instrumentation
+        self.trace = trace
+
+    def track(self, rover: EnhancedRover) -> StepCounter:
+        track = self.trace.track(rover) if self.trace is not None else None
+        return StepCounter(self.instrumentation.rover(rover.rover_id), rover, track)
 
 
 class MissionControl:
     """Manages multiple rovers with collision detection and mission statistics"""
 
-    def __init__(self, plateau: Plateau):
+    def __init__(self, plateau: Plateau, instrumentation: Optional[Instrumentation] = None,
+                 optimize: bool = False, count_original_turns: bool = True, collisions: bool = True):
         self.plateau = plateau
+        # without collisions rovers pass through each other like main.run_simulation's do;
+        # execute_mission still indexes them for the statistics
+        self.collisions = collisions
+        # passed to every rover: execute_mission collapses turn runs (lockstep never does)
+        self.optimize = optimize
+        self.count_original_turns = count_original_turns
         self.rovers: List[EnhancedRover] = []
         self.mission_log: List[str] = []
+        self.occupancy = OccupancyIndex()
+        self.instrumentation = instrumentation
 
     def add_rover(self, x: int, y: int, heading: str, rover_id: str = "") -> EnhancedRover:
         """Add a new rover to the mission"""
@@ -121,20 +374,70 @@ class MissionControl:
             rover_id = f"Rover-{len(self.rovers) + 1}"
 
         # Check if position is already occupied
-        for existing_rover in self.rovers:
-            if existing_rover.x == x and existing_rover.y == y:
-                raise ValueError(f"Position ({x}, {y}) is already occupied by {existing_rover.rover_id}")
+        existing_rover = self.occupancy.occupant(x, y)
+        if existing_rover is not None and self.collisions:
+            raise ValueError(f"Position ({x}, {y}) is already occupied by {existing_rover.rover_id}")
+        if self.plateau.is_blocked(x, y):
+            raise ValueError(f"Position ({x}, {y}) is blocked by an obstacle")
 
-        rover = EnhancedRover(x, y, heading, self.plateau, rover_id)
+        rover = EnhancedRover(x, y, heading, self.plateau, rover_id, self.optimize, self.count_original_turns)
         self.rovers.append(rover)
+        self.occupancy.add(rover)
+        rover.occupancy = self.occupancy
         self.mission_log.append(f"Deployed {rover_id} at ({x}, {y}) facing {heading}")
         return rover
 
-    def execute_mission(self, rover_commands: List[Tuple[EnhancedRover, str]]):
-        """Execute commands for all rovers in sequence"""
+    def execute_mission(self, rover_commands: List[Tuple[EnhancedRover, str]],
+                        trace: Optional[MissionTraceWriter] = None):
+        """Execute commands for all rovers in sequence, optionally recording a binary trace.
+
+        Only the active rover moves, so on a plateau without obstacles its long runs of moves
+        stop at the edge or the first rover in the way in O(log n) (OccupancyIndex.clear_steps).
+        """
+        instrumentation = self.instrumentation
+        occupancy = self.occupancy if self.collisions else None
+        self._track_fleet(trace)
         for rover, commands in rover_commands:
             self.mission_log.append(f"Executing commands for {rover.rover_id}: {commands}")
-            rover.execute_commands(commands, self.rovers)
+            track = trace.track(rover) if trace is not None else None
+            if instrumentation is None:
+                rover.execute_commands(commands, occupancy=occupancy, track=track)
+                continue
+            with instrumentation.timed(rover.rover_id) as metrics:
+                rover.execute_commands(commands, occupancy=occupancy,
+                                       track=StepCounter(metrics, rover, track))
+
+    def execute_lockstep(self, rover_commands: List[Tuple[EnhancedRover, str]],
+                         trace: Optional[MissionTraceWriter] = None) -> int:
+        """Execute commands for all rovers simultaneously, one command per rover per tick.
+
+        Returns the number of ticks run. See lockstep.LockstepScheduler for conflict rules.
+        """
+        from lockstep import LockstepScheduler
+        for rover, commands in rover_commands:
+            self.mission_log.append(f"Executing commands for {rover.rover_id}: {commands}")
+        self._track_fleet(trace)
+        if self.instrumentation is not None:
+            trace = _CountingTrace(self.instrumentation, trace)
+        ticks = LockstepScheduler(self, rover_commands, trace).run()
+        self.mission_log.append(f"Lockstep execution finished after {ticks} ticks")
+        return ticks
+
+    def _track_fleet(self, trace: Optional[MissionTraceWriter]):
+        """Give every rover a trace record in fleet order, including any without commands"""
+        if trace is not None:
+            for rover in self.rovers:
+                trace.track(rover)
+
+    def plan_coverage(self) -> List[Tuple[EnhancedRover, str]]:
+        """Sweep plans that cover the plateau together, ready for execute_mission (in this order)"""
+        from hexrover.coverage import CoveragePlanner
+        planner = CoveragePlanner(self.plateau)
+        plans = planner.plan([(rover.x, rover.y, rover.heading) for rover in self.rovers])
+        self.mission_log.append(f"Planned coverage sweeps for {len(self.rovers)} rovers")
+        if planner.missed:
+            self.mission_log.append(f"Coverage plan misses {len(planner.missed)} reachable cells")
+        return list(zip(self.rovers, plans))
 
     def get_mission_statistics(self) -> dict:
         """Get comprehensive mission statistics"""
@@ -149,29 +452,24 @@ class MissionControl:
         total_moves = sum(rover.move_count for rover in self.rovers)
         total_turns = sum(rover.turn_count for rover in self.rovers)
         total_blocked = sum(rover.blocked_moves for rover in self.rovers)
-
-        all_visited = set()
-        for rover in self.rovers:
-            all_visited.update(rover.get_visited_positions())
+        explored = len(self.occupancy.explored)
 
         stats['aggregates'] = {
             'total_moves': total_moves,
             'total_turns': total_turns,
             'total_blocked_moves': total_blocked,
-            'unique_positions_explored': len(all_visited),
-            'plateau_coverage': f"{len(all_visited) / ((self.plateau.max_x + 1) * (self.plateau.max_y + 1)) * 100:.1f}%"
+            'unique_positions_explored': explored,
+            'plateau_coverage': f"{explored / ((self.plateau.max_x + 1) * (self.plateau.max_y + 1)) * 100:.1f}%"
         }
+        if self.instrumentation is not None:
+            stats['instrumentation'] = self.instrumentation.snapshot()
 
         return stats
 
     def detect_collisions(self) -> List[Tuple[EnhancedRover, EnhancedRover]]:
         """Detect any rovers occupying the same position"""
-        collisions = []
-        for i, rover1 in enumerate(self.rovers):
-            for j, rover2 in enumerate(self.rovers[i + 1:], i + 1):
-                if rover1.x == rover2.x and rover1.y == rover2.y:
-                    collisions.append((rover1, rover2))
-        return collisions
+        # Bucket the current positions afresh (O(n)) so rovers placed by hand are caught too
+        return OccupancyIndex.from_rovers(self.rovers).collisions()
 
     def print_mission_report(self):
         """Print a comprehensive mission report"""
@@ -195,12 +493,12 @@ class MissionControl:
 
         print(f"\n🤖 INDIVIDUAL ROVER REPORTS:")
         for rover_stat in stats['rover_stats']:
-            print(f"   {rover_stat['rover_id']}:")
-            print(f"      Final Position: {rover_stat['final_position']}")
-            print(f"      Moves Made: {rover_stat['moves_made']}")
-            print(f"      Turns Made: {rover_stat['turns_made']}")
-            print(f"      Blocked Moves: {rover_stat['blocked_moves']}")
-            print(f"      Unique Positions: {rover_stat['unique_positions']}")
+            print(f"   {rover_stat.rover_id}:")
+            print(f"      Final Position: {rover_stat.final_position}")
+            print(f"      Moves Made: {rover_stat.moves_made}")
+            print(f"      Turns Made: {rover_stat.turns_made}")
+            print(f"      Blocked Moves: {rover_stat.blocked_moves}")
+            print(f"      Unique Positions: {rover_stat.unique_positions}")
 
         # Check for collisions
         collisions = self.detect_collisions()
@@ -211,6 +509,11 @@ class MissionControl:
         else:
             print(f"\n✅ NO COLLISIONS DETECTED")
 
+        if self.instrumentation is not None:
+            print(f"\n⏱️  INSTRUMENTATION:")
+            for line in self.instrumentation.format_report().splitlines():
+                print(f"   {line}")
+
         print(f"\n📋 MISSION LOG:")
         for i, log_entry in enumerate(stats['mission_log'], 1):
             print(f"   {i:2d}. {log_entry}")
@@ -218,13 +521,18 @@ class MissionControl:
         print(f"\n{'=' * 60}")
 
 
-def run_enhanced_simulation(input_str: str, enable_collisions: bool = True) -> dict:
-    """Run simulation with enhanced rovers and collision detection"""
+def run_enhanced_simulation(input_str: str, enable_collisions: bool = True, trace: Optional[str] = None,
+                            obstacles=None, instrumentation: Optional[Instrumentation] = None,
+                            optimize: bool = False) -> dict:
+    """Run simulation with enhanced rovers and collision detection (and a binary trace file if given).
+
+    With enable_collisions off, rovers ignore each other, matching main.run_simulation.
+    """
     lines = input_str.strip().splitlines()
     max_x, max_y = map(int, lines[0].split())
-    plateau = Plateau(max_x, max_y)
+    plateau = Plateau(max_x, max_y, obstacles)
 
-    mission_control = MissionControl(plateau)
+    mission_control = MissionControl(plateau, instrumentation, optimize, collisions=enable_collisions)
     rover_commands = []
 
     # Parse rovers and commands
@@ -236,7 +544,11 @@ def run_enhanced_simulation(input_str: str, enable_collisions: bool = True) -> d
         rover_commands.append((rover, commands))
 
     # Execute mission
-    mission_control.execute_mission(rover_commands)
+    if trace:
+        with MissionTraceWriter(trace, plateau) as writer:
+            mission_control.execute_mission(rover_commands, writer)
+    else:
+        mission_control.execute_mission(rover_commands)
 
     # Return comprehensive results
     return mission_control.get_mission_statistics()
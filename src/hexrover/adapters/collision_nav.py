@@ -1,14 +1,46 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Set
-from ..ports import Navigator, Position, Heading
+from types import MappingProxyType
+from typing import Dict, Mapping, Set, Tuple
+from ..kernel import CODES, ENUMS
+from ..ports import STOP_COLLISION, Navigator, Position, Heading
 
-@dataclass
 class Occupancy:
-    positions: Dict[str, Position]
+    """Where each rover stands. `positions` is a read-only view: every move goes through commit()."""
+    def __init__(self, positions: Mapping[str, Position]) -> None:
+        self._positions: Dict[str, Position] = dict(positions)
+        self._index: Dict[Position, Set[str]] = {}
+        for rid, pos in self._positions.items():
+            self._index.setdefault(pos, set()).add(rid)
+
+    @property
+    def positions(self) -> Mapping[str, Position]:
+        return MappingProxyType(self._positions)
+
+    def __repr__(self) -> str:
+        return f"Occupancy(positions={self._positions!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Occupancy): return NotImplemented
+        return self._positions == other._positions
 
     def occupied_except(self, self_id: str) -> Set[Position]:
-        return {pos for rid, pos in self.positions.items() if rid != self_id}
+        return {pos for rid, pos in self._positions.items() if rid != self_id}
+
+    def is_occupied_by_other(self, pos: Position, self_id: str) -> bool:
+        ids = self._index.get(pos)
+        if not ids: return False
+        return len(ids) > 1 or self_id not in ids
+
+    def commit(self, rover_id: str, pos: Position) -> None:
+        """Record that `rover_id` now stands on `pos` (adds it if unknown)."""
+        old = self._positions.get(rover_id)
+        if old is not None:
+            ids = self._index[old]
+            ids.discard(rover_id)
+            if not ids: del self._index[old]
+        self._positions[rover_id] = pos
+        self._index.setdefault(pos, set()).add(rover_id)
 
 @dataclass
 class CollisionNavigator(Navigator):
@@ -19,8 +51,29 @@ class CollisionNavigator(Navigator):
     def forward(self, pos: Position, heading: Heading) -> Position:
         nxt = self.inner.forward(pos, heading)
         if nxt == pos: return pos
-        if nxt in self.occ.occupied_except(self_id=self.self_id): return pos
+        if self.occ.is_occupied_by_other(nxt, self.self_id): return pos
         return nxt
 
+    def commit(self, pos: Position) -> None:
+        self.occ.commit(self.self_id, pos)
+
+    def execute(self, x: int, y: int, h: int, commands: str) -> Tuple[int, int, int]:
+        """
+        Whole command string (h is a kernel heading code). The other rovers stand still
+        meanwhile, so only the final position is committed to the shared Occupancy.
+        """
+        start = pos = Position(x, y)
+        head, inner = ENUMS[h], self.inner
+        for c in commands:
+            if c == "M": pos = self.forward(pos, head)
+            elif c == "L": head = inner.turn_left(head)
+            elif c == "R": head = inner.turn_right(head)
+        if pos != start: self.commit(pos)
+        return pos.x, pos.y, CODES[head]
+
+    def stop_reason(self, pos: Position, heading: Heading) -> str:
+        if self.inner.forward(pos, heading) == pos: return self.inner.stop_reason(pos, heading)
+        return STOP_COLLISION
+
     def turn_left(self, heading: Heading) -> Heading:  return self.inner.turn_left(heading)
     def turn_right(self, heading: Heading) -> Heading: return self.inner.turn_right(heading)
@@ -1,37 +1,129 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Optional, Tuple
 from ..ports import Navigator, Position, Heading
+from ..kernel import (DELTAS, DX, DY, ENUMS, LEFT, LEFT_OF_HEADING, PACKED_LETTERS, PACKED_STEPS, RIGHT,
+                      RIGHT_OF_HEADING, long_runs, run_lengths)
+from .terrain import Obstacles
 
 @dataclass(frozen=True)
 class Plateau:
     max_x: int
     max_y: int
+    obstacles: Optional[Obstacles] = None
+    def __post_init__(self) -> None:
+        obstacles = self.obstacles
+        if obstacles is not None and (obstacles.width, obstacles.height) != (self.max_x + 1, self.max_y + 1):
+            raise ValueError(f"Obstacle map is {obstacles.width} x {obstacles.height} "
+                             f"but the plateau is {self.max_x + 1} x {self.max_y + 1}")
     def is_within_bounds(self, x: int, y: int) -> bool:
         return 0 <= x <= self.max_x and 0 <= y <= self.max_y
+    def is_blocked(self, x: int, y: int) -> bool:
+        return self.obstacles is not None and self.obstacles.is_blocked(x, y)
+    def is_free(self, x: int, y: int) -> bool:
+        """In bounds and not an obstacle: the cells a rover may drive onto."""
+        if not (0 <= x <= self.max_x and 0 <= y <= self.max_y):
+            return False
+        return self.obstacles is None or not self.obstacles.is_blocked(x, y)
 
 @dataclass
 class GridNavigator(Navigator):
     plateau: Plateau
 
-    ORDER = [Heading.N, Heading.E, Heading.S, Heading.W]
-    DELTA = {
-        Heading.N: (0, 1),
-        Heading.E: (1, 0),
-        Heading.S: (0, -1),
-        Heading.W: (-1, 0),
-    }
+    ORDER = list(ENUMS)
+    DELTA = DELTAS
+
+    def cache_key(self):
+        # moves depend only on the plateau, so runs can be memoized (see hexrover.cache);
+        # the obstacle version keeps entries from outliving an edit to the map
+        obstacles = self.plateau.obstacles
+        return type(self), self.plateau, obstacles.version if obstacles is not None else 0
 
     def forward(self, pos: Position, heading: Heading) -> Position:
-        dx, dy = self.DELTA[heading]
+        dx, dy = DELTAS[heading]
         nx, ny = pos.x + dx, pos.y + dy
-        if self.plateau.is_within_bounds(nx, ny):
+        if self.plateau.is_free(nx, ny):
             return Position(nx, ny)
-        return pos  # safe stop at edge – same policy as legacy rover
+        return pos  # safe stop at edge or obstacle – same policy as legacy rover
+
+    def execute(self, x: int, y: int, h: int, commands: str) -> Tuple[int, int, int]:
+        """
+        Whole command string on raw ints (h is a kernel heading code): the same result as
+        forward/turn_left/turn_right one by one, without a Position per step.
+        """
+        plateau = self.plateau
+        max_x, max_y, obstacles = plateau.max_x, plateau.max_y, plateau.obstacles
+        dx, dy, left, right = DX, DY, LEFT, RIGHT
+        if obstacles is None:
+            if long_runs(commands):  # whole runs of moves clamped at the edge in O(1)
+                x, y, h, _, _ = run_lengths((x, y, h), commands, max_x, max_y)
+                return x, y, h
+            for c in commands:
+                if c == "M":
+                    nx = x + dx[h]
+                    ny = y + dy[h]
+                    if 0 <= nx <= max_x and 0 <= ny <= max_y:
+                        x, y = nx, ny
+                elif c == "L":
+                    h = left[h]
+                elif c == "R":
+                    h = right[h]
+            return x, y, h
+        blocked = obstacles.is_blocked
+        for c in commands:
+            if c == "M":
+                nx = x + dx[h]
+                ny = y + dy[h]
+                if 0 <= nx <= max_x and 0 <= ny <= max_y and not blocked(nx, ny):
+                    x, y = nx, ny
+            elif c == "L":
+                h = left[h]
+            elif c == "R":
+                h = right[h]
+        return x, y, h
+
+    def execute_packed(self, x: int, y: int, h: int, packed, count: int) -> Tuple[int, int, int]:
+        """
+        execute() for `count` commands packed four to a byte (see kernel.PACKED_LETTERS),
+        read in place from `packed` (bytes, or a memoryview into a mapped compiled mission)
+        without building a str. Each byte is one lookup for its moves and final heading;
+        without obstacles, a rover 4+ cells from every edge takes the byte's net move at once.
+        """
+        plateau = self.plateau
+        max_x, max_y, obstacles = plateau.max_x, plateau.max_y, plateau.obstacles
+        steps = PACKED_STEPS
+        full = count >> 2
+        if obstacles is None:
+            hi_x, hi_y = max_x - 4, max_y - 4
+            for byte in packed[:full]:
+                moves, after, net_x, net_y = steps[h << 8 | byte]
+                if 4 <= x <= hi_x and 4 <= y <= hi_y:
+                    x += net_x
+                    y += net_y
+                else:
+                    for dx, dy in moves:
+                        nx = x + dx
+                        ny = y + dy
+                        if 0 <= nx <= max_x and 0 <= ny <= max_y:
+                            x, y = nx, ny
+                h = after
+        else:
+            blocked = obstacles.is_blocked
+            for byte in packed[:full]:
+                moves, after, _, _ = steps[h << 8 | byte]
+                for dx, dy in moves:
+                    nx = x + dx
+                    ny = y + dy
+                    if 0 <= nx <= max_x and 0 <= ny <= max_y and not blocked(nx, ny):
+                        x, y = nx, ny
+                h = after
+        if count & 3:  # the last byte is padded: run only its real commands
+            byte = packed[full]
+            x, y, h = self.execute(x, y, h, "".join(PACKED_LETTERS[byte >> s & 3] for s in (6, 4, 2)[:count & 3]))
+        return x, y, h
 
     def turn_left(self, heading: Heading) -> Heading:
-        i = (self.ORDER.index(heading) - 1) % 4
-        return self.ORDER[i]
+        return LEFT_OF_HEADING[heading]
 
     def turn_right(self, heading: Heading) -> Heading:
-        i = (self.ORDER.index(heading) + 1) % 4
-        return self.ORDER[i]
+        return RIGHT_OF_HEADING[heading]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+import mmap
+import struct
+from typing import Iterable, Iterator, Optional, Protocol, Tuple
+
+# Obstacle map file: header, then one bit per cell, row-major from (0, 0), LSB first
+MAGIC = b"MROB"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxII")  # magic, version, width, height
+
+class Obstacles(Protocol):
+    """
+    Terrain a Plateau consults for blocked cells; version changes whenever the map does.
+    Maps may also offer any_blocked(x0, y0, x1, y1); call it through the any_blocked function.
+    """
+    width: int
+    height: int
+    version: int
+    def is_blocked(self, x: int, y: int) -> bool: ...
+
+def any_blocked(obstacles: Obstacles, x0: int, y0: int, x1: int, y1: int) -> bool:
+    """Whether any cell of the inclusive rectangle (x0, y0)-(x1, y1) is blocked: the map's own
+    any_blocked when it has one, else a probe per cell."""
+    query = getattr(obstacles, "any_blocked", None)
+    if query is not None:
+        return query(x0, y0, x1, y1)
+    return any(obstacles.is_blocked(x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1))
+
+class BitmapObstacles:
+    """
+    Dense one-bit-per-cell obstacle map held in memory.
+    is_blocked is a bounds check, a byte index and a shift: O(1), no allocation.
+    """
+    def __init__(self, width: int, height: int, cells: Iterable[Tuple[int, int]] = ()) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError("Obstacle map must be at least 1 x 1")
+        self.width = width
+        self.height = height
+        self.version = 0
+        self._bits = bytearray((width * height + 7) // 8)
+        for x, y in cells:
+            self.add(x, y)
+
+    @classmethod
+    def for_plateau(cls, max_x: int, max_y: int, cells: Iterable[Tuple[int, int]] = ()) -> "BitmapObstacles":
+        return cls(max_x + 1, max_y + 1, cells)
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = y * self.width + x
+            return self._bits[i >> 3] >> (i & 7) & 1 == 1
+        return False
+
+    def any_blocked(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        return _any_in_rect(self._bits, 0, self.width, self.height, x0, y0, x1, y1)
+
+    def add(self, x: int, y: int) -> None:
+        i = self._index(x, y)
+        self._bits[i >> 3] |= 1 << (i & 7)
+        self.version += 1
+
+    def remove(self, x: int, y: int) -> None:
+        i = self._index(x, y)
+        self._bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+        self.version += 1
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return _iter_cells(self._bits, 0, self.width, self.height)
+
+    def save(self, path: str) -> None:
+        """Write the map in the format MmapObstacles reads."""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.width, self.height))
+            f.write(self._bits)
+
+    def _index(self, x: int, y: int) -> int:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Obstacle ({x}, {y}) is outside the {self.width} x {self.height} map")
+        return y * self.width + x
+
+class MmapObstacles:
+    """
+    Read-only obstacle map backed by a memory-mapped file (see BitmapObstacles.save).
+    Processes that open the same file share its pages through the OS cache instead of
+    each holding a copy; pickling sends only the path, so worker pools stay cheap.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size or self._map[:4] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not an obstacle map")
+        _, version, self.width, self.height = HEADER.unpack_from(self._map, 0)
+        if version != VERSION or len(self._map) < HEADER.size + (self.width * self.height + 7) // 8:
+            self._map.close()
+            raise ValueError(f"{path} is not a valid version {VERSION} obstacle map")
+        self.version = 0  # the map never changes
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = y * self.width + x
+            return self._map[HEADER.size + (i >> 3)] >> (i & 7) & 1 == 1
+        return False
+
+    def any_blocked(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        return _any_in_rect(self._map, HEADER.size, self.width, self.height, x0, y0, x1, y1)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return _iter_cells(self._map, HEADER.size, self.width, self.height)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __reduce__(self):
+        return MmapObstacles, (self.path,)
+
+def load_obstacles(path: str, max_x: Optional[int] = None, max_y: Optional[int] = None) -> Obstacles:
+    """Open a binary obstacle map, or read a text file of "x y" lines into a bitmap (needs the plateau size)."""
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+    if magic == MAGIC:
+        return MmapObstacles(path)
+    if max_x is None or max_y is None:
+        raise ValueError(f"{path} is not a binary obstacle map; text obstacle lists need the plateau size")
+    obstacles = BitmapObstacles.for_plateau(max_x, max_y)
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                x, y = map(int, line.split())
+                obstacles.add(x, y)
+    return obstacles
+
+def _iter_cells(bits, offset: int, width: int, height: int) -> Iterator[Tuple[int, int]]:
+    for byte_index in range((width * height + 7) // 8):
+        byte = bits[offset + byte_index]
+        while byte:
+            low = byte & -byte
+            i = byte_index * 8 + low.bit_length() - 1
+            yield i % width, i // width
+            byte ^= low
+
+def _any_in_rect(bits, offset: int, width: int, height: int, x0: int, y0: int, x1: int, y1: int) -> bool:
+    """One int.from_bytes per row of the rectangle (one in all if it spans whole rows), not a probe per cell."""
+    x0, y0, x1, y1 = max(x0, 0), max(y0, 0), min(x1, width - 1), min(y1, height - 1)
+    if x0 > x1 or y0 > y1:
+        return False
+    if x0 == 0 and x1 == width - 1:  # whole rows are one contiguous run of bits
+        runs: Iterable[Tuple[int, int]] = ((y0 * width, (y1 - y0 + 1) * width),)
+    else:
+        runs = ((y * width + x0, x1 - x0 + 1) for y in range(y0, y1 + 1))
+    for start, span in runs:
+        chunk = bits[offset + (start >> 3):offset + ((start + span - 1) >> 3) + 1]
+        if int.from_bytes(chunk, "little") >> (start & 7) & ((1 << span) - 1):
+            return True
+    return False
@@ -0,0 +1,92 @@
+from __future__ import annotations
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from typing import Hashable, NamedTuple, Optional, Tuple
+from .ports import Position, Heading
+from .domain import Rover
+
+DEFAULT_MAXSIZE = 4096
+# Longer command strings are keyed on (length, digest) so the cache never holds the missions
+DIGEST_ABOVE = 64
+
+def command_key(commands: str) -> Hashable:
+    """The commands part of a cache key: the string itself if short, else length and a 128-bit digest."""
+    if len(commands) <= DIGEST_ABOVE:
+        return commands
+    return len(commands), blake2b(commands.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+class RunCache:
+    """
+    Bounded LRU memo of Rover.run keyed on (position, heading, commands, navigator key);
+    commands longer than DIGEST_ABOVE are keyed by digest (command_key), so entries stay small.
+    Only navigators whose cache_key() returns a value are cached: that method is the
+    navigator's promise that forward/turns are pure functions of that key. Stateful
+    navigators (e.g. CollisionNavigator) don't have one and always run.
+    Values are final (Position, Heading) pairs. maxsize=None means unbounded, 0 disables.
+    """
+    def __init__(self, maxsize: Optional[int] = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Position, Heading]]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def key_for(rover: Rover, commands: str) -> Optional[Hashable]:
+        nav_key = getattr(rover.nav, "cache_key", None)
+        nav_key = nav_key() if nav_key is not None else None
+        if nav_key is None:
+            return None
+        return rover.position, rover.heading, command_key(commands), nav_key
+
+    def get(self, key: Hashable) -> Optional[Tuple[Position, Heading]]:
+        with self._lock:
+            state = self._entries.get(key)
+            if state is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return state
+
+    def put(self, key: Hashable, state: Tuple[Position, Heading]) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._entries[key] = state
+            self._entries.move_to_end(key)
+            if self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def run(self, rover: Rover, commands: str) -> Rover:
+        """Same result as rover.run(commands), served from the cache when possible."""
+        key = self.key_for(rover, commands)
+        if key is None:
+            return rover.run(commands)
+        state = self.get(key)
+        if state is None:
+            rover = rover.run(commands)
+            self.put(key, (rover.position, rover.heading))
+            return rover
+        return Rover(position=state[0], heading=state[1], nav=rover.nav)
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+# Shared by the compat Rover, run_simulation and the batch engine
+default_cache = RunCache()
+
+def run_cached(rover: Rover, commands: str, cache: Optional[RunCache] = None) -> Rover:
+    return (cache if cache is not None else default_cache).run(rover, commands)
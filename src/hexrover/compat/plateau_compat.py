@@ -1,12 +1,19 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Optional
 from ..adapters.grid_nav import Plateau as _Plateau
+from ..adapters.terrain import Obstacles
 
 @dataclass
 class Plateau:
     max_x: int
     max_y: int
+    obstacles: Optional[Obstacles] = None
     def __post_init__(self):
-        self._inner = _Plateau(self.max_x, self.max_y)
+        self._inner = _Plateau(self.max_x, self.max_y, self.obstacles)
     def is_within_bounds(self, x: int, y: int) -> bool:
         return self._inner.is_within_bounds(x, y)
+    def is_blocked(self, x: int, y: int) -> bool:
+        return self._inner.is_blocked(x, y)
+    def is_free(self, x: int, y: int) -> bool:
+        return self._inner.is_free(x, y)
@@ -1,7 +1,10 @@
 from __future__ import annotations
-from ..ports import Position, Heading
+from typing import Optional
+from ..ports import Navigator, Position, Heading
 from ..domain import Rover as _Rover
 from ..adapters.grid_nav import GridNavigator, Plateau as _Plateau
+from ..cache import run_cached
+from ..optimizer import optimize_commands
 
 class Rover:
     """
@@ -12,14 +15,18 @@ class Rover:
       - move(), move_forward() (aliases), turn_left(), turn_right()
       - execute_commands()
       - __str__ -> "x y H"
+    `nav` replaces the default GridNavigator (e.g. with an instrumented wrapper of one).
+    `optimize` collapses turn runs before execute_commands (see hexrover.optimizer).
     """
-    def __init__(self, x: int, y: int, heading: str, plateau: _Plateau) -> None:
+    def __init__(self, x: int, y: int, heading: str, plateau: _Plateau, nav: Optional[Navigator] = None,
+                 optimize: bool = False) -> None:
+        self.optimize = optimize
         self._plat = plateau                    # compat Plateau shim wraps hex Plateau already
         self.plateau = plateau
         self._inner = _Rover(
             position=Position(x, y),
             heading=Heading[heading.upper()],
-            nav=GridNavigator(self._plat._inner if hasattr(self._plat, "_inner") else self._plat),
+            nav=nav or GridNavigator(self._plat._inner if hasattr(self._plat, "_inner") else self._plat),
         )
 
     # ---------- properties (mirror legacy attributes) ----------
@@ -66,9 +73,10 @@ class Rover:
         self.turn_right()
 
     def execute_commands(self, commands: str) -> None:
-        for ch in commands:
-            if ch in "LRM":
-                self._inner = self._inner.run(ch)
+        # one core run for the whole string; repeated (start, commands) pairs hit the LRU cache
+        if self.optimize:
+            commands = optimize_commands(commands)
+        self._inner = run_cached(self._inner, commands)
 
     # ---------- repr ----------
     def __str__(self) -> str:
@@ -0,0 +1,438 @@
+from __future__ import annotations
+import math
+from array import array
+from collections import Counter, deque
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+from .kernel import CODES, DX, DY, HEADINGS, TOKENS
+from .planner import RoutePlanner, Start, open_grid_distance
+
+Region = Tuple[int, int, int, int]   # x0, y0, x1, y1, inclusive
+
+# Commands that turn heading h to heading (h + i) & 3
+TURN = ("", "R", "RR", "L")
+
+def partition(width: int, height: int, count: int) -> List[Optional[Region]]:
+    """
+    Split a width x height grid into `count` rectangles of near-equal area: vertical
+    strips, each cut into horizontal bands, with strip widths proportional to their
+    band counts. Listed strip by strip (west to east), bands south to north; a rover
+    that cannot get a cell of its own (more rovers than cells) gets None.
+    """
+    regions: List[Optional[Region]] = []
+    done = 0
+    for bands in _band_counts(width, height, count):
+        x0 = width * done // count
+        done += bands
+        x1 = width * done // count - 1
+        for j in range(bands):
+            y0, y1 = height * j // bands, height * (j + 1) // bands - 1
+            regions.append((x0, y0, x1, y1) if x0 <= x1 and y0 <= y1 else None)
+    return regions
+
+def _band_counts(width: int, height: int, count: int) -> List[int]:
+    # about sqrt(count * width / height) strips keeps regions close to square
+    if count <= 0:
+        return []
+    strips = max(1, min(count, width, round(math.sqrt(count * width / height))))
+    return [count // strips + (i < count % strips) for i in range(strips)]
+
+class _Parked:
+    """Cells held by rovers that are not driving, with per-column and per-row counts."""
+    def __init__(self, cells) -> None:
+        self.cells: Set[Tuple[int, int]] = set()
+        self.columns: Counter = Counter()
+        self.rows: Counter = Counter()
+        for x, y in cells:
+            self.add(x, y)
+
+    def add(self, x: int, y: int) -> None:
+        self.cells.add((x, y))
+        self.columns[x] += 1
+        self.rows[y] += 1
+
+    def discard(self, x: int, y: int) -> None:
+        if (x, y) in self.cells:
+            self.cells.remove((x, y))
+            self.columns[x] -= 1
+            self.rows[y] -= 1
+
+class CoveragePlanner:
+    """
+    Boustrophedon coverage for a fleet: each rover gets a region from partition() and
+    sweeps it in straight lines along the region's longer side, two turns per line change.
+    Rovers are planned in the order MissionControl.execute_mission runs them, treating
+    rovers that are not moving (later ones at their start, earlier ones where they
+    stopped) as obstacles, so no command is ever blocked.
+
+    Parked rovers must not wall later ones in: after its region, a rover also sweeps any
+    uncovered cell that no later rover can still reach, and it parks on a cell whose loss
+    cuts no uncovered cell off from the rovers still to move (see _Fleet). Reachable cells
+    that are missed anyway are left in `missed` after plan(); terrain pockets that hold no
+    rover are never counted.
+    """
+    def __init__(self, plateau) -> None:
+        self.plateau = plateau
+        self.width = plateau.max_x + 1
+        self.height = plateau.max_y + 1
+        obstacles = plateau.obstacles
+        self._open = obstacles is None or next(iter(obstacles), None) is None
+        self._component: Optional[array] = None
+        self.missed: Set[Tuple[int, int]] = set()
+
+    def plan(self, rovers: Sequence[Start]) -> List[str]:
+        """One command string per rover, in the order given."""
+        for x, y, _ in rovers:
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise ValueError(f"Rover start ({x}, {y}) is outside the {self.width} x {self.height} plateau")
+        regions = self.assign(rovers)
+        parked = _Parked((x, y) for x, y, _ in rovers)
+        fleet = _Fleet(self, rovers)
+        plans = []
+        for start, region in zip(rovers, regions):
+            parked.discard(start[0], start[1])
+            fleet.leave(start[0], start[1])
+            commands, end = self.sweep(start, region, parked)
+            fleet.cover(start, commands)
+            extra, (x, y, _) = self._finish(end, parked, fleet)
+            parked.add(x, y)
+            fleet.park(x, y)
+            plans.append(commands + extra)
+        self.missed = fleet.missed()
+        return plans
+
+    def assign(self, rovers: Sequence[Start]) -> List[Optional[Region]]:
+        """Region for each rover: strips go to rovers by x, bands within a strip by y."""
+        regions = partition(self.width, self.height, len(rovers))
+        by_x = sorted(range(len(rovers)), key=lambda i: (rovers[i][0], rovers[i][1]))
+        assigned: List[Optional[Region]] = [None] * len(rovers)
+        start = 0
+        for bands in _band_counts(self.width, self.height, len(rovers)):
+            strip = sorted(by_x[start:start + bands], key=lambda i: rovers[i][1])
+            for i, region in zip(strip, regions[start:start + bands]):
+                assigned[i] = region
+            start += bands
+        return assigned
+
+    def sweep(self, start: Start, region: Optional[Region], parked: _Parked) -> Tuple[str, Start]:
+        """Commands that take a rover from `start` over every reachable cell of `region`."""
+        x, y, heading = start
+        if region is None:
+            return "", start
+        lines = self._lines(x, y, CODES[heading], region)
+        driver = _Driver(self, x, y, CODES[heading], parked)
+        for ax, ay, bx, by in lines:
+            driver.line(ax, ay, bx, by)
+        return "".join(driver.out), (driver.x, driver.y, HEADINGS[driver.h])
+
+    def _finish(self, start: Start, parked: _Parked, fleet: _Fleet) -> Tuple[str, Start]:
+        """Commands that sweep what only this rover can still reach, then park it out of the way."""
+        x, y, heading = start
+        driver = _Driver(self, x, y, CODES[heading], parked)
+        targets = fleet.orphans(x, y)
+        while targets:
+            cell = fleet.nearest(driver.x, driver.y, targets)
+            if cell is None:
+                break
+            mark, at = len(driver.out), (driver.x, driver.y, HEADINGS[driver.h])
+            if driver.visit(*fleet.xy(cell)):
+                fleet.cover(at, "".join(driver.out[mark:]))
+            targets.discard(cell)
+        if fleet.cuts(driver.x, driver.y):
+            for cell in fleet.around(driver.x, driver.y):
+                px, py = fleet.xy(cell)
+                mark, at = len(driver.out), (driver.x, driver.y, HEADINGS[driver.h])
+                if not fleet.cuts(px, py) and driver.visit(px, py):
+                    fleet.cover(at, "".join(driver.out[mark:]))
+                    break
+        return "".join(driver.out), (driver.x, driver.y, HEADINGS[driver.h])
+
+    def _terrain(self) -> bytearray:
+        # the plateau padded with a blocked border, so flood fills need no bounds checks
+        width, height = self.width, self.height
+        stride = width + 2
+        blocked = bytearray(b"\1") * (stride * (height + 2))
+        for y in range(height):
+            blocked[(y + 1) * stride + 1:(y + 1) * stride + 1 + width] = bytes(width)
+        for x, y in self.plateau.obstacles if not self._open else ():
+            if not (0 <= x < width and 0 <= y < height):
+                raise ValueError(f"Obstacle ({x}, {y}) is outside the {width} x {height} plateau")
+            blocked[(y + 1) * stride + x + 1] = 1
+        return blocked
+
+    def _lines(self, x: int, y: int, h: int, region: Region) -> List[Region]:
+        # pick the corner the rover reaches soonest and sweep away from it
+        x0, y0, x1, y1 = region
+        vertical = y1 - y0 >= x1 - x0
+        corners = []
+        for cx, ox in ((x0, x1), (x1, x0)):
+            for cy, oy in ((y0, y1), (y1, y0)):
+                if vertical:
+                    th = 0 if oy > cy else 2
+                else:
+                    th = 1 if ox > cx else 3
+                cost = open_grid_distance(x, y, h, cx, cy, th if (cx, cy) != (ox, oy) else None)
+                corners.append((cost, cx, cy, ox, oy))
+        _, cx, cy, ox, oy = min(corners, key=lambda corner: corner[0])  # first of the cheapest
+        lines = []
+        if vertical:
+            step = 1 if ox >= cx else -1
+            for i, lx in enumerate(range(cx, ox + step, step)):
+                lines.append((lx, cy, lx, oy) if i % 2 == 0 else (lx, oy, lx, cy))
+        else:
+            step = 1 if oy >= cy else -1
+            for i, ly in enumerate(range(cy, oy + step, step)):
+                lines.append((cx, ly, ox, ly) if i % 2 == 0 else (ox, ly, cx, ly))
+        return lines
+
+    def _reachable(self, x: int, y: int, tx: int, ty: int) -> bool:
+        # terrain components, labelled once; parked rovers are left to the route planner
+        if self._open:
+            return True
+        if self._component is None:
+            self._component = _label_components(self._terrain(), self.width + 2)
+        component, stride = self._component, self.width + 2
+        return component[(y + 1) * stride + x + 1] == component[(ty + 1) * stride + tx + 1]
+
+class _Fleet:
+    """
+    What the rovers still to move need from the one moving now, on a grid padded like
+    _terrain(): `need` marks reachable cells nobody has covered yet, and `blocked` holds
+    terrain and parked rovers. Later rovers' cells count as open, since those rovers
+    leave them before anyone else could need to pass. While the terrain is open and
+    every rover has parked on a cell whose neighbours stay connected around it, the
+    open cells are one component, so orphans() and cuts() need no flood fill.
+    """
+    def __init__(self, coverage: CoveragePlanner, rovers: Sequence[Start]) -> None:
+        self.stride = stride = coverage.width + 2
+        self.blocked = coverage._terrain()
+        self.later: Counter = Counter((y + 1) * stride + x + 1 for x, y, _ in rovers)
+        self.intact = coverage._open
+        if self.intact:
+            self.need = bytearray(1 - b for b in self.blocked)
+        else:
+            labels = _label_components(self.blocked, stride)
+            crewed = {labels[cell] for cell in self.later}
+            self.need = bytearray(label in crewed for label in labels)
+        for cell in self.later:
+            self.need[cell] = 0
+        # neighbours of a cell in ring order, orthogonal ones at even positions
+        self.ring = (stride, stride + 1, 1, 1 - stride, -stride, -stride - 1, -1, stride - 1)
+
+    def xy(self, cell: int) -> Tuple[int, int]:
+        return cell % self.stride - 1, cell // self.stride - 1
+
+    def leave(self, x: int, y: int) -> None:
+        cell = (y + 1) * self.stride + x + 1
+        self.later[cell] -= 1
+        if not self.later[cell]:
+            del self.later[cell]
+
+    def park(self, x: int, y: int) -> None:
+        cell = (y + 1) * self.stride + x + 1
+        if not self.blocked[cell] and not self._simple(cell):
+            self.intact = False
+        self.blocked[cell] = 1
+
+    def cover(self, start: Start, commands: str) -> None:
+        """Mark the cells a rover passes over running `commands` from `start` (never blocked)."""
+        need, stride = self.need, self.stride
+        x, y, heading = start
+        cell, h = (y + 1) * stride + x + 1, CODES[heading]
+        need[cell] = 0
+        for token in TOKENS.findall(commands):
+            if token[0] != "M":
+                h = (h + token.count("R") - token.count("L")) & 3
+                continue
+            step = DX[h] + DY[h] * stride
+            end = cell + step * len(token)
+            if step > 0:
+                need[cell + step:end + 1:step] = bytes(len(token))
+            else:
+                need[end:cell:-step] = bytes(len(token))
+            cell = end
+
+    def orphans(self, x: int, y: int) -> Set[int]:
+        """Uncovered cells a rover at (x, y) can reach and no later rover can."""
+        if self.intact:
+            return set() if self.later else self._needed()
+        # flood (x, y)'s component, stopping at the first later rover
+        blocked, later, need = self.blocked, self.later, self.need
+        start = (y + 1) * self.stride + x + 1
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for step in self.ring[0::2]:
+                n = cell + step
+                if n not in seen and not blocked[n]:
+                    if n in later:
+                        return set()
+                    seen.add(n)
+                    queue.append(n)
+        return {cell for cell in seen if need[cell]}
+
+    def cuts(self, x: int, y: int) -> bool:
+        """Whether parking on (x, y) would cut an uncovered cell off from every later rover."""
+        cell = (y + 1) * self.stride + x + 1
+        if not self.later or self._simple(cell):
+            return False
+        before = _label_components(self.blocked, self.stride)
+        crewed = {before[later] for later in self.later}
+        self.blocked[cell] = 1
+        after = _label_components(self.blocked, self.stride)
+        self.blocked[cell] = 0
+        still = {after[later] for later in self.later}
+        return any(before[c] in crewed and after[c] not in still for c in self._needed() if c != cell)
+
+    def around(self, x: int, y: int):
+        """Cells a rover at (x, y) can drive to, nearest first (later rovers are in the way)."""
+        blocked, later = self.blocked, self.later
+        start = (y + 1) * self.stride + x + 1
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for step in self.ring[0::2]:
+                n = cell + step
+                if n not in seen and not blocked[n] and n not in later:
+                    seen.add(n)
+                    queue.append(n)
+                    yield n
+
+    def nearest(self, x: int, y: int, targets: Set[int]) -> Optional[int]:
+        need = self.need
+        for cell in self.around(x, y):
+            if cell in targets and need[cell]:
+                return cell
+        return None
+
+    def missed(self) -> Set[Tuple[int, int]]:
+        return {self.xy(cell) for cell in self._needed()}
+
+    def _needed(self) -> Set[int]:
+        need, cells = self.need, set()
+        cell = need.find(1)
+        while cell >= 0:
+            cells.add(cell)
+            cell = need.find(1, cell + 1)
+        return cells
+
+    def _simple(self, cell: int) -> bool:
+        # the open neighbours stay connected through the ring around `cell` without it
+        blocked = self.blocked
+        ring = [not blocked[cell + step] for step in self.ring]
+        if all(ring):
+            return True
+        # walk the ring from a closed cell, counting runs of open cells that touch `cell`
+        first = ring.index(False)
+        runs, counted = 0, False
+        for i in range(first + 1, first + 9):
+            if not ring[i & 7]:
+                counted = False
+            elif i % 2 == 0 and not counted:
+                runs += 1
+                counted = True
+        return runs <= 1
+
+class _Driver:
+    """Accumulates commands while a rover drives lines of cells."""
+    def __init__(self, coverage: CoveragePlanner, x: int, y: int, h: int, parked: _Parked) -> None:
+        self.coverage = coverage
+        self.x, self.y, self.h = x, y, h
+        self.parked = parked
+        self.router = RoutePlanner(coverage.plateau, max_goals=1, avoid=parked.cells)
+        self.out: List[str] = []
+
+    def line(self, ax: int, ay: int, bx: int, by: int) -> None:
+        length = abs(bx - ax) + abs(by - ay)
+        heading = _heading_to(ax, ay, bx, by) if length else None
+        dx, dy = (DX[heading], DY[heading]) if heading is not None else (0, 0)
+        parked = self.parked.columns[ax] if ax == bx else self.parked.rows[ay]
+        if self.coverage._open and not parked:
+            runs = [(0, length)]
+        else:
+            # split the line at blocked cells and drive each free run straight through
+            free = self._free_test()
+            runs = []
+            first = None
+            for i in range(length + 1):
+                if free(ax + dx * i, ay + dy * i):
+                    if first is None:
+                        first = i
+                elif first is not None:
+                    runs.append((first, i - 1))
+                    first = None
+            if first is not None:
+                runs.append((first, length))
+        for i, j in runs:
+            if self.visit(ax + dx * i, ay + dy * i, heading if j > i else None) and j > i:
+                self.out.append("M" * (j - i))
+                self.x, self.y = ax + dx * j, ay + dy * j
+
+    def _free_test(self) -> Callable[[int, int], bool]:
+        # on open terrain only parked rovers block, and a set lookup is all it takes
+        if not self.coverage._open:
+            return self.router._is_free
+        cells = self.parked.cells
+
+        def free(x: int, y: int) -> bool:
+            return (x, y) not in cells
+        return free
+
+    def visit(self, tx: int, ty: int, heading: Optional[int] = None) -> bool:
+        """Drive onto (tx, ty), facing `heading` if given; False if the cell cannot be reached."""
+        x, y, h = self.x, self.y, self.h
+        if (tx, ty) == (x, y):
+            if heading is not None:
+                self.out.append(TURN[(heading - h) & 3])
+                self.h = heading
+            return True
+        router = self.router
+        if not router._is_free(tx, ty):
+            return False
+        if abs(tx - x) + abs(ty - y) == 1:
+            want = _heading_to(x, y, tx, ty)
+            final = want if heading is None else heading
+            self.out.append(TURN[(want - h) & 3] + "M" + TURN[(final - want) & 3])
+            self.x, self.y, self.h = tx, ty, final
+            return True
+        if not self.coverage._reachable(x, y, tx, ty):
+            return False
+        goal = (tx, ty) if heading is None else (tx, ty, HEADINGS[heading])
+        route = router.plan((x, y, HEADINGS[h]), goal)
+        if route is None:
+            return False
+        self.out.append(route)
+        self.x, self.y = tx, ty
+        self.h = (h + route.count("R") - route.count("L")) & 3
+        return True
+
+def _heading_to(x: int, y: int, tx: int, ty: int) -> int:
+    if tx == x:
+        return 0 if ty > y else 2
+    return 1 if tx > x else 3
+
+def _label_components(blocked: bytearray, stride: int) -> array:
+    # flood fill over the open cells of a padded grid (see CoveragePlanner._terrain); -1 = blocked
+    blocked = bytearray(blocked)
+    component = array("i", [-1]) * len(blocked)
+    label = 0
+    start = blocked.find(0)
+    while start >= 0:
+        blocked[start] = 1
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            component[cell] = label
+            for n in (cell + 1, cell - 1, cell + stride, cell - stride):
+                if not blocked[n]:
+                    blocked[n] = 1
+                    queue.append(n)
+        label += 1
+        start = blocked.find(0, start + 1)
+    return component
+
+def plan_coverage(plateau, rovers: Sequence[Start]) -> List[str]:
+    """Sweep command strings for `rovers` (x, y, heading), safe to run through execute_mission in order."""
+    return CoveragePlanner(plateau).plan(rovers)
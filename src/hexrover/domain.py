@@ -1,14 +1,27 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from .ports import Position, Heading, Navigator
+from .kernel import CODES, ENUMS
+from .optimizer import optimize_commands
 
 @dataclass(frozen=True)
 class Rover:
+    __slots__ = ("position", "heading", "nav")
     position: Position
     heading: Heading
     nav: Navigator
 
-    def run(self, commands: str) -> "Rover":
+    def __reduce__(self):
+        return Rover, (self.position, self.heading, self.nav)
+
+    def run(self, commands: str, optimize: bool = False) -> "Rover":
+        if optimize:  # same final state, fewer turns for the navigator to see
+            commands = optimize_commands(commands)
+        # navigators with an execute() (GridNavigator) take the whole string on raw ints
+        execute = getattr(self.nav, "execute", None)
+        if execute is not None:
+            x, y, h = execute(self.position.x, self.position.y, CODES[self.heading], commands)
+            return Rover(position=Position(x, y), heading=ENUMS[h], nav=self.nav)
         pos, head = self.position, self.heading
         for ch in commands:
             if ch == "M":
@@ -19,4 +32,8 @@ class Rover:
                 head = self.nav.turn_right(head)
             else:
                 continue
+        # forward() has no side effects; stateful navigators (CollisionNavigator) learn the end
+        commit = getattr(self.nav, "commit", None)
+        if commit is not None and pos != self.position:
+            commit(pos)
         return Rover(position=pos, heading=head, nav=self.nav)
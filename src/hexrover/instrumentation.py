@@ -0,0 +1,130 @@
+from __future__ import annotations
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+from .ports import STOP_COLLISION, Heading, Navigator, Position
+
+class RoverMetrics:
+    """Counters for one rover. Run latencies go into log2 buckets of microseconds."""
+    __slots__ = ("forwards", "turns", "boundary_stops", "collision_stops", "runs", "seconds", "buckets")
+
+    def __init__(self) -> None:
+        self.forwards = 0
+        self.turns = 0
+        self.boundary_stops = 0
+        self.collision_stops = 0
+        self.runs = 0
+        self.seconds = 0.0
+        self.buckets: List[int] = []   # buckets[i]: runs under 2**i us (and at least 2**(i-1))
+
+    def stop(self, reason: str) -> None:
+        if reason == STOP_COLLISION:
+            self.collision_stops += 1
+        else:
+            self.boundary_stops += 1
+
+    def record_run(self, seconds: float) -> None:
+        self.runs += 1
+        self.seconds += seconds
+        i = int(seconds * 1e6).bit_length()
+        if i >= len(self.buckets):
+            self.buckets.extend([0] * (i + 1 - len(self.buckets)))
+        self.buckets[i] += 1
+
+    def histogram(self) -> Dict[str, int]:
+        return {f"<{1 << i}us": n for i, n in enumerate(self.buckets) if n}
+
+    def as_dict(self) -> dict:
+        return {
+            "forwards": self.forwards,
+            "turns": self.turns,
+            "boundary_stops": self.boundary_stops,
+            "collision_stops": self.collision_stops,
+            "runs": self.runs,
+            "seconds": self.seconds,
+            "latency_histogram": self.histogram(),
+        }
+
+@dataclass
+class InstrumentedNavigator(Navigator):
+    """
+    Counting wrapper for any Navigator (GridNavigator, CollisionNavigator, ...).
+    It has no cache_key, so hexrover.cache never skips the calls it counts.
+    """
+    inner: Navigator
+    metrics: RoverMetrics
+
+    def forward(self, pos: Position, heading: Heading) -> Position:
+        self.metrics.forwards += 1
+        nxt = self.inner.forward(pos, heading)
+        if nxt == pos:
+            self.metrics.stop(self.inner.stop_reason(pos, heading))
+        return nxt
+
+    def stop_reason(self, pos: Position, heading: Heading) -> str:
+        return self.inner.stop_reason(pos, heading)
+
+    def commit(self, pos: Position) -> None:
+        self.inner.commit(pos)
+
+    def turn_left(self, heading: Heading) -> Heading:
+        self.metrics.turns += 1
+        return self.inner.turn_left(heading)
+
+    def turn_right(self, heading: Heading) -> Heading:
+        self.metrics.turns += 1
+        return self.inner.turn_right(heading)
+
+@dataclass
+class Instrumentation:
+    """
+    Opt-in metrics for a mission. Nothing is counted unless navigators are wrapped with
+    navigator() or a MissionControl is given this object; uninstrumented runs take
+    exactly the code paths they took before.
+    """
+    rovers: Dict[str, RoverMetrics] = field(default_factory=dict)
+    clock = staticmethod(time.perf_counter)
+
+    def rover(self, rover_id: str) -> RoverMetrics:
+        metrics = self.rovers.get(rover_id)
+        if metrics is None:
+            metrics = self.rovers[rover_id] = RoverMetrics()
+        return metrics
+
+    def navigator(self, nav: Navigator, rover_id: str) -> InstrumentedNavigator:
+        return InstrumentedNavigator(nav, self.rover(rover_id))
+
+    @contextmanager
+    def timed(self, rover_id: str) -> Iterator[RoverMetrics]:
+        """Time one run of `rover_id` into its latency histogram."""
+        metrics = self.rover(rover_id)
+        start = self.clock()
+        try:
+            yield metrics
+        finally:
+            metrics.record_run(self.clock() - start)
+
+    def snapshot(self) -> dict:
+        rovers = {rover_id: m.as_dict() for rover_id, m in self.rovers.items()}
+        totals = {key: sum(r[key] for r in rovers.values())
+                  for key in ("forwards", "turns", "boundary_stops", "collision_stops", "runs", "seconds")}
+        return {"rovers": rovers, "totals": totals}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def format_report(self) -> str:
+        lines = []
+        for rover_id, m in self.rovers.items():
+            lines.append(f"{rover_id}: {m.forwards} forwards, {m.turns} turns, {m.boundary_stops} boundary stops, "
+                         f"{m.collision_stops} collision stops, {m.runs} runs in {m.seconds * 1e3:.3f} ms")
+            histogram = m.histogram()
+            if histogram:
+                lines.append("    latency " + " ".join(f"{k}:{n}" for k, n in histogram.items()))
+        totals = self.snapshot()["totals"]
+        lines.append(f"Total: {totals['forwards']} forwards, {totals['turns']} turns, "
+                     f"{totals['boundary_stops']} boundary stops, {totals['collision_stops']} collision stops, "
+                     f"{totals['seconds'] * 1e3:.3f} ms")
+        return "\n".join(lines)
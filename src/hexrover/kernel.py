@@ -0,0 +1,123 @@
+from __future__ import annotations
+import re
+from typing import Callable, Dict, Tuple
+from .ports import Heading
+
+# Headings as small integer codes, clockwise from north: a right turn is +1 and a left
+# turn -1 (mod 4). Every rover implementation turns and steps through these tables.
+HEADINGS = "NESW"
+ENUMS = (Heading.N, Heading.E, Heading.S, Heading.W)
+# Heading name -> code; Heading members hash and compare as their names, so they work too
+CODES: Dict[str, int] = {name: code for code, name in enumerate(HEADINGS)}
+LEFT = (3, 0, 1, 2)
+RIGHT = (1, 2, 3, 0)
+DX = (0, 1, 0, -1)
+DY = (1, 0, -1, 0)
+
+# The same tables keyed by heading, for callers that keep names or Heading members
+# rather than codes: one dict lookup per turn or step instead of a search
+LEFT_OF: Dict[str, str] = {name: HEADINGS[LEFT[h]] for h, name in enumerate(HEADINGS)}
+RIGHT_OF: Dict[str, str] = {name: HEADINGS[RIGHT[h]] for h, name in enumerate(HEADINGS)}
+LEFT_OF_HEADING: Dict[Heading, Heading] = {heading: ENUMS[LEFT[h]] for h, heading in enumerate(ENUMS)}
+RIGHT_OF_HEADING: Dict[Heading, Heading] = {heading: ENUMS[RIGHT[h]] for h, heading in enumerate(ENUMS)}
+DELTAS: Dict[str, Tuple[int, int]] = {name: (DX[h], DY[h]) for h, name in enumerate(HEADINGS)}
+
+State = Tuple[int, int, int]   # x, y, heading code
+
+def transition(state: State, command: str, is_free: Callable[[int, int], bool]) -> State:
+    """
+    The rover state after one command. M only moves onto cells `is_free` accepts (a
+    Plateau's is_free, or anything with the same signature); unknown commands are ignored.
+    """
+    x, y, h = state
+    if command == "M":
+        nx, ny = x + DX[h], y + DY[h]
+        return (nx, ny, h) if is_free(nx, ny) else state
+    if command == "L":
+        return x, y, LEFT[h]
+    if command == "R":
+        return x, y, RIGHT[h]
+    return state
+
+def run(state: State, commands: str, is_free: Callable[[int, int], bool]) -> State:
+    """transition() folded over a command string, with the tables bound to locals."""
+    x, y, h = state
+    dx, dy, left, right = DX, DY, LEFT, RIGHT
+    for c in commands:
+        if c == "M":
+            nx, ny = x + dx[h], y + dy[h]
+            if is_free(nx, ny):
+                x, y = nx, ny
+        elif c == "L":
+            h = left[h]
+        elif c == "R":
+            h = right[h]
+    return x, y, h
+
+# Runs of moves, and runs of everything else (turns and ignored characters)
+TOKENS = re.compile(r"M+|[^M]+")
+# Mean moves per run from which run_lengths() beats stepping every command
+LONG_RUN = 12
+
+def long_runs(commands: str) -> bool:
+    """Whether the moves in `commands` come in runs long enough for run_lengths()."""
+    runs = commands.count("LM") + commands.count("RM") + 1
+    return commands.count("M") >= LONG_RUN * runs
+
+def move_run(x: int, y: int, h: int, k: int, max_x: int, max_y: int) -> State:
+    """
+    k moves on a plateau without obstacles, in O(1): (x, y, moves made); the other
+    k - moves were blocked at the edge. A rover off the plateau can only get back on
+    with a single step straight towards it; otherwise none of its moves succeed.
+    """
+    moved = 0
+    if not (0 <= x <= max_x and 0 <= y <= max_y):
+        nx, ny = x + DX[h], y + DY[h]
+        if k == 0 or not (0 <= nx <= max_x and 0 <= ny <= max_y):
+            return x, y, 0
+        x, y, k, moved = nx, ny, k - 1, 1
+    steps = min(k, (max_y - y, max_x - x, y, x)[h])  # room ahead, by heading code
+    return x + DX[h] * steps, y + DY[h] * steps, moved + steps
+
+def run_lengths(state: State, commands: str, max_x: int, max_y: int) -> Tuple[int, int, int, int, int]:
+    """
+    run() on a plateau without obstacles, one step per run of moves or turns:
+    (x, y, heading code, moves made, moves blocked).
+    """
+    x, y, h = state
+    moves = blocked = 0
+    for token in TOKENS.findall(commands):
+        if token[0] == "M":
+            k = len(token)
+            x, y, moved = move_run(x, y, h, k, max_x, max_y)
+            moves += moved
+            blocked += k - moved
+        else:
+            h = (h + token.count("R") - token.count("L")) & 3
+    return x, y, h, moves, blocked
+
+# Compiled missions (mission_format) pack four commands to a byte as 2-bit indices into
+# this string, the first command in the top bits; "?" is never written, and is ignored
+PACKED_LETTERS = "LRM?"
+
+def _packed_steps() -> Tuple[Tuple[Tuple[Tuple[int, int], ...], int, int, int], ...]:
+    """
+    [h << 8 | byte] -> ((dx, dy) of each M in the byte, in order; heading code after it;
+    net dx, net dy). The net move is exact whenever no step of the byte can be stopped.
+    """
+    table = []
+    for start in range(4):
+        for byte in range(256):
+            h, moves = start, []
+            for shift in (6, 4, 2, 0):
+                c = PACKED_LETTERS[byte >> shift & 3]
+                if c == "M":
+                    moves.append((DX[h], DY[h]))
+                elif c == "L":
+                    h = LEFT[h]
+                elif c == "R":
+                    h = RIGHT[h]
+            table.append((tuple(moves), h, sum(dx for dx, _ in moves), sum(dy for _, dy in moves)))
+    return tuple(table)
+
+PACKED_STEPS = _packed_steps()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+import re
+
+# Net turn of a run (each R +1, each L -1, mod 4) -> its shortest spelling
+CANONICAL_TURNS = ("", "R", "LL", "L")
+
+# Two or more turns with no M between them; anything else in between is ignored by
+# every engine, so it goes with the run
+_TURN_RUN = re.compile(r"[LR][^M]*[LR]")
+
+class _CanonicalRuns(dict):
+    """Memo of run -> canonical turns; short runs repeat constantly, long ones are rare."""
+    def __missing__(self, run: str) -> str:
+        turns = CANONICAL_TURNS[(run.count("R") - run.count("L")) & 3]
+        if len(run) <= 8:
+            self[run] = turns
+        return turns
+
+_RUNS = _CanonicalRuns()
+
+def _collapse(match: re.Match) -> str:
+    return _RUNS[match.group()]
+
+def optimize_commands(commands: str) -> str:
+    """
+    Collapse every run of turns between moves into at most one L, R or LL. Turns never
+    meet a plateau edge or another rover, so the final state is the same for any rover
+    that executes commands one after another (not for lockstep ticks, where a turn takes
+    a tick). Characters other than L, R and M may be dropped; the engines ignore them.
+    """
+    if count_turns(commands) * 4 < len(commands):
+        # mostly moves: the regex engine skips them without calling back into Python
+        return _TURN_RUN.sub(_collapse, commands)
+    # turn-heavy: every gap between moves is a run, mapped without a Python-level loop
+    return "M".join(map(_RUNS.__getitem__, commands.split("M")))
+
+def count_turns(commands: str) -> int:
+    return commands.count("L") + commands.count("R")
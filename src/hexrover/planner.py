@@ -0,0 +1,206 @@
+from __future__ import annotations
+import heapq
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .kernel import CODES, DX, DY
+
+Start = Tuple[int, int, str]      # x, y, heading
+Goal = Tuple                      # (x, y) for any final heading, or (x, y, heading)
+
+def _turn_table() -> List[int]:
+    # Breadth-first search on an open grid: beyond the Manhattan distance, the turns a
+    # shortest route needs depend only on the start heading, the signs of the offset and
+    # the final heading (4 = any), so a window a few cells wide covers every case.
+    from collections import deque
+    table = [0] * (4 * 9 * 5)
+    reach = 4
+    for h0 in range(4):
+        dist = {(0, 0, h0): 0}
+        queue = deque(dist)
+        while queue:
+            x, y, h = state = queue.popleft()
+            for n in ((x, y, (h + 1) & 3), (x, y, (h - 1) & 3), (x + DX[h], y + DY[h], h)):
+                if abs(n[0]) <= 2 * reach and abs(n[1]) <= 2 * reach and n not in dist:
+                    dist[n] = dist[state] + 1
+                    queue.append(n)
+        for sx in (-1, 0, 1):
+            for sy in (-1, 0, 1):
+                x, y = sx * reach, sy * reach
+                for f in range(5):
+                    best = min(dist[(x, y, h)] for h in range(4)) if f == 4 else dist[(x, y, f)]
+                    table[((h0 * 3 + sx + 1) * 3 + sy + 1) * 5 + f] = best - abs(x) - abs(y)
+    return table
+
+_TURNS = _turn_table()
+
+def open_grid_distance(x: int, y: int, h: int, tx: int, ty: int, th: Optional[int] = None) -> int:
+    """
+    Exact route length from (x, y, h) to (tx, ty[, th]) when nothing is in the way.
+    Obstacles and edges only ever make routes longer, so this is a consistent A*
+    heuristic for GridNavigator moves.
+    """
+    dx, dy = tx - x, ty - y
+    sx, sy = (dx > 0) - (dx < 0), (dy > 0) - (dy < 0)
+    return abs(dx) + abs(dy) + _TURNS[((h * 3 + sx + 1) * 3 + sy + 1) * 5 + (4 if th is None else th)]
+
+class _GoalSearch:
+    """
+    Reverse-resumable A* toward one goal. The search runs backwards from the goal
+    states over predecessor edges, guided toward the current start. A closed state's
+    distance to the goal is exact and `nxt` points one step along a shortest route, so
+    later starts either are already closed (answered at once) or resume the search.
+    """
+    def __init__(self, planner: "RoutePlanner", gx: int, gy: int, gh: Optional[int]) -> None:
+        self.planner = planner
+        self.dist: Dict[int, int] = {}
+        self.nxt: Dict[int, int] = {}
+        self.closed: Set[int] = set()
+        for h in (range(4) if gh is None else (gh,)):
+            self.dist[planner._state(gx, gy, h)] = 0
+
+    def resolve(self, start: int) -> bool:
+        """Close `start` if it can reach the goal; False when it cannot."""
+        if start in self.closed:
+            return True
+        planner = self.planner
+        width, is_free = planner.width, planner._is_free
+        sx, sy, sh = planner._decode(start)
+        turns = _TURNS
+        base = sh * 45 + 20  # _TURNS index of (sh, sign 0, sign 0, heading 0)
+
+        def estimate(s: int) -> int:
+            # open_grid_distance(start -> s), inlined: this runs for every state pushed
+            cell = s >> 2
+            dx, dy = cell % width - sx, cell // width - sy
+            return ((dx if dx > 0 else -dx) + (dy if dy > 0 else -dy)
+                    + turns[base + ((dx > 0) - (dx < 0)) * 15 + ((dy > 0) - (dy < 0)) * 5 + (s & 3)])
+
+        # new start, new priorities for everything still open
+        closed, dist, nxt = self.closed, self.dist, self.nxt
+        heap = [(g + estimate(s), -g, s) for s, g in dist.items() if s not in closed]
+        heapq.heapify(heap)
+        push, pop = heapq.heappush, heapq.heappop
+        while heap:
+            _, neg_g, s = pop(heap)
+            if s in closed:
+                continue
+            closed.add(s)
+            # expand even the start: a closed state's predecessors must all be queued
+            # or a later search could run dry before reaching them
+            g = 1 - neg_g
+            h = s & 3
+            cell = s >> 2
+            # predecessors: turned left from h+1, turned right from h-1, moved from behind
+            for p in ((cell << 2) | ((h + 1) & 3), (cell << 2) | ((h - 1) & 3)):
+                if p not in closed and g < dist.get(p, g + 1):
+                    dist[p] = g
+                    nxt[p] = s
+                    push(heap, (g + estimate(p), -g, p))
+            px, py = cell % width - DX[h], cell // width - DY[h]
+            if is_free(px, py):
+                p = ((py * width + px) << 2) | h
+                if p not in closed and g < dist.get(p, g + 1):
+                    dist[p] = g
+                    nxt[p] = s
+                    push(heap, (g + estimate(p), -g, p))
+            if s == start:
+                return True
+        return False
+
+class RoutePlanner:
+    """
+    Shortest L/R/M command strings between rover states on a Plateau, with the same
+    moves as GridNavigator (edges and obstacles stop a rover, so routes avoid them).
+    Every M and every turn costs one command.
+
+    The reverse distance field built for each of the last `max_goals` goals is kept and
+    extended for new starts. On open or lightly obstructed plateaus a 2000 x 2000
+    corner-to-corner plan expands a few thousand states. Dense obstacle fields force
+    A* to close every state that could still beat the detour, so cost grows toward
+    the size of the state space.
+
+    `avoid` is a frozen set of extra cells to treat as blocked, such as parked rovers.
+    Assigning it bumps avoid_version, which is part of every search's key, so a search is
+    reused only for the avoid set it was built for.
+    """
+    def __init__(self, plateau, max_goals: int = 8, avoid: Optional[Iterable[Tuple[int, int]]] = None) -> None:
+        self.plateau = plateau
+        self.width = plateau.max_x + 1
+        self.max_goals = max_goals
+        self._avoid: FrozenSet[Tuple[int, int]] = frozenset(avoid or ())
+        self.avoid_version = 0
+        self._searches: "OrderedDict[tuple, _GoalSearch]" = OrderedDict()
+
+    @property
+    def avoid(self) -> FrozenSet[Tuple[int, int]]:
+        return self._avoid
+
+    @avoid.setter
+    def avoid(self, cells: Iterable[Tuple[int, int]]) -> None:
+        self._avoid = frozenset(cells)
+        self.avoid_version += 1
+
+    def plan(self, start: Start, goal: Goal) -> Optional[str]:
+        """Commands that drive `start` to `goal` in as few steps as possible, or None if unreachable."""
+        route = self._route(start, goal)
+        if route is None:
+            return None
+        commands = []
+        for s, n in zip(route, route[1:]):
+            if s >> 2 != n >> 2:
+                commands.append("M")
+            else:
+                commands.append("L" if (n & 3) == ((s & 3) - 1) & 3 else "R")
+        return "".join(commands)
+
+    def distance(self, start: Start, goal: Goal) -> Optional[int]:
+        """Length of the shortest command string, or None if unreachable."""
+        search, s = self._search_for(start, goal)
+        if search is None or not search.resolve(s):
+            return None
+        return search.dist[s]
+
+    def clear(self) -> None:
+        self._searches.clear()
+
+    def _route(self, start: Start, goal: Goal) -> Optional[List[int]]:
+        search, s = self._search_for(start, goal)
+        if search is None or not search.resolve(s):
+            return None
+        route = [s]
+        while search.dist[s]:
+            s = search.nxt[s]
+            route.append(s)
+        return route
+
+    def _search_for(self, start: Start, goal: Goal):
+        sx, sy, sh = start
+        gx, gy = goal[0], goal[1]
+        gh = CODES[goal[2]] if len(goal) > 2 and goal[2] is not None else None
+        if not (self._is_free(sx, sy) and self._is_free(gx, gy)):
+            return None, None
+        obstacles = self.plateau.obstacles
+        key = (gx, gy, gh, obstacles.version if obstacles is not None else 0, self.avoid_version)
+        search = self._searches.get(key)
+        if search is None:
+            search = self._searches[key] = _GoalSearch(self, gx, gy, gh)
+            if len(self._searches) > self.max_goals:
+                self._searches.popitem(last=False)
+        else:
+            self._searches.move_to_end(key)
+        return search, self._state(sx, sy, CODES[sh])
+
+    def _is_free(self, x: int, y: int) -> bool:
+        return self.plateau.is_free(x, y) and (x, y) not in self._avoid
+
+    def _state(self, x: int, y: int, h: int) -> int:
+        return ((y * self.width + x) << 2) | h
+
+    def _decode(self, s: int) -> Tuple[int, int, int]:
+        cell = s >> 2
+        return cell % self.width, cell // self.width, s & 3
+
+def plan_route(plateau, start: Start, goal: Goal) -> Optional[str]:
+    """One-off plan; keep a RoutePlanner around to reuse searches for the same goal."""
+    return RoutePlanner(plateau, max_goals=1).plan(start, goal)
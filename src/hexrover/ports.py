@@ -5,16 +5,31 @@ from typing import Protocol
 
 @dataclass(frozen=True)
 class Position:
+    __slots__ = ("x", "y")
     x: int
     y: int
 
+    def __reduce__(self):
+        # frozen + __slots__ cannot be restored attribute by attribute before Python 3.11
+        return Position, (self.x, self.y)
+
 class Heading(str, Enum):
     N = "N"
     E = "E"
     S = "S"
     W = "W"
 
+# Why forward() left a rover where it was (see Navigator.stop_reason)
+STOP_BOUNDARY = "boundary"    # plateau edge or obstacle
+STOP_COLLISION = "collision"  # another rover
+
 class Navigator(Protocol):
     def forward(self, pos: Position, heading: Heading) -> Position: ...
     def turn_left(self, heading: Heading) -> Heading: ...
     def turn_right(self, heading: Heading) -> Heading: ...
+    def stop_reason(self, pos: Position, heading: Heading) -> str:
+        """Why forward(pos, heading) returned pos. Only instrumentation asks, after a stop."""
+        return STOP_BOUNDARY
+    def commit(self, pos: Position) -> None:
+        """The final position of a run that moved; stateful navigators record it here."""
+        return None
@@ -0,0 +1,122 @@
+# src/lockstep.py
+"""Tick-based scheduler: every rover executes its k-th command in tick k.
+
+Turns never conflict. Moves are resolved deterministically each tick:
+  - a move off the plateau or onto an obstacle is blocked;
+  - when several rovers try to enter the same cell, the one listed first in
+    the mission wins and the others are blocked;
+  - a rover may follow another rover into the cell it is leaving this tick
+    (chains of followers are fine) as long as the rover ahead really moves;
+  - rovers entering a cell that stays occupied are blocked, and so are
+    swaps and longer rotations (a cycle of rovers chasing each other).
+
+All checks go through MissionControl's OccupancyIndex, which is updated
+only for the rovers that actually move, so a tick costs O(active rovers).
+"""
+from typing import Dict, List, Optional, Tuple
+
+from enhanced_rover import EnhancedRover, MissionControl
+from mission_trace import STEP_BLOCKED, STEP_LEFT, STEP_MOVED, STEP_RIGHT, MissionTraceWriter
+
+_VISITING, _MOVES, _BLOCKED = 1, 2, 3
+
+
+class LockstepScheduler:
+    """Runs a mission's rovers side by side, one tick at a time"""
+
+    def __init__(self, mission: MissionControl, rover_commands: List[Tuple[EnhancedRover, str]],
+                 trace: Optional[MissionTraceWriter] = None):
+        for rover, _ in rover_commands:
+            if rover.occupancy is not mission.occupancy:
+                raise ValueError(f"{rover.rover_id or 'Rover'} is not deployed in this mission")
+        self.mission = mission
+        self.tick = 0
+        self._tracks = {id(rover): trace.track(rover) for rover, _ in rover_commands} if trace else None
+        # Priority is mission order; the active list keeps it while shrinking
+        self._active = [(rover, commands) for rover, commands in rover_commands if commands]
+
+    @property
+    def finished(self) -> bool:
+        return not self._active
+
+    def run(self) -> int:
+        """Run ticks until every rover has finished and return the tick count"""
+        while self.step():
+            pass
+        return self.tick
+
+    def step(self) -> bool:
+        """Execute one tick. Returns False once there is nothing left to run."""
+        if not self._active:
+            return False
+
+        k = self.tick
+        plateau = self.mission.plateau
+        claims: Dict[Tuple[int, int], EnhancedRover] = {}
+        targets: Dict[int, Tuple[int, int]] = {}
+        movers: List[EnhancedRover] = []
+        tracks = self._tracks
+
+        for rover, commands in self._active:
+            cmd = commands[k]
+            if cmd == "L":
+                rover.turn_left()
+                if tracks:
+                    tracks[id(rover)].record(STEP_LEFT)
+            elif cmd == "R":
+                rover.turn_right()
+                if tracks:
+                    tracks[id(rover)].record(STEP_RIGHT)
+            elif cmd == "M":
+                target = rover.get_next_position()
+                if not plateau.is_free(*target) or target in claims:
+                    rover.blocked_moves += 1
+                    if tracks:
+                        tracks[id(rover)].record(STEP_BLOCKED)
+                    continue
+                claims[target] = rover
+                targets[id(rover)] = target
+                movers.append(rover)
+
+        state: Dict[int, int] = {}
+        for rover in movers:
+            self._resolve(rover, targets, state)
+
+        for rover in movers:
+            moved = state[id(rover)] == _MOVES
+            if moved:
+                rover.advance()
+            else:
+                rover.blocked_moves += 1
+            if tracks:
+                tracks[id(rover)].record(STEP_MOVED if moved else STEP_BLOCKED)
+
+        self.tick += 1
+        self._active = [(rover, commands) for rover, commands in self._active if len(commands) > self.tick]
+        return True
+
+    def _resolve(self, rover: EnhancedRover, targets: Dict[int, Tuple[int, int]], state: Dict[int, int]):
+        """Follow the chain of rovers standing in each other's way and settle it as a whole"""
+        occupancy = self.mission.occupancy
+        path = []
+        current = rover
+        while True:
+            status = state.get(id(current))
+            if status in (_MOVES, _BLOCKED):
+                outcome = status
+                break
+            if status == _VISITING:
+                outcome = _BLOCKED  # swap or rotation
+                break
+            state[id(current)] = _VISITING
+            path.append(current)
+            ahead = occupancy.occupant(*targets[id(current)])
+            if ahead is None:
+                outcome = _MOVES
+                break
+            if id(ahead) not in targets or occupancy.is_occupied(*targets[id(current)], exclude=ahead):
+                outcome = _BLOCKED  # the cell stays taken this tick
+                break
+            current = ahead
+        for settled in path:
+            state[id(settled)] = outcome
@@ -3,7 +3,12 @@ from typing import List
 from hexrover.compat.plateau_compat import Plateau
 from hexrover.compat.rover_compat import Rover
 
-def run_simulation(input_str: str) -> str:
+def run_simulation(input_str: str, workers: int = 1, obstacles=None) -> str:
+    if workers != 1:
+        # rovers are independent, so fan them out over a process pool (0 = all CPUs)
+        from parallel import run_simulation_parallel
+        return run_simulation_parallel(input_str, workers, obstacles)
+
     # normalize and ignore blank lines
     lines: List[str] = [ln.strip() for ln in input_str.strip().splitlines() if ln.strip()]
     if not lines:
@@ -11,7 +16,7 @@ def run_simulation(input_str: str) -> str:
 
     # plateau dims
     max_x, max_y = map(int, lines[0].split())
-    plateau = Plateau(max_x, max_y)
+    plateau = Plateau(max_x, max_y, obstacles)
 
     results: List[str] = []
     # process pairs: position line, commands line
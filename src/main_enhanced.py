@@ -1,31 +1,71 @@
 # src/main_enhanced.py
+"""Command line entry point: run, visualize, interactive, bench and compile subcommands.
+
+Each subcommand imports only what it needs, so the plain text `run` that shell
+pipelines call thousands of times never loads the visualizer, the interactive
+controller or the streaming pipeline. Invocations without a subcommand keep
+the original flags (--visual, --interactive, --replay, ...) and are routed to
+the matching subcommand.
+"""
 import sys
 import argparse
-from typing import List
+from typing import List, Optional
+
+from colors import Colors
+
+COMMANDS = ('run', 'visualize', 'interactive', 'bench', 'compile')
+
+# Modules of this repo a plain `run` may import (tests/test_cli.py holds it to this)
+RUN_IMPORT_BUDGET = frozenset({
+    'main_enhanced', 'colors', 'mission_format',
+    'hexrover', 'hexrover.ports', 'hexrover.kernel', 'hexrover.optimizer', 'hexrover.domain', 'hexrover.cache',
+    'hexrover.adapters', 'hexrover.adapters.grid_nav', 'hexrover.adapters.terrain',
+    'hexrover.compat', 'hexrover.compat.plateau_compat', 'hexrover.compat.rover_compat',
+})
+# Wall time `bench --startup` allows for one plain `run` of the built-in example
+STARTUP_BUDGET_SECONDS = 0.25
+
+EXAMPLE_INPUT = """5 5
+1 2 N
+LMLMLMLMM
+3 3 E
+MMRMMRMRRM"""
 
-from hexrover.compat.plateau_compat import Plateau
-from hexrover.compat.rover_compat import Rover
-from visualizer import visualize_simulation, Colors
-from interactive_mode import InteractiveRoverController
 
+def run_simulation(input_str: str, workers: int = 1, obstacles=None, instrumentation=None) -> str:
+    if workers != 1:
+        if instrumentation is not None:
+            raise ValueError("instrumentation needs a single worker")
+        # rovers are independent, so fan them out over a process pool (0 = all CPUs)
+        from parallel import run_simulation_parallel
+        return run_simulation_parallel(input_str, workers, obstacles)
+
+    from hexrover.compat.plateau_compat import Plateau
+    from hexrover.compat.rover_compat import Rover
 
-def run_simulation(input_str: str) -> str:
     lines: List[str] = [ln.strip() for ln in input_str.strip().splitlines() if ln.strip()]
     if not lines:
         return ""
 
     # plateau
     max_x, max_y = map(int, lines[0].split())
-    plateau = Plateau(max_x, max_y)
+    plateau = Plateau(max_x, max_y, obstacles)
 
     results: List[str] = []
     # process pairs: position line, commands line
     for i in range(1, len(lines), 2):
         x, y, heading = lines[i].split()
-        rover = Rover(int(x), int(y), heading.upper(), plateau)
-
         commands = lines[i + 1].strip().upper()
-        rover.execute_commands(commands)
+        if instrumentation is None:
+            rover = Rover(int(x), int(y), heading.upper(), plateau)
+            rover.execute_commands(commands)
+        else:
+            from hexrover.adapters.grid_nav import GridNavigator
+            rover_id = f"Rover-{(i // 2) + 1}"
+            nav = instrumentation.navigator(GridNavigator(plateau._inner), rover_id)
+            rover = Rover(int(x), int(y), heading.upper(), plateau, nav)
+            with instrumentation.timed(rover_id):
+                rover.execute_commands(commands)
 
         # append as string "x y H" (legacy format)
         results.append(str(rover))            # compat __str__ -> "x y H"
@@ -46,79 +86,150 @@ def read_input_file(filename: str) -> str:
         sys.exit(1)
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Mars Rover Kata - Navigate rovers on Mars plateau",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=f"""
-{Colors.BOLD}Examples:{Colors.RESET}
-  {Colors.CYAN}python main_enhanced.py{Colors.RESET}                    # Run with built-in example
-  {Colors.CYAN}python main_enhanced.py --file input.txt{Colors.RESET}   # Run with input file  
-  {Colors.CYAN}python main_enhanced.py --visual{Colors.RESET}          # Visual simulation
-  {Colors.CYAN}python main_enhanced.py --interactive{Colors.RESET}     # Interactive mode
-  {Colors.CYAN}python main_enhanced.py --visual --speed 0.5{Colors.RESET} # Slower animation
+def read_input(args) -> str:
+    """--file contents, or the built-in example"""
+    if args.file:
+        return read_input_file(args.file)
+    print(f"{Colors.YELLOW}Using built-in example data...{Colors.RESET}")
+    return EXAMPLE_INPUT
 
-{Colors.BOLD}Input format:{Colors.RESET}
-  Line 1: plateau_max_x plateau_max_y
-  Line 2: rover1_x rover1_y rover1_direction
-  Line 3: rover1_commands
-  Line 4: rover2_x rover2_y rover2_direction  
-  Line 5: rover2_commands
-  ... (repeat for additional rovers)
-        """
-    )
 
-    parser.add_argument('--file', '-f',
-                        help='Input file containing rover instructions')
+def load_mission_obstacles(args, input_data: str):
+    """The --obstacles map sized to the mission's plateau (None without the flag)"""
+    if not args.obstacles:
+        return None
+    from hexrover.adapters.terrain import load_obstacles
+    max_x, max_y = map(int, input_data.strip().splitlines()[0].split())
+    return load_obstacles(args.obstacles, max_x, max_y)
 
-    parser.add_argument('--visual', '-v', action='store_true',
-                        help='Run visual simulation with animation')
 
-    parser.add_argument('--interactive', '-i', action='store_true',
-                        help='Run in interactive mode for manual control')
+def load_compiled_obstacles(args):
+    """load_mission_obstacles for a compiled --file"""
+    if not args.obstacles:
+        return None
+    from hexrover.adapters.terrain import load_obstacles
+    from mission_format import MissionFile
+    with MissionFile(args.file) as mission:
+        return load_obstacles(args.obstacles, mission.max_x, mission.max_y)
 
-    parser.add_argument('--speed', '-s', type=float, default=0.8,
-                        help='Animation speed in seconds (default: 0.8)')
 
-    parser.add_argument('--output', '-o',
-                        help='Output file to save results')
+def parse_viewport(args):
+    """Build a Viewport from --viewport/--follow/--zoom (None draws the whole plateau)"""
+    if not args.viewport:
+        return None
+    from visualizer import Viewport
+    width, height = (int(v) for v in args.viewport.lower().split('x'))
+    follow = args.follow.lower()
+    if follow == 'none':
+        target = None
+    elif follow == 'fleet':
+        target = 'fleet'
+    else:
+        target = int(follow) - 1  # rovers are numbered from 1 on screen
+    return Viewport(width=width, height=height, follow=target, zoom=args.zoom)
 
-    args = parser.parse_args()
 
-    # Interactive mode
-    if args.interactive:
-        controller = InteractiveRoverController()
-        controller.run()
+def print_trace_summary(path: str):
+    """Print final positions and aggregate statistics rebuilt from a mission trace"""
+    from mission_trace import MissionTrace
+    with MissionTrace(path) as trace:
+        stats = trace.get_mission_statistics()
+    print(f"{Colors.BOLD}{Colors.GREEN}Mission trace {path} ({stats['plateau_size']} plateau):{Colors.RESET}")
+    for rover in stats['rover_stats']:
+        print(f"  {rover.rover_id}: {rover.final_position} "
+              f"({rover.moves_made} moves, {rover.turns_made} turns, {rover.blocked_moves} blocked)")
+    agg = stats['aggregates']
+    print(f"Positions explored: {agg['unique_positions_explored']} ({agg['plateau_coverage']} coverage)")
+
+
+# ---------- subcommands ----------
+
+def cmd_run(args):
+    """Text simulation, streaming, or a mission trace summary"""
+    if args.load_trace:
+        try:
+            print_trace_summary(args.load_trace)
+        except (OSError, ValueError) as e:
+            print(f"{Colors.RED}Error reading trace: {e}{Colors.RESET}")
+            sys.exit(1)
         return
 
-    # Get input data
+    # Files written by `compile` skip text parsing entirely
+    compiled = False
     if args.file:
-        input_data = read_input_file(args.file)
-    else:
-        # Default example
-        input_data = """5 5
-1 2 N
-LMLMLMLMM
-3 3 E
-MMRMMRMRRM"""
-        print(f"{Colors.YELLOW}Using built-in example data...{Colors.RESET}")
+        from mission_format import is_compiled_mission
+        compiled = is_compiled_mission(args.file)
+    if compiled and (args.stream or args.trace or args.instrument is not None):
+        print(f"{Colors.RED}Error: --stream, --trace and --instrument need a text mission{Colors.RESET}")
+        sys.exit(1)
+    if args.engine == 'batch' and args.workers != 1:
+        print(f"{Colors.RED}Error: --workers needs the standard engine; --engine batch runs in one process{Colors.RESET}")
+        sys.exit(1)
+
+    # Streaming mode: keep stdout clean for pipelines
+    if args.stream:
+        from pipeline import run_pipeline
+        try:
+            obstacles = None
+            if args.obstacles:
+                from hexrover.adapters.terrain import load_obstacles
+                obstacles = load_obstacles(args.obstacles)
+            count = run_pipeline(args.file or '-', args.output or '-', args.workers, obstacles)
+        except FileNotFoundError:
+            print(f"{Colors.RED}Error: File '{args.file}' not found.{Colors.RESET}", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            print(f"{Colors.RED}Error during simulation: {e}{Colors.RESET}", file=sys.stderr)
+            sys.exit(1)
+        if args.output:
+            print(f"{Colors.GREEN}Streamed {count} rover results to '{args.output}'{Colors.RESET}")
+        return
 
+    input_data = None if compiled else read_input(args)
     try:
-        if args.visual:
-            # Visual simulation
-            print(f"{Colors.BOLD}{Colors.CYAN}🚀 Starting Visual Mars Rover Simulation 🚀{Colors.RESET}")
-            visualize_simulation(input_data, delay=args.speed)
+        if compiled:
+            obstacles = load_compiled_obstacles(args)
         else:
-            # Standard text-based simulation
-            print(f"{Colors.BOLD}{Colors.GREEN}Mars Rover Simulation Results:{Colors.RESET}")
-            result = run_simulation(input_data)
-            print(result)
+            obstacles = load_mission_obstacles(args, input_data)
+        print(f"{Colors.BOLD}{Colors.GREEN}Mars Rover Simulation Results:{Colors.RESET}")
+        instrumentation = None
+        if args.instrument is not None:
+            from hexrover.instrumentation import Instrumentation
+            instrumentation = Instrumentation()
+        if compiled:
+            from mission_format import run_compiled
+            result = run_compiled(args.file, args.workers, obstacles, args.engine)
+        elif args.trace:
+            from enhanced_rover import run_enhanced_simulation
+            # rovers ignore each other here as in run_simulation, so tracing changes nothing
+            stats = run_enhanced_simulation(input_data, enable_collisions=False, trace=args.trace,
+                                            obstacles=obstacles, instrumentation=instrumentation)
+            result = "\n".join(rover.final_position for rover in stats['rover_stats'])
+        elif args.engine == 'batch':
+            if obstacles is not None:
+                raise ValueError("the batch engine does not support obstacles; use --engine standard")
+            if instrumentation is not None:
+                raise ValueError("the batch engine does not support --instrument; use --engine standard")
+            from batch_engine import run_batch_simulation
+            result = run_batch_simulation(input_data)
+        else:
+            result = run_simulation(input_data, args.workers, obstacles, instrumentation)
+        print(result)
+        if instrumentation is not None:
+            print(f"{Colors.BOLD}{Colors.CYAN}Instrumentation:{Colors.RESET}")
+            print(instrumentation.format_report())
+            if args.instrument:
+                with open(args.instrument, 'w') as f:
+                    f.write(instrumentation.to_json())
+                print(f"{Colors.GREEN}Instrumentation saved to '{args.instrument}'{Colors.RESET}")
+        if args.trace:
+            print(f"{Colors.GREEN}Mission trace saved to '{args.trace}'{Colors.RESET}")
 
-            # Save to file if requested
-            if args.output:
-                with open(args.output, 'w') as f:
-                    f.write(result)
-                print(f"{Colors.GREEN}Results saved to '{args.output}'{Colors.RESET}")
+        # Save to file if requested
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(result)
+            print(f"{Colors.GREEN}Results saved to '{args.output}'{Colors.RESET}")
 
     except KeyboardInterrupt:
         print(f"\n{Colors.YELLOW}Simulation interrupted by user.{Colors.RESET}")
@@ -127,5 +238,336 @@ MMRMMRMRRM"""
         sys.exit(1)
 
 
+def cmd_visualize(args):
+    """Animated simulation, a mission trace replay, or playback of a recording"""
+    if args.replay:
+        from recording import replay_recording
+        try:
+            replay_recording(args.replay, speed=args.replay_speed)
+        except FileNotFoundError:
+            print(f"{Colors.RED}Error: File '{args.replay}' not found.{Colors.RESET}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print(f"\n{Colors.YELLOW}Replay interrupted by user.{Colors.RESET}")
+        return
+
+    from visualizer import visualize_simulation, visualize_trace
+    if args.load_trace:
+        try:
+            visualize_trace(args.load_trace, delay=args.speed, differential=not args.full_redraw,
+                            viewport=parse_viewport(args), headless=args.headless,
+                            frame_every=args.every, key_events_only=args.key_events, record=args.record)
+        except (OSError, ValueError) as e:
+            print(f"{Colors.RED}Error reading trace: {e}{Colors.RESET}")
+            sys.exit(1)
+        return
+
+    input_data = read_input(args)
+    try:
+        obstacles = load_mission_obstacles(args, input_data)
+        print(f"{Colors.BOLD}{Colors.CYAN}🚀 Starting Visual Mars Rover Simulation 🚀{Colors.RESET}")
+        visualize_simulation(input_data, delay=args.speed, differential=not args.full_redraw,
+                             viewport=parse_viewport(args), headless=args.headless,
+                             frame_every=args.every, key_events_only=args.key_events,
+                             record=args.record, obstacles=obstacles)
+        if args.record:
+            print(f"{Colors.GREEN}Recording saved to '{args.record}'{Colors.RESET}")
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}Simulation interrupted by user.{Colors.RESET}")
+    except Exception as e:
+        print(f"{Colors.RED}Error during simulation: {e}{Colors.RESET}")
+        sys.exit(1)
+
+
+def cmd_interactive(args):
+    from interactive_mode import InteractiveRoverController
+    InteractiveRoverController().run()
+
+
+def generate_mission(rovers: int, commands: int, plateau: int, seed: int = 473) -> str:
+    """Deterministic random mission for `bench` when no --file is given"""
+    import random
+    rng = random.Random(seed)
+    lines = [f"{plateau} {plateau}"]
+    for _ in range(rovers):
+        lines.append(f"{rng.randint(0, plateau)} {rng.randint(0, plateau)} {rng.choice('NESW')}")
+        lines.append("".join(rng.choice("LRMM") for _ in range(commands)))
+    return "\n".join(lines)
+
+
+def measure_startup(repeat: int) -> List[float]:
+    """Wall time of `repeat` fresh `run` invocations on the built-in example"""
+    import os
+    import subprocess
+    import time
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.abspath(__file__), 'run'],
+                       stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def cmd_bench(args):
+    """Time the text engines on a mission (cold run cache), and optionally the CLI's own start-up"""
+    import time
+    if args.startup:
+        times = sorted(measure_startup(args.startup))
+        best, median = times[0], times[len(times) // 2]
+        within = best <= STARTUP_BUDGET_SECONDS
+        colour = Colors.GREEN if within else Colors.RED
+        print(f"{colour}Start-up of `run`: best {best * 1e3:.1f} ms, median {median * 1e3:.1f} ms "
+              f"(budget {STARTUP_BUDGET_SECONDS * 1e3:.0f} ms){Colors.RESET}")
+        if not within:
+            sys.exit(1)
+        return
+
+    if args.file:
+        from mission_format import MissionFile, is_compiled_mission
+        if is_compiled_mission(args.file):
+            with MissionFile(args.file) as mission:
+                input_data = mission.text()
+        else:
+            input_data = read_input_file(args.file)
+    else:
+        input_data = generate_mission(args.rovers, args.commands, args.plateau)
+    lines = [ln for ln in input_data.splitlines() if ln.strip()]
+    total = sum(len(ln.strip()) for ln in lines[2::2])
+    print(f"{Colors.BOLD}Benchmark: {len(lines) // 2} rovers, {total:,} commands{Colors.RESET}")
+    from hexrover.cache import default_cache
+    engines = ['standard', 'batch'] if args.engine == 'all' else [args.engine]
+    for engine in engines:
+        if engine == 'batch':
+            try:
+                from batch_engine import run_batch_simulation
+            except ImportError:
+                print(f"  {engine:9} skipped (needs numpy)")
+                continue
+            simulate = run_batch_simulation
+        else:
+            def simulate(text):
+                return run_simulation(text, args.workers)
+        best = float('inf')
+        for _ in range(args.repeat):
+            default_cache.clear()  # both engines share it; a warm cache would time lookups, not runs
+            start = time.perf_counter()
+            simulate(input_data)
+            best = min(best, time.perf_counter() - start)
+        rate = total / best if best > 0 else float('inf')
+        print(f"  {engine:9} {best * 1e3:10.1f} ms {rate:16,.0f} commands/s")
+
+
+def cmd_compile(args):
+    """Convert a text mission into the packed binary format `run` reads directly"""
+    import os
+    from mission_format import compile_mission
+    try:
+        count = compile_mission(args.source, args.output)
+    except FileNotFoundError:
+        print(f"{Colors.RED}Error: File '{args.source}' not found.{Colors.RESET}")
+        sys.exit(1)
+    except (ValueError, KeyError) as e:
+        print(f"{Colors.RED}Error compiling mission: {e}{Colors.RESET}")
+        sys.exit(1)
+    size = os.path.getsize(args.output)
+    print(f"{Colors.GREEN}Compiled {count} rovers into '{args.output}' ({size:,} bytes){Colors.RESET}")
+
+
+HANDLERS = {'run': cmd_run, 'visualize': cmd_visualize, 'interactive': cmd_interactive, 'bench': cmd_bench,
+            'compile': cmd_compile}
+
+
+def legacy_command(args) -> str:
+    """The subcommand a flag-only invocation (the pre-subcommand CLI) stands for"""
+    if args.interactive:
+        return 'interactive'
+    if args.replay or ((args.visual or args.record) and (args.load_trace or not args.stream)):
+        return 'visualize'
+    return 'run'
+
+
+# ---------- argument parsing ----------
+
+def add_input_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--file', '-f',
+                        help='Input file containing rover instructions')
+
+    parser.add_argument('--obstacles', metavar='FILE',
+                        help='Obstacle map: "x y" lines, or a binary map (memory-mapped, '
+                             'shared by --workers processes); --stream needs the binary form')
+
+
+def add_run_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Save a binary mission trace (rovers ignore each other, as in a plain run)')
+
+    parser.add_argument('--instrument', nargs='?', const='', metavar='JSON_FILE',
+                        help='Count moves, turns and stops and time each rover in text mode; '
+                             'print the report, and also write it as JSON if a file is given')
+
+    parser.add_argument('--output', '-o',
+                        help='Output file to save results')
+
+    parser.add_argument('--engine', '-e', choices=['standard', 'batch'], default='standard',
+                        help='Simulation engine for text mode: standard (rover by rover) '
+                             'or batch (NumPy-vectorized, all rovers at once)')
+
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream rovers from --file (default stdin) to --output (default stdout) '
+                             'in constant memory; .gz/.bz2/.xz are handled transparently')
+
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Worker processes for the standard engine and --stream '
+                             '(default: 1, 0 = one per CPU; not with --engine batch)')
+
+
+def add_visual_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--speed', '-s', type=float, default=0.8,
+                        help='Animation speed in seconds (default: 0.8)')
+
+    parser.add_argument('--full-redraw', action='store_true',
+                        help='Clear and redraw the whole screen every frame instead of '
+                             'repainting only the cells that changed')
+
+    parser.add_argument('--viewport', metavar='WxH',
+                        help='Only draw a WxH window of cells, e.g. 40x20 (for large plateaus)')
+
+    parser.add_argument('--follow', default='fleet',
+                        help="What the viewport tracks: 'fleet' (bounding box), a rover number, "
+                             "or 'none' (default: fleet)")
+
+    parser.add_argument('--zoom', type=int, default=1,
+                        help='Plateau cells per viewport cell; blocks show trail density '
+                             '(default: 1, 0 = fit the fleet)')
+
+    parser.add_argument('--headless', action='store_true',
+                        help='Run the visual simulation without any delays (for CI or recording)')
+
+    parser.add_argument('--every', type=int, default=1, metavar='N',
+                        help="Draw every Nth step (plus each rover's last one) (default: 1)")
+
+    parser.add_argument('--key-events', action='store_true',
+                        help="Only draw blocked moves and each rover's final step")
+
+    parser.add_argument('--record', metavar='FILE',
+                        help='Record the visual simulation to an asciicast (v2) file')
+
+    parser.add_argument('--replay', metavar='FILE',
+                        help='Play back a recording made with --record and exit')
+
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                        help='Playback speed multiplier for --replay (default: 1.0, 0 = no waits)')
+
+
+def add_load_trace_argument(parser: argparse.ArgumentParser, help: str):
+    parser.add_argument('--load-trace', metavar='FILE', help=help)
+
+
+def build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """The parser for one subcommand, or (None) the flag-only legacy interface"""
+    prog = 'main_enhanced.py'
+    if command == 'run':
+        parser = argparse.ArgumentParser(prog=f'{prog} run', description='Run a mission and print final positions')
+        add_input_arguments(parser)
+        add_run_arguments(parser)
+        add_load_trace_argument(parser, 'Report on a saved mission trace instead of running')
+    elif command == 'visualize':
+        parser = argparse.ArgumentParser(prog=f'{prog} visualize', description='Animate a mission in the terminal')
+        add_input_arguments(parser)
+        add_visual_arguments(parser)
+        add_load_trace_argument(parser, 'Replay a saved mission trace')
+    elif command == 'interactive':
+        parser = argparse.ArgumentParser(prog=f'{prog} interactive', description='Drive rovers by hand')
+    elif command == 'bench':
+        parser = argparse.ArgumentParser(prog=f'{prog} bench',
+                                         description='Time the simulation engines, or the CLI start-up')
+        add_input_arguments(parser)
+        parser.add_argument('--engine', '-e', choices=['standard', 'batch', 'all'], default='standard',
+                            help='Engine(s) to time (default: standard)')
+        parser.add_argument('--workers', '-w', type=int, default=1,
+                            help='Worker processes for the standard engine (default: 1, 0 = one per CPU)')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed repeats; the best is kept (default: 3)')
+        parser.add_argument('--rovers', type=int, default=100, help='Rovers in the generated mission (default: 100)')
+        parser.add_argument('--commands', type=int, default=1000,
+                            help='Commands per generated rover (default: 1000)')
+        parser.add_argument('--plateau', type=int, default=50, help='Generated plateau max_x = max_y (default: 50)')
+        parser.add_argument('--startup', type=int, nargs='?', const=10, metavar='N',
+                            help=f'Instead, time N fresh `run` processes (default: 10) against the '
+                                 f'{STARTUP_BUDGET_SECONDS * 1e3:.0f} ms budget; exits 1 when over it')
+    elif command == 'compile':
+        parser = argparse.ArgumentParser(prog=f'{prog} compile',
+                                         description='Pack a text mission into the binary format (2 bits per '
+                                                     'command) that `run -f` loads without parsing')
+        parser.add_argument('source', help='Text mission, optionally .gz/.bz2/.xz compressed ("-" for stdin)')
+        parser.add_argument('output', help='Compiled mission file to write')
+    else:
+        parser = argparse.ArgumentParser(
+            prog=prog,
+            description="Mars Rover Kata - Navigate rovers on Mars plateau",
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog=f"""
+{Colors.BOLD}Subcommands{Colors.RESET} (each takes --help; without one, the flags below apply):
+  {Colors.CYAN}run{Colors.RESET}          Text simulation, --stream, or a --load-trace summary
+  {Colors.CYAN}visualize{Colors.RESET}    Animated simulation, trace replay or --replay of a recording
+  {Colors.CYAN}interactive{Colors.RESET}  Manual control
+  {Colors.CYAN}bench{Colors.RESET}        Time the engines (or --startup of `run`)
+  {Colors.CYAN}compile{Colors.RESET}      Pack a text mission into the binary format `run -f` reads
+
+{Colors.BOLD}Examples:{Colors.RESET}
+  {Colors.CYAN}python main_enhanced.py{Colors.RESET}                    # Run with built-in example
+  {Colors.CYAN}python main_enhanced.py run -f input.txt{Colors.RESET}   # Run with input file
+  {Colors.CYAN}python main_enhanced.py visualize{Colors.RESET}          # Visual simulation
+  {Colors.CYAN}python main_enhanced.py interactive{Colors.RESET}        # Interactive mode
+  {Colors.CYAN}python main_enhanced.py visualize --speed 0.5{Colors.RESET} # Slower animation
+  {Colors.CYAN}python main_enhanced.py run --engine batch -f big.txt{Colors.RESET} # Vectorized engine (needs numpy)
+  {Colors.CYAN}zcat big.txt.gz | python main_enhanced.py run --stream{Colors.RESET} # Constant-memory streaming from stdin
+  {Colors.CYAN}python main_enhanced.py run -f big.txt --workers 0{Colors.RESET} # Run rovers on all CPU cores
+  {Colors.CYAN}python main_enhanced.py visualize --headless --record run.cast{Colors.RESET} # Record without waiting
+  {Colors.CYAN}python main_enhanced.py visualize --replay run.cast --replay-speed 4{Colors.RESET} # Play a recording back
+  {Colors.CYAN}python main_enhanced.py run -f big.txt --trace big.trace{Colors.RESET} # Save a compact binary mission trace
+  {Colors.CYAN}python main_enhanced.py visualize --load-trace big.trace{Colors.RESET} # Replay a mission trace
+  {Colors.CYAN}python main_enhanced.py visualize --obstacles rocks.txt{Colors.RESET} # Boulders from "x y" lines
+  {Colors.CYAN}python main_enhanced.py run -f big.txt --instrument m.json{Colors.RESET} # Per-rover counters, timings as JSON
+  {Colors.CYAN}python main_enhanced.py bench --engine all{Colors.RESET}  # Time the engines on a generated mission
+  {Colors.CYAN}python main_enhanced.py bench --startup{Colors.RESET}     # Check `run` start-up against its budget
+  {Colors.CYAN}python main_enhanced.py compile big.txt big.mrm{Colors.RESET} # Pack commands 2 bits each
+  {Colors.CYAN}python main_enhanced.py run -f big.mrm{Colors.RESET}      # Run a compiled mission, no parsing
+
+{Colors.BOLD}Input format:{Colors.RESET}
+  Line 1: plateau_max_x plateau_max_y
+  Line 2: rover1_x rover1_y rover1_direction
+  Line 3: rover1_commands
+  Line 4: rover2_x rover2_y rover2_direction
+  Line 5: rover2_commands
+  ... (repeat for additional rovers)
+        """
+        )
+        add_input_arguments(parser)
+
+        parser.add_argument('--visual', '-v', action='store_true',
+                            help='Run visual simulation with animation')
+
+        parser.add_argument('--interactive', '-i', action='store_true',
+                            help='Run in interactive mode for manual control')
+
+        add_visual_arguments(parser)
+        add_run_arguments(parser)
+        add_load_trace_argument(parser, 'Report on a saved mission trace (or replay it with --visual)')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # only the chosen subcommand's parser is built
+    if argv and argv[0] in COMMANDS:
+        command = argv[0]
+        args = build_parser(command).parse_args(argv[1:])
+    else:
+        args = build_parser().parse_args(argv)
+        command = legacy_command(args)
+    HANDLERS[command](args)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,239 @@
+# src/mission_format.py
+"""Compiled binary missions: commands packed 2 bits each, read back through mmap.
+
+File layout (little-endian):
+
+    header      fixed width, see HEADER; holds the offset of the rover table
+    commands    per rover, its commands packed four to a byte, byte aligned
+    rover table one fixed-width ROVER_ENTRY per rover
+
+Command codes are CMD_LEFT, CMD_RIGHT and CMD_MOVE. Unlike a mission trace,
+the first command of a byte sits in its top two bits, so the hex digits of
+the packed bytes hold commands in order, and unpack_commands() decodes a
+whole rover with a few C-level translate and slice calls. Commands other
+than L, R and M are dropped when compiling; every engine ignores them
+anyway, so results do not change.
+
+MissionFile does no parsing when it opens a file. rover(i) is one unpack
+from the table, and the packed commands come back as a memoryview into the
+mapping rather than a copy.
+
+Compiling writes to a temporary file next to the target and renames it into
+place, so a mission that fails to parse never leaves a partial file behind.
+"""
+import binascii
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, NamedTuple, Tuple
+
+from hexrover.kernel import CODES, HEADINGS
+
+MAGIC = b"MRMF"
+VERSION = 1
+
+# magic, version, max_x, max_y, rover_count, table_offset
+HEADER = struct.Struct("<4sHxxiiIQ")
+# x, y, heading code, command count, commands offset
+ROVER_ENTRY = struct.Struct("<iiBIQ")
+# ROVER_ENTRY as a NumPy structured dtype, for reading the whole table as one array
+ROVER_DTYPE = [("x", "<i4"), ("y", "<i4"), ("h", "u1"), ("length", "<u4"), ("offset", "<u8")]
+
+CMD_LEFT, CMD_RIGHT, CMD_MOVE = range(3)
+
+
+def _digit_table() -> bytes:
+    """bytes.translate table: command letter (either case) -> its base-4 digit"""
+    table = bytearray(range(256))
+    for letters, code in ((b"Ll", CMD_LEFT), (b"Rr", CMD_RIGHT), (b"Mm", CMD_MOVE)):
+        for c in letters:
+            table[c] = ord("0") + code
+    return bytes(table)
+
+
+def _letter_table(shift: int) -> bytes:
+    """bytes.translate table: hex digit (two packed commands) -> the letter at `shift`"""
+    table = bytearray(256)
+    for n, digit in enumerate(b"0123456789abcdef"):
+        table[digit] = b"LRM?"[(n >> shift) & 3]
+    return bytes(table)
+
+
+_DIGITS = _digit_table()
+_NOT_COMMANDS = bytes(c for c in range(256) if c not in b"LlRrMm")  # deleted while packing
+_FIRST, _SECOND = _letter_table(2), _letter_table(0)
+
+
+class CompiledRover(NamedTuple):
+    x: int
+    y: int
+    heading: int          # kernel heading code
+    length: int           # number of commands
+    commands: memoryview  # packed, see unpack_commands
+
+
+def pack_commands(commands: str) -> Tuple[bytes, int]:
+    """(packed bytes, command count) for an L/R/M string"""
+    digits = commands.encode("ascii", "ignore").translate(_DIGITS, _NOT_COMMANDS)
+    count = len(digits)
+    if not count:
+        return b"", 0
+    padding = -count % 4
+    # base 4 is a power of two, so int() and to_bytes() are linear in the length
+    return int(digits + b"0" * padding, 4).to_bytes((count + padding) >> 2, "big"), count
+
+
+def unpack_commands(packed, count: int) -> str:
+    """The L/R/M string for `count` commands packed in `packed` (bytes or memoryview)"""
+    digits = binascii.hexlify(packed)
+    letters = bytearray(2 * len(digits))
+    letters[0::2] = digits.translate(_FIRST)
+    letters[1::2] = digits.translate(_SECOND)
+    return letters[:count].decode("ascii")
+
+
+def compile_rovers(max_x: int, max_y: int, rovers: Iterable[Tuple[int, int, str, str]], path: str) -> int:
+    """Write pipeline.RoverSpec tuples as a compiled mission; returns the rover count"""
+    table = bytearray()
+    count = 0
+    temp = f"{path}.{os.getpid()}.tmp"  # same directory, so the rename is atomic
+    f = open(temp, "wb")
+    try:
+        with f:
+            f.write(bytes(HEADER.size))  # rewritten once the table offset is known
+            offset = HEADER.size
+            for x, y, heading, commands in rovers:
+                packed, length = pack_commands(commands)
+                table += ROVER_ENTRY.pack(x, y, CODES[heading.upper()], length, offset)
+                f.write(packed)
+                offset += len(packed)
+                count += 1
+            f.write(table)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, max_x, max_y, count, offset))
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+    return count
+
+
+def compile_mission(source: str, path: str) -> int:
+    """Convert a text mission file (optionally compressed, "-" for stdin) into `path`"""
+    from pipeline import open_input, parse_mission
+    src = open_input(source)
+    try:
+        max_x, max_y, rovers = parse_mission(src)
+        return compile_rovers(max_x, max_y, rovers, path)
+    finally:
+        if source == "-":
+            src.detach()  # leave the process's stdin open
+        else:
+            src.close()
+
+
+def is_compiled_mission(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class MissionFile:
+    """Read-only view of a compiled mission; nothing is decoded until it is asked for"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"{path} is not a compiled mission")
+        if len(self._map) < HEADER.size or self._map[:4] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a compiled mission")
+        _, version, self.max_x, self.max_y, self.rover_count, self.table_offset = HEADER.unpack_from(self._map, 0)
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported compiled mission version: {version}")
+        self._view = memoryview(self._map)
+
+    def __len__(self) -> int:
+        return self.rover_count
+
+    @property
+    def buffer(self) -> memoryview:
+        """The whole mapping; ROVER_ENTRY offsets (and table_offset) index into it"""
+        return self._view
+
+    def rover(self, index: int) -> CompiledRover:
+        if not 0 <= index < self.rover_count:
+            raise IndexError(f"Rover index {index} out of range")
+        x, y, h, length, offset = ROVER_ENTRY.unpack_from(self._map, self.table_offset + index * ROVER_ENTRY.size)
+        return CompiledRover(x, y, h, length, self._view[offset:offset + ((length + 3) >> 2)])
+
+    def __iter__(self) -> Iterator[CompiledRover]:
+        view = self._view
+        table = view[self.table_offset:self.table_offset + self.rover_count * ROVER_ENTRY.size]
+        new = tuple.__new__  # skips NamedTuple's Python-level __new__
+        for x, y, h, length, offset in ROVER_ENTRY.iter_unpack(table):
+            yield new(CompiledRover, (x, y, h, length, view[offset:offset + ((length + 3) >> 2)]))
+
+    def commands(self, index: int) -> str:
+        rover = self.rover(index)
+        return unpack_commands(rover.commands, rover.length)
+
+    def specs(self) -> Iterator[Tuple[int, int, str, str]]:
+        """The rovers as pipeline.RoverSpec tuples, for pipeline.simulate and parallel"""
+        for x, y, h, length, packed in self:
+            yield x, y, HEADINGS[h], unpack_commands(packed, length)
+
+    def text(self) -> str:
+        """The mission in the text format run_simulation reads"""
+        lines = [f"{self.max_x} {self.max_y}"]
+        for x, y, heading, commands in self.specs():
+            lines.append(f"{x} {y} {heading}")
+            lines.append(commands)
+        return "\n".join(lines)
+
+    def close(self):
+        try:
+            if getattr(self, "_view", None) is not None:
+                self._view.release()
+            self._map.close()
+        except BufferError:
+            pass  # rover views still reference the mapping; it goes away with the last one
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def simulate_compiled(mission: MissionFile, obstacles=None) -> Iterator[str]:
+    """pipeline.simulate for a compiled mission: raw ints and packed commands straight from the mapping"""
+    from hexrover.adapters.grid_nav import GridNavigator, Plateau
+    execute = GridNavigator(Plateau(mission.max_x, mission.max_y, obstacles)).execute_packed
+    for x, y, h, length, packed in mission:
+        x, y, h = execute(x, y, h, packed, length)
+        yield f"{x} {y} {HEADINGS[h]}"
+
+
+def run_compiled(path: str, workers: int = 1, obstacles=None, engine: str = "standard") -> str:
+    """run_simulation's output for a compiled mission file"""
+    with MissionFile(path) as mission:
+        if engine == "batch":
+            if obstacles is not None:
+                raise ValueError("the batch engine does not support obstacles; use --engine standard")
+            if workers != 1:
+                raise ValueError("the batch engine runs in one process; use --engine standard for workers")
+            from batch_engine import run_batch_compiled
+            return run_batch_compiled(mission)
+        if workers != 1:
+            from parallel import simulate_parallel
+            return "\n".join(simulate_parallel(mission.max_x, mission.max_y, list(mission.specs()),
+                                               workers, obstacles=obstacles))
+        return "\n".join(simulate_compiled(mission, obstacles))
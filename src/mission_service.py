@@ -0,0 +1,284 @@
+# src/mission_service.py
+"""Long-running asyncio TCP service for missions, so callers skip interpreter start-up.
+
+Protocol (UTF-8, line based): a client sends a mission in the usual text format
+followed by a blank line, or just closes its side of the connection. The service
+answers with one "x y H" line per rover, then a blank line. Failures come back as a
+single "ERROR <message>" line before the blank line. A connection may send any
+number of missions, and replies come back in order.
+
+Small missions are queued, and whatever has piled up while the engines were busy
+runs in the next single executor call; up to one call per executor worker is in
+flight. Larger missions are cut into chunks (parallel.iter_chunks) that are all
+submitted at once, and written back in order as they finish. The queue is bounded:
+when it is full, handlers stop reading, so TCP flow control pushes back on clients.
+A request that is not UTF-8 or has a line over LINE_LIMIT gets an ERROR reply, and
+its connection is closed. The service binds to 127.0.0.1 by default.
+"""
+import argparse
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple
+
+from parallel import iter_chunks
+from pipeline import parse_mission, simulate
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7473
+# Missions up to this many bytes are batched; bigger ones are chunked
+SMALL_MISSION_BYTES = 16 * 1024
+# Most small missions handed to the engine in one call
+MAX_BATCH = 256
+# Small missions waiting for the engine before handlers stop reading
+MAX_QUEUE = 1024
+# Commands per chunk of a large mission
+CHUNK_WEIGHT = 1 << 16
+# Longest line accepted (command strings can be long)
+LINE_LIMIT = 1 << 24
+
+Outcome = Tuple[bool, List[str]]  # (ok, result lines or [error message])
+# What bad input raises; each becomes that mission's ERROR reply, never its neighbours'
+MISSION_ERRORS = (ValueError, TypeError, KeyError)
+
+
+def run_mission(text: str) -> Outcome:
+    """Run one mission, catching bad input as an ERROR outcome"""
+    try:
+        max_x, max_y, rovers = parse_mission(text.splitlines())
+        return True, list(simulate(max_x, max_y, rovers))
+    except MISSION_ERRORS as e:
+        return False, [str(e) or type(e).__name__]
+
+
+def run_missions(texts: List[str]) -> List[Outcome]:
+    """One engine call for a batch of small missions"""
+    return [run_mission(text) for text in texts]
+
+
+def run_chunk(max_x: int, max_y: int, chunk: list) -> List[str]:
+    return list(simulate(max_x, max_y, chunk))
+
+
+def split_mission(text: str, chunk_weight: int) -> Tuple[int, int, List[list]]:
+    """Parse a large mission and cut its rovers into chunks of about `chunk_weight` commands"""
+    max_x, max_y, rovers = parse_mission(text.splitlines())
+    return max_x, max_y, list(iter_chunks(rovers, chunk_weight))
+
+
+class MissionService:
+    """Asyncio TCP front end for the simulator; see the module docstring for the protocol"""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = 0, executor: Optional[Executor] = None,
+                 small_mission_bytes: int = SMALL_MISSION_BYTES, max_batch: int = MAX_BATCH,
+                 max_queue: int = MAX_QUEUE, chunk_weight: int = CHUNK_WEIGHT, max_in_flight: Optional[int] = None):
+        self.host = host
+        self.port = port
+        # one engine thread by default: the simulator is pure Python, so more threads only
+        # contend for the GIL; pass a ProcessPoolExecutor to use more cores
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="mission")
+        self.small_mission_bytes = small_mission_bytes
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.chunk_weight = chunk_weight
+        # batches handed to the executor at once; by default one per worker
+        self.max_in_flight = max_in_flight or getattr(self.executor, "_max_workers", 1)
+        self.stats = {'requests': 0, 'batches': 0, 'batched_requests': 0, 'chunked_requests': 0, 'errors': 0}
+        self._server: "Optional[asyncio.base_events.Server]" = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+
+    async def start(self) -> int:
+        """Start listening and return the bound port (useful with port=0)"""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._batcher = asyncio.ensure_future(self._run_batches())
+        server = self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=LINE_LIMIT)
+        self.port = server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        server = self._server
+        if server is not None:  # set by start()
+            async with server:
+                await server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._own_executor:
+            self.executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> 'MissionService':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                text = await _read_mission(reader)
+                if text is None:
+                    break
+                self.stats['requests'] += 1
+                if len(text) <= self.small_mission_bytes:
+                    await self._answer_small(text, writer)
+                else:
+                    await self._answer_large(text, writer)
+                writer.write(b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:  # from _read_mission: the stream can't be read on, so answer and hang up
+            self._write(writer, False, [str(e)])
+            writer.write(b"\n")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def _answer_small(self, text: str, writer: asyncio.StreamWriter):
+        if self._queue is None:
+            raise RuntimeError("MissionService.start() has not been called")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))  # waits while the queue is full: backpressure
+        ok, lines = await future
+        self._write(writer, ok, lines)
+
+    async def _answer_large(self, text: str, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        self.stats['chunked_requests'] += 1
+        try:
+            max_x, max_y, chunks = await loop.run_in_executor(self.executor, split_mission, text, self.chunk_weight)
+        except MISSION_ERRORS as e:
+            self._write(writer, False, [str(e) or type(e).__name__])
+            return
+        # every chunk is submitted up front so all workers share the mission; results go out in order
+        futures = [loop.run_in_executor(self.executor, run_chunk, max_x, max_y, chunk) for chunk in chunks]
+        try:
+            for future in futures:
+                self._write(writer, True, await future)
+                await writer.drain()
+        except MISSION_ERRORS as e:
+            self._write(writer, False, [str(e) or type(e).__name__])
+        finally:
+            for future in futures:
+                future.cancel()  # a no-op for the ones that finished
+
+    async def _run_batches(self):
+        queue = self._queue
+        running: Set[asyncio.Future] = set()
+        try:
+            while True:
+                while len(running) >= self.max_in_flight:
+                    _, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                batch = [await queue.get()]
+                # everything that queued up while the engines were busy goes in this call
+                while len(batch) < self.max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+                self.stats['batches'] += 1
+                self.stats['batched_requests'] += len(batch)
+                running.add(asyncio.ensure_future(self._run_batch(batch)))
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def _run_batch(self, batch: List[tuple]):
+        loop = asyncio.get_running_loop()
+        try:
+            outcomes = await loop.run_in_executor(self.executor, run_missions, [text for text, _ in batch])
+        except Exception as e:  # e.g. a broken process pool: fail this batch, keep serving
+            outcomes = [(False, [str(e) or type(e).__name__])] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes):
+            if not future.done():
+                future.set_result(outcome)
+
+    def _write(self, writer: asyncio.StreamWriter, ok: bool, lines: List[str]):
+        if not ok:
+            self.stats['errors'] += 1
+            lines = [f"ERROR {lines[0]}"]
+        if lines:
+            writer.write(("\n".join(lines) + "\n").encode())
+
+
+async def _read_mission(reader: asyncio.StreamReader) -> Optional[str]:
+    """Lines up to the next blank line or EOF; None once the client has nothing more.
+
+    Raises ValueError for a line over the reader's limit or one that is not UTF-8.
+    """
+    lines: List[str] = []
+    while True:
+        try:
+            raw = await reader.readline()
+        except ValueError:  # readline's form of asyncio.LimitOverrunError
+            raise ValueError(f"Line longer than {LINE_LIMIT} bytes") from None
+        if not raw:
+            break
+        try:
+            line = raw.decode().strip()
+        except UnicodeDecodeError:
+            raise ValueError("Request is not valid UTF-8") from None
+        if not line:
+            if lines:
+                break
+            continue  # blank lines before a mission are ignored
+        lines.append(line)
+    return "\n".join(lines) if lines else None
+
+
+async def request(mission: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> List[str]:
+    """Send one mission and return its result lines (raises ValueError on an ERROR reply)"""
+    reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+    try:
+        writer.write(mission.strip().encode() + b"\n\n")
+        await writer.drain()
+        lines = []
+        while True:
+            line = (await reader.readline()).decode().rstrip("\n")
+            if not line:
+                break
+            lines.append(line)
+    finally:
+        writer.close()
+    if lines and lines[0].startswith("ERROR "):
+        raise ValueError(lines[0][len("ERROR "):])
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Mars Rover missions over TCP")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Address to bind (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to bind (default: {DEFAULT_PORT})')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Engine processes (default: 1 = a single engine thread, 0 = one per CPU)')
+    args = parser.parse_args()
+
+    executor = None
+    if args.workers != 1:
+        from parallel import resolve_workers
+        executor = ProcessPoolExecutor(max_workers=resolve_workers(args.workers))
+    service = MissionService(args.host, args.port, executor)
+    print(f"Mission service listening on {args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
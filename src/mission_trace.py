@@ -0,0 +1,288 @@
+# src/mission_trace.py
+"""Compact binary trace of a MissionControl run, read back through mmap.
+
+File layout (little-endian):
+
+    header      fixed width, see HEADER; holds the offsets of everything else
+    rover data  per rover: checkpoints (x, y, heading) every `checkpoint_every`
+                steps, then the steps packed four to a byte (2 bits each)
+    names       rover ids, UTF-8, concatenated
+    rover table one fixed-width ROVER_ENTRY per rover
+
+Step codes are STEP_LEFT, STEP_RIGHT, STEP_MOVED and STEP_BLOCKED, so a
+rover costs a little over 2 bits per command instead of a tuple per command
+in `path_history`. Because the table is fixed width, `rover(i)` is a single
+unpack, and `state_at(i, step)` replays at most `checkpoint_every` steps from
+the nearest checkpoint.
+"""
+import mmap
+import struct
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+from hexrover.kernel import CODES, DX, DY, HEADINGS, LEFT, RIGHT
+
+MAGIC = b"MRTR"
+VERSION = 1
+DEFAULT_CHECKPOINT_EVERY = 64
+
+# magic, version, checkpoint_every, max_x, max_y, rover_count, table_offset, names_offset
+HEADER = struct.Struct("<4sHHiiIQQ")
+# start x/y/heading, final x/y/heading, steps, moves, blocked,
+# checkpoints offset, steps offset, name offset, name length
+ROVER_ENTRY = struct.Struct("<iiBiiBIIIQQQI")
+CHECKPOINT = struct.Struct("<iiB")
+
+STEP_LEFT, STEP_RIGHT, STEP_MOVED, STEP_BLOCKED = range(4)
+
+# Byte -> the four step codes it holds, lowest bits first
+_UNPACK = [tuple((byte >> shift) & 3 for shift in (0, 2, 4, 6)) for byte in range(256)]
+
+
+class TraceRover(NamedTuple):
+    number: int  # position in the trace; "index" would shadow tuple.index
+    rover_id: str
+    start: Tuple[int, int, str]
+    final: Tuple[int, int, str]
+    steps: int
+    moves: int
+    blocked: int
+
+    @property
+    def turns(self) -> int:
+        return self.steps - self.moves - self.blocked
+
+
+class RoverTrack:
+    """Accumulates one rover's packed steps while a mission runs"""
+
+    def __init__(self, rover, checkpoint_every: int):
+        self.rover = rover
+        self.start = (rover.x, rover.y, CODES[rover.heading])
+        self.checkpoint_every = checkpoint_every
+        self.steps = 0
+        self.moves = 0
+        self.blocked = 0
+        self.packed = bytearray()
+        self.checkpoints = bytearray()
+
+    def record(self, code: int):
+        """Record a step the rover has just taken"""
+        n = self.steps
+        if n & 3:
+            self.packed[-1] |= code << ((n & 3) * 2)
+        else:
+            self.packed.append(code)
+        if code == STEP_MOVED:
+            self.moves += 1
+        elif code == STEP_BLOCKED:
+            self.blocked += 1
+        self.steps = n = n + 1
+        if n % self.checkpoint_every == 0:
+            rover = self.rover
+            self.checkpoints += CHECKPOINT.pack(rover.x, rover.y, CODES[rover.heading])
+
+
+class MissionTraceWriter:
+    """Collects rover tracks during a mission and writes the trace file on close"""
+
+    def __init__(self, path: str, plateau, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        if not 0 < checkpoint_every < 1 << 16:
+            raise ValueError("checkpoint_every must be between 1 and 65535")
+        self.path = path
+        self.plateau = plateau
+        self.checkpoint_every = checkpoint_every
+        self._tracks: Dict[int, RoverTrack] = {}
+        self._closed = False
+
+    def track(self, rover) -> RoverTrack:
+        """Track for a rover; the first call fixes its place in the rover table"""
+        track = self._tracks.get(id(rover))
+        if track is None:
+            track = self._tracks[id(rover)] = RoverTrack(rover, self.checkpoint_every)
+        return track
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        tracks = list(self._tracks.values())
+        names = [(track.rover.rover_id or "").encode("utf-8") for track in tracks]
+
+        offset = HEADER.size
+        layout = []
+        for track in tracks:
+            layout.append((offset, offset + len(track.checkpoints)))
+            offset += len(track.checkpoints) + len(track.packed)
+        names_offset = offset
+        table_offset = names_offset + sum(len(name) for name in names)
+
+        with open(self.path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.checkpoint_every, self.plateau.max_x, self.plateau.max_y,
+                                len(tracks), table_offset, names_offset))
+            for track in tracks:
+                f.write(track.checkpoints)
+                f.write(track.packed)
+            for name in names:
+                f.write(name)
+            name_offset = names_offset
+            for track, name, (checkpoints_at, steps_at) in zip(tracks, names, layout):
+                rover = track.rover
+                f.write(ROVER_ENTRY.pack(*track.start, rover.x, rover.y, CODES[rover.heading],
+                                         track.steps, track.moves, track.blocked,
+                                         checkpoints_at, steps_at, name_offset, len(name)))
+                name_offset += len(name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MissionTrace:
+    """Read-only view of a trace file; nothing is parsed until it is asked for"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"{path} is not a mission trace")
+        if len(self._map) < HEADER.size or self._map[:4] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a mission trace")
+        (_, version, self.checkpoint_every, self.max_x, self.max_y,
+         self.rover_count, self._table, _) = HEADER.unpack_from(self._map, 0)
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported mission trace version: {version}")
+
+    def __len__(self) -> int:
+        return self.rover_count
+
+    def rover(self, index: int) -> TraceRover:
+        """Summary of one rover, read straight from the rover table"""
+        if not 0 <= index < self.rover_count:
+            raise IndexError(f"Rover index {index} out of range")
+        (sx, sy, sh, fx, fy, fh, steps, moves, blocked,
+         _, _, name_at, name_len) = ROVER_ENTRY.unpack_from(self._map, self._table + index * ROVER_ENTRY.size)
+        name = self._map[name_at:name_at + name_len].decode("utf-8")
+        return TraceRover(index, name, (sx, sy, HEADINGS[sh]), (fx, fy, HEADINGS[fh]), steps, moves, blocked)
+
+    def rovers(self) -> Iterator[TraceRover]:
+        return (self.rover(i) for i in range(self.rover_count))
+
+    def steps(self, index: int, start: int = 0, stop: Optional[int] = None) -> Iterator[int]:
+        """Step codes of one rover, from `start` up to (not including) `stop`"""
+        entry = self._entry(index)
+        total = entry[6]
+        stop = total if stop is None else min(stop, total)
+        base = entry[10]
+        step = start
+        for byte in self._map[base + (start >> 2):base + ((stop + 3) >> 2)]:
+            for code in _UNPACK[byte][step & 3:]:
+                if step >= stop:
+                    return
+                yield code
+                step += 1
+
+    def states(self, index: int) -> Iterator[Tuple[int, int, str, int]]:
+        """(x, y, heading, code) after every step of one rover"""
+        x, y, h = self._start(index)
+        for code in self.steps(index):
+            x, y, h = _apply(x, y, h, code)
+            yield x, y, HEADINGS[h], code
+
+    def state_at(self, index: int, step: int) -> Tuple[int, int, str]:
+        """Position and heading after `step` steps (0 is the starting state)"""
+        entry = self._entry(index)
+        if not 0 <= step <= entry[6]:
+            raise IndexError(f"Step {step} out of range for rover {index}")
+        checkpoint = step // self.checkpoint_every
+        if checkpoint:
+            x, y, h = CHECKPOINT.unpack_from(self._map, entry[9] + (checkpoint - 1) * CHECKPOINT.size)
+        else:
+            x, y, h = entry[0], entry[1], entry[2]
+        for code in self.steps(index, checkpoint * self.checkpoint_every, step):
+            x, y, h = _apply(x, y, h, code)
+        return x, y, HEADINGS[h]
+
+    def commands(self, index: int) -> str:
+        """The L/R/M commands the rover executed"""
+        return "".join("LRMM"[code] for code in self.steps(index))
+
+    def move_outcomes(self, index: int) -> Iterator[bool]:
+        """Whether each M command actually moved the rover"""
+        return (code == STEP_MOVED for code in self.steps(index) if code >= STEP_MOVED)
+
+    def get_mission_statistics(self) -> dict:
+        """Rebuild MissionControl.get_mission_statistics() for the traced run"""
+        from enhanced_rover import RoverStatistics
+        rover_stats = []
+        mission_log = []
+        all_visited = set()
+        for rover in self.rovers():
+            x, y, heading = rover.start
+            visited = {(x, y)}
+            visited.update((sx, sy) for sx, sy, _, code in self.states(rover.number) if code == STEP_MOVED)
+            all_visited |= visited
+            rover_stats.append(RoverStatistics(
+                rover.rover_id, "{} {} {}".format(*rover.final), rover.moves, rover.turns, rover.blocked,
+                rover.moves + rover.turns, 1 + rover.moves + rover.turns, len(visited)))
+            mission_log.append(f"Deployed {rover.rover_id} at ({x}, {y}) facing {heading}")
+        for rover in self.rovers():
+            mission_log.append(f"Executing commands for {rover.rover_id}: {self.commands(rover.number)}")
+
+        return {
+            'plateau_size': f"{self.max_x} x {self.max_y}",
+            'total_rovers': self.rover_count,
+            'rover_stats': rover_stats,
+            'mission_log': mission_log,
+            'aggregates': {
+                'total_moves': sum(s.moves_made for s in rover_stats),
+                'total_turns': sum(s.turns_made for s in rover_stats),
+                'total_blocked_moves': sum(s.blocked_moves for s in rover_stats),
+                'unique_positions_explored': len(all_visited),
+                'plateau_coverage': f"{len(all_visited) / ((self.max_x + 1) * (self.max_y + 1)) * 100:.1f}%",
+            },
+        }
+
+    def replay(self, visualizer):
+        """Animate the traced mission in a MarsRoverVisualizer (blocked moves stay blocked)"""
+        from hexrover.compat.rover_compat import Rover
+        plays = []
+        for rover in self.rovers():
+            x, y, heading = rover.start
+            rover_id = visualizer.add_rover(Rover(x, y, heading, visualizer.plateau))
+            plays.append((rover_id, self.commands(rover.number), self.move_outcomes(rover.number)))
+        visualizer.play(plays)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _entry(self, index: int) -> tuple:
+        if not 0 <= index < self.rover_count:
+            raise IndexError(f"Rover index {index} out of range")
+        return ROVER_ENTRY.unpack_from(self._map, self._table + index * ROVER_ENTRY.size)
+
+    def _start(self, index: int) -> Tuple[int, int, int]:
+        entry = self._entry(index)
+        return entry[0], entry[1], entry[2]
+
+
+def _apply(x: int, y: int, h: int, code: int) -> Tuple[int, int, int]:
+    if code == STEP_LEFT:
+        return x, y, LEFT[h]
+    if code == STEP_RIGHT:
+        return x, y, RIGHT[h]
+    if code == STEP_MOVED:
+        return x + DX[h], y + DY[h], h
+    return x, y, h
@@ -0,0 +1,78 @@
+# src/parallel.py
+"""Process-pool execution for missions whose rovers never interact.
+
+Rovers are grouped into contiguous chunks balanced by total command length
+(so one giant rover does not leave the other workers idle), each chunk runs
+in a worker process, and results are yielded back in input order. Only a
+bounded number of chunks is in flight, so this also works on the streaming
+pipeline's lazy rover iterator. An obstacle map travels with every chunk;
+use MmapObstacles for big terrain so workers map the file instead of
+receiving a copy.
+"""
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence
+
+from pipeline import RoverSpec, parse_mission, simulate
+
+# Chunks per worker when the fleet size is known: enough slack to even out stragglers
+CHUNKS_PER_WORKER = 4
+# Chunk weight (commands) when streaming and the total is unknown
+STREAM_CHUNK_WEIGHT = 1 << 16
+# Chunks queued per worker before we wait for the oldest result
+IN_FLIGHT_PER_WORKER = 2
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """0 or None means one worker per CPU"""
+    return workers if workers else (os.cpu_count() or 1)
+
+
+def _weight(rover: RoverSpec) -> int:
+    return len(rover[3]) + 1
+
+
+def iter_chunks(rovers: Iterable[RoverSpec], target_weight: int) -> Iterator[List[RoverSpec]]:
+    """Cut rovers into contiguous chunks of roughly `target_weight` commands each"""
+    chunk: List[RoverSpec] = []
+    weight = 0
+    for rover in rovers:
+        chunk.append(rover)
+        weight += _weight(rover)
+        if weight >= target_weight:
+            yield chunk
+            chunk, weight = [], 0
+    if chunk:
+        yield chunk
+
+
+def _run_chunk(max_x: int, max_y: int, chunk: List[RoverSpec], obstacles=None) -> List[str]:
+    return list(simulate(max_x, max_y, chunk, obstacles))
+
+
+def simulate_parallel(max_x: int, max_y: int, rovers: Iterable[RoverSpec], workers: Optional[int] = None,
+                      target_weight: Optional[int] = None, obstacles=None) -> Iterator[str]:
+    """Parallel counterpart of pipeline.simulate; yields "x y H" lines in input order"""
+    workers = resolve_workers(workers)
+    if target_weight is None:
+        if isinstance(rovers, Sequence):
+            total = sum(_weight(rover) for rover in rovers)
+            target_weight = max(1, -(-total // (workers * CHUNKS_PER_WORKER)))
+        else:
+            target_weight = STREAM_CHUNK_WEIGHT
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for chunk in iter_chunks(rovers, target_weight):
+            pending.append(pool.submit(_run_chunk, max_x, max_y, chunk, obstacles))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def run_simulation_parallel(input_str: str, workers: Optional[int] = None, obstacles=None) -> str:
+    """Same result as run_simulation, computed on a process pool"""
+    max_x, max_y, rovers = parse_mission(input_str.strip().splitlines())
+    return "\n".join(simulate_parallel(max_x, max_y, list(rovers), workers, obstacles=obstacles))
@@ -0,0 +1,126 @@
+# src/pipeline.py
+"""Streaming parse -> simulate -> write pipeline for mission files of any size.
+
+Each stage is a generator, so only one rover is held in memory at a time no
+matter how large the mission file is. Inputs may be plain text, gzip, bz2 or
+xz (detected from the leading magic bytes, so stdin works too); outputs are
+compressed according to their file extension. "-" means stdin/stdout.
+"""
+import bz2
+import gzip
+import io
+import lzma
+import sys
+from typing import IO, Callable, Dict, Iterable, Iterator, Tuple, cast
+
+from hexrover.compat.plateau_compat import Plateau
+from hexrover.compat.rover_compat import Rover
+from hexrover.kernel import CODES
+
+RoverSpec = Tuple[int, int, str, str]
+
+_MAGIC = (
+    (b"\x1f\x8b", lambda f: gzip.GzipFile(fileobj=f)),
+    (b"BZh", bz2.BZ2File),
+    (b"\xfd7zXZ\x00", lzma.LZMAFile),
+)
+
+_EXTENSIONS: Dict[str, Callable[..., IO[str]]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+# Results are flushed after this many rovers so consumers see progress
+FLUSH_EVERY = 1024
+
+
+def open_input(path: str) -> io.TextIOWrapper:
+    """Open a mission source as text, transparently decompressing it"""
+    raw: IO[bytes] = sys.stdin.buffer if path == "-" else open(path, "rb")
+    buffered = raw if isinstance(raw, io.BufferedReader) else io.BufferedReader(cast(io.RawIOBase, raw))
+    head = buffered.peek(6)[:6]
+    for magic, opener in _MAGIC:
+        if head.startswith(magic):
+            return io.TextIOWrapper(opener(buffered), encoding="utf-8")
+    return io.TextIOWrapper(buffered, encoding="utf-8")
+
+
+def open_output(path: str) -> IO[str]:
+    """Open a results sink as text, compressing by file extension"""
+    if path == "-":
+        return sys.stdout
+    for ext, opener in _EXTENSIONS.items():
+        if path.endswith(ext):
+            return opener(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def parse_mission(lines: Iterable[str]) -> Tuple[int, int, Iterator[RoverSpec]]:
+    """Read the plateau line and return (max_x, max_y, rovers) with rovers parsed lazily"""
+    stripped = (ln.strip() for ln in lines)
+    nonblank = (ln for ln in stripped if ln)
+    first = next(nonblank, None)
+    if first is None:
+        return 0, 0, iter(())
+    max_x, max_y = map(int, first.split())
+    return max_x, max_y, _parse_rovers(nonblank)
+
+
+def _parse_rovers(lines: Iterator[str]) -> Iterator[RoverSpec]:
+    for position in lines:
+        x, y, heading = position.split()
+        commands = next(lines, None)
+        if commands is None:
+            raise ValueError(f"Missing command line for rover at '{position}'")
+        heading = heading.upper()
+        if heading not in CODES:
+            raise ValueError(f"Invalid heading '{heading}' for rover at '{position}'")
+        yield int(x), int(y), heading, commands.upper()
+
+
+def simulate(max_x: int, max_y: int, rovers: Iterable[RoverSpec], obstacles=None) -> Iterator[str]:
+    """Run each rover as it arrives and yield its final "x y H" line"""
+    plateau = Plateau(max_x, max_y, obstacles)
+    for x, y, heading, commands in rovers:
+        rover = Rover(x, y, heading, plateau)
+        rover.execute_commands(commands)
+        yield str(rover)
+
+
+def write_results(results: Iterable[str], out: IO[str], flush_every: int = FLUSH_EVERY) -> int:
+    """Write results newline-separated (like run_simulation's join) and return the count"""
+    count = 0
+    for line in results:
+        if count:
+            out.write("\n")
+        out.write(line)
+        count += 1
+        if count % flush_every == 0:
+            out.flush()
+    out.flush()
+    return count
+
+
+def run_pipeline(source: str = "-", sink: str = "-", workers: int = 1, obstacles=None) -> int:
+    """Stream a mission from `source` to `sink` and return how many rovers ran"""
+    src = open_input(source)
+    dst = open_output(sink)
+    try:
+        max_x, max_y, rovers = parse_mission(src)
+        if workers == 1:
+            results = simulate(max_x, max_y, rovers, obstacles)
+        else:
+            from parallel import simulate_parallel
+            results = simulate_parallel(max_x, max_y, rovers, workers, obstacles=obstacles)
+        count = write_results(results, dst)
+        if dst is sys.stdout and count:
+            dst.write("\n")
+        return count
+    finally:
+        if source == "-":
+            src.detach()  # leave the process's stdin open
+        else:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
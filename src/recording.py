@@ -0,0 +1,75 @@
+# src/recording.py
+"""Asciicast (v2) recording and replay of visualizer output.
+
+The recorder is a write-only text stream: every write becomes an output
+event stamped with a virtual clock that the visualizer advances by its
+configured delays, so a headless run that never sleeps still replays with
+the intended timing (or any multiple of it).
+"""
+import json
+import sys
+import time
+from typing import Callable, Optional, TextIO
+
+
+class AsciicastRecorder:
+    """Text stream that records writes as asciicast v2 output events"""
+
+    def __init__(self, path: str, width: int = 80, height: int = 24, title: str = "Mars Rover Mission"):
+        self.path = path
+        self.time = 0.0
+        self.events = 0
+        self._file = open(path, "w", encoding="utf-8")
+        header = {"version": 2, "width": width, "height": height,
+                  "timestamp": int(time.time()), "title": title}
+        self._file.write(json.dumps(header) + "\n")
+
+    def write(self, data: str) -> int:
+        if data:
+            self._file.write(json.dumps([round(self.time, 6), "o", data], ensure_ascii=False) + "\n")
+            self.events += 1
+        return len(data)
+
+    def advance(self, seconds: float):
+        """Move the virtual clock forward (a headless stand-in for sleeping)"""
+        self.time += seconds
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def replay_recording(path: str, speed: float = 1.0, stream: Optional[TextIO] = None,
+                     max_wait: Optional[float] = None, sleep: Callable[[float], None] = time.sleep) -> int:
+    """Play a recording back; speed 2.0 is twice as fast, 0 skips all waits. Returns events played."""
+    out = stream if stream is not None else sys.stdout
+    played = 0
+    previous = 0.0
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != 2:
+            raise ValueError(f"Unsupported asciicast version: {header.get('version')}")
+        for line in f:
+            if not line.strip():
+                continue
+            stamp, kind, data = json.loads(line)
+            if speed > 0:
+                wait = (stamp - previous) / speed
+                if max_wait is not None:
+                    wait = min(wait, max_wait)
+                if wait > 0:
+                    sleep(wait)
+            previous = stamp
+            if kind == "o":
+                out.write(data)
+                out.flush()
+                played += 1
+    return played
@@ -0,0 +1,79 @@
+# src/terminal_renderer.py
+import sys
+import time
+from typing import Callable, Dict, Optional, TextIO, Tuple
+
+CLEAR_SCREEN = '\033[2J\033[H'
+CLEAR_TO_EOL = '\033[K'
+
+
+def move_cursor(row: int, col: int) -> str:
+    """ANSI cursor positioning (row/col are 0-based here, 1-based on the wire)"""
+    return f'\033[{row + 1};{col + 1}H'
+
+
+class DifferentialRenderer:
+    """Framebuffer that repaints only the screen cells that changed since the last frame.
+
+    Callers `put` text at (row, col) positions and then `present` the frame:
+    unchanged positions are skipped, the rest become cursor moves plus text in
+    a single buffered write, and presents are throttled to `max_fps`.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, max_fps: Optional[float] = 30.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.stream = stream if stream is not None else sys.stdout
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self.frames = 0
+        self.cells_written = 0
+        self._screen: Dict[Tuple[int, int], str] = {}
+        self._pending: Dict[Tuple[int, int], str] = {}
+        self._needs_clear = True
+        self._last_present: Optional[float] = None
+        self._bottom = 0
+
+    def put(self, row: int, col: int, text: str):
+        """Queue `text` at (row, col) if it differs from what is on screen"""
+        key = (row, col)
+        if self._screen.get(key) == text:
+            self._pending.pop(key, None)
+        else:
+            self._pending[key] = text
+        if row >= self._bottom:
+            self._bottom = row + 1
+
+    def put_line(self, row: int, text: str):
+        """Queue a whole line, erasing whatever was left to its right"""
+        self.put(row, 0, text + CLEAR_TO_EOL)
+
+    def invalidate(self):
+        """Forget the screen contents so the next frame starts from a cleared terminal"""
+        self._screen.clear()
+        self._needs_clear = True
+
+    def present(self) -> int:
+        """Write all queued changes in one go and return how many cells were updated"""
+        if self.min_interval and self._last_present is not None:
+            wait = self.min_interval - (self.clock() - self._last_present)
+            if wait > 0:
+                self.sleep(wait)
+
+        parts = [CLEAR_SCREEN] if self._needs_clear else []
+        for (row, col), text in self._pending.items():
+            parts.append(move_cursor(row, col))
+            parts.append(text)
+        # Park the cursor below the frame so ordinary prints don't land inside it
+        parts.append(move_cursor(self._bottom, 0))
+        self.stream.write(''.join(parts))
+        self.stream.flush()
+
+        updated = len(self._pending)
+        self._screen.update(self._pending)
+        self._pending.clear()
+        self._needs_clear = False
+        self._last_present = self.clock()
+        self.frames += 1
+        self.cells_written += updated
+        return updated
@@ -2,42 +2,74 @@
 import time
 import os
 import sys
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, TextIO, Tuple, Union
 
 # OLD
 # from plateau import Plateau
 # from rover import Rover
 
 # NEW
+from hexrover.adapters.terrain import any_blocked
 from hexrover.compat.plateau_compat import Plateau
 from hexrover.compat.rover_compat import Rover
+from terminal_renderer import CLEAR_SCREEN, DifferentialRenderer
+from recording import AsciicastRecorder
+from colors import Colors  # re-exported for callers that import it from here
 
 
-class Colors:
-    """ANSI color codes for terminal output"""
-    RESET = '\033[0m'
-    BOLD = '\033[1m'
-    RED = '\033[91m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    MAGENTA = '\033[95m'
-    CYAN = '\033[96m'
-    WHITE = '\033[97m'
-    BG_BLACK = '\033[40m'
-    BG_RED = '\033[41m'
-    BG_GREEN = '\033[42m'
-    BG_YELLOW = '\033[43m'
-    BG_BLUE = '\033[44m'
+@dataclass
+class Viewport:
+    """Window onto a large plateau, measured in screen cells (each drawn 2 columns wide).
+
+    follow: a rover index to keep centred, "fleet" to track the fleet's
+    bounding box, or None to stay at `origin`. zoom is plateau cells per
+    screen cell along each axis; 0 picks the smallest zoom that fits the
+    fleet's bounding box.
+    """
+    width: int = 40
+    height: int = 20
+    follow: Union[int, str, None] = "fleet"
+    zoom: int = 1
+    origin: Tuple[int, int] = (0, 0)
+
+
+# Trail density shades for zoomed-out blocks, from sparse to full
+OBSTACLE = f"{Colors.BOLD}{Colors.WHITE}#{Colors.RESET}"
+DENSITY_SHADES = "░▒▓█"
+# Rover legend lines shown in viewport mode
+VIEWPORT_LEGEND_ROWS = 5
 
 
 class MarsRoverVisualizer:
-    def __init__(self, plateau: Plateau, delay: float = 0.5):
+    def __init__(self, plateau: Plateau, delay: float = 0.5, renderer: Optional[DifferentialRenderer] = None,
+                 stream: Optional[TextIO] = None, headless: bool = False,
+                 frame_every: int = 1, key_events_only: bool = False):
         self.plateau = plateau
         self.rovers: list = []
         self.delay = delay
+        # Output goes to `stream` (stdout by default); headless runs never sleep or shell out,
+        # and only advance the stream's clock when it has one (see recording.AsciicastRecorder)
+        self.stream = stream
+        self.headless = headless
+        self.frame_every = max(1, frame_every)
+        self.key_events_only = key_events_only
         self.rover_colors = [Colors.RED, Colors.BLUE, Colors.GREEN, Colors.MAGENTA, Colors.CYAN]
         self.rover_trails: list = []  # Store trails for each rover
+        # With a renderer, frames are diffed against the previous one instead of redrawn
+        self.renderer = renderer
+        self._painted = False
+        self._trail_owner: Dict[Tuple[int, int], int] = {}
+        self._trail_refs: list = []
+        self._trail_seen: List[int] = []
+        self._occupants: Dict[Tuple[int, int], Set[int]] = {}
+        self._rover_states: list = []
+        # Viewport mode: distinct trail cells counted per zoom block
+        self.viewport: Optional[Viewport] = None
+        self._block_zoom = 0
+        self._block_counts: Dict[Tuple[int, int], int] = {}
+        self._obstacle_blocks: Dict[Tuple[int, int], bool] = {}
+        self._obstacle_blocks_key: Optional[Tuple[int, int]] = None
 
     def add_rover(self, rover: Rover) -> int:
         """Add a rover to the visualization and return its ID"""
@@ -48,7 +80,26 @@ class MarsRoverVisualizer:
 
     def clear_screen(self):
         """Clear the terminal screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if self.headless or self.stream is not None:
+            self._write(CLEAR_SCREEN)
+        else:
+            os.system('cls' if os.name == 'nt' else 'clear')
+
+    def pause(self, seconds: float):
+        """Wait between frames; headless runs only advance the recording clock"""
+        advance = getattr(self._out(), 'advance', None)
+        if advance is not None:
+            advance(seconds)
+        if not self.headless:
+            time.sleep(seconds)
+
+    def _out(self) -> TextIO:
+        if self.renderer is not None:
+            return self.renderer.stream
+        return self.stream if self.stream is not None else sys.stdout
+
+    def _write(self, text: str):
+        self._out().write(text)
 
     def get_direction_symbol(self, heading: str) -> str:
         """Get the symbol for rover direction"""
@@ -60,21 +111,38 @@ class MarsRoverVisualizer:
         }
         return symbols.get(heading, '?')
 
+    def set_viewport(self, viewport: Optional[Viewport]):
+        """Draw through a viewport (None goes back to drawing the whole plateau)"""
+        self.viewport = viewport
+        self._painted = False
+
     def draw_plateau(self, step_info: str = "", command_info: str = ""):
         """Draw the current state of the plateau with rovers"""
+        if self.viewport is not None:
+            self._draw_viewport(step_info, command_info)
+            return
+        if self.renderer is not None:
+            self._draw_differential(self.renderer, step_info, command_info)
+            return
+
         self.clear_screen()
+        self._write(self._compose_frame(step_info, command_info))
+
+    def _compose_frame(self, step_info: str, command_info: str) -> str:
+        """Build a full frame as one string so it goes out in a single write"""
+        out = []
 
         # Title
-        print(f"{Colors.BOLD}{Colors.YELLOW}🚀 MARS ROVER MISSION CONTROL 🚀{Colors.RESET}")
-        print(f"{Colors.CYAN}{'=' * 50}{Colors.RESET}")
-        print()
+        out.append(f"{Colors.BOLD}{Colors.YELLOW}🚀 MARS ROVER MISSION CONTROL 🚀{Colors.RESET}\n")
+        out.append(f"{Colors.CYAN}{'=' * 50}{Colors.RESET}\n")
+        out.append("\n")
 
         # Info panel
         if step_info:
-            print(f"{Colors.WHITE}{step_info}{Colors.RESET}")
+            out.append(f"{Colors.WHITE}{step_info}{Colors.RESET}\n")
         if command_info:
-            print(f"{Colors.YELLOW}{command_info}{Colors.RESET}")
-        print()
+            out.append(f"{Colors.YELLOW}{command_info}{Colors.RESET}\n")
+        out.append("\n")
 
         # Create a grid representation
         grid = {}
@@ -88,43 +156,306 @@ class MarsRoverVisualizer:
 
         # Add current rover positions (overwrite trails)
         for rover_id, rover in enumerate(self.rovers):
-            color = self.rover_colors[rover_id % len(self.rover_colors)]
-            symbol = self.get_direction_symbol(rover.heading)
-            grid[(rover.x, rover.y)] = f"{Colors.BOLD}{color}{symbol}{Colors.RESET}"
+            grid[(rover.x, rover.y)] = self._rover_symbol(rover_id)
 
         # Draw the plateau (inverted Y to match coordinate system)
-        print(f"  {Colors.WHITE}", end="")
-        for x in range(self.plateau.max_x + 1):
-            print(f"{x:2}", end="")
-        print(f"{Colors.RESET}")
+        out.append(self._axis_line() + "\n")
 
-        for y in range(self.plateau.max_y, -1, -1):
-            print(f"{Colors.WHITE}{y:2}{Colors.RESET}", end="")
+        empty = f"{Colors.BG_BLACK} {Colors.RESET}"
+        if self.plateau.obstacles is not None:
             for x in range(self.plateau.max_x + 1):
-                cell_content = grid.get((x, y), f"{Colors.BG_BLACK} {Colors.RESET}")
-                print(f"{cell_content} ", end="")
-            print()
+                for y in range(self.plateau.max_y + 1):
+                    if (x, y) not in grid and self.plateau.is_blocked(x, y):
+                        grid[(x, y)] = OBSTACLE
+        for y in range(self.plateau.max_y, -1, -1):
+            out.append(f"{Colors.WHITE}{y:2}{Colors.RESET}")
+            out.append("".join(f"{grid.get((x, y), empty)} " for x in range(self.plateau.max_x + 1)))
+            out.append("\n")
 
         # Legend
-        print(f"\n{Colors.BOLD}Legend:{Colors.RESET}")
-        for i, rover in enumerate(self.rovers):
-            color = self.rover_colors[i % len(self.rover_colors)]
-            symbol = self.get_direction_symbol(rover.heading)
-            print(
-                f"  {Colors.BOLD}{color}Rover {i + 1}{Colors.RESET}: {color}{symbol}{Colors.RESET} at ({rover.x}, {rover.y}) facing {rover.heading}")
-        print(f"  {Colors.WHITE}·{Colors.RESET} = Rover trail")
-        print()
-
-    def animate_rover_commands(self, rover_id: int, commands: str):
-        """Animate a rover executing commands step by step"""
+        out.append(f"\n{Colors.BOLD}Legend:{Colors.RESET}\n")
+        for i in range(len(self.rovers)):
+            out.append(self._legend_line(i) + "\n")
+        out.append(f"  {Colors.WHITE}·{Colors.RESET} = Rover trail\n")
+        if self.plateau.obstacles is not None:
+            out.append(f"  {OBSTACLE} = Obstacle\n")
+        out.append("\n")
+        return "".join(out)
+
+    def _axis_line(self) -> str:
+        return f"  {Colors.WHITE}" + "".join(f"{x:2}" for x in range(self.plateau.max_x + 1)) + Colors.RESET
+
+    def _rover_symbol(self, rover_id: int) -> str:
         rover = self.rovers[rover_id]
+        color = self.rover_colors[rover_id % len(self.rover_colors)]
+        return f"{Colors.BOLD}{color}{self.get_direction_symbol(rover.heading)}{Colors.RESET}"
 
-        print(f"{Colors.BOLD}{Colors.GREEN}Executing commands for Rover {rover_id + 1}: {commands}{Colors.RESET}")
-        time.sleep(1)
+    def _legend_line(self, rover_id: int) -> str:
+        rover = self.rovers[rover_id]
+        color = self.rover_colors[rover_id % len(self.rover_colors)]
+        symbol = self.get_direction_symbol(rover.heading)
+        return (f"  {Colors.BOLD}{color}Rover {rover_id + 1}{Colors.RESET}: {color}{symbol}{Colors.RESET} "
+                f"at ({rover.x}, {rover.y}) facing {rover.heading}")
+
+    # ---------- differential rendering ----------
+    # Fixed layout: title rows, two info rows, axis row, then the grid and legend.
+    GRID_TOP = 7
+
+    def _draw_differential(self, renderer: DifferentialRenderer, step_info: str, command_info: str):
+        """Update only the cells whose content changed since the previous frame"""
+        changed = self._sync_scene()
+        top = self.GRID_TOP
+        max_y = self.plateau.max_y
+
+        dirty: Iterable[Tuple[int, int]]
+        if changed is not None:
+            dirty = changed
+        else:
+            renderer.invalidate()
+            renderer.put_line(0, f"{Colors.BOLD}{Colors.YELLOW}🚀 MARS ROVER MISSION CONTROL 🚀{Colors.RESET}")
+            renderer.put_line(1, f"{Colors.CYAN}{'=' * 50}{Colors.RESET}")
+            renderer.put_line(top - 1, self._axis_line())
+            for y in range(max_y, -1, -1):
+                renderer.put(top + max_y - y, 0, f"{Colors.WHITE}{y:2}{Colors.RESET}")
+            dirty = ((x, y) for y in range(max_y + 1) for x in range(self.plateau.max_x + 1))
+
+        renderer.put_line(3, f"{Colors.WHITE}{step_info}{Colors.RESET}")
+        renderer.put_line(4, f"{Colors.YELLOW}{command_info}{Colors.RESET}")
+
+        for x, y in dirty:
+            if self.plateau.is_within_bounds(x, y):
+                renderer.put(top + max_y - y, 2 + 2 * x, self._cell_text((x, y)))
+
+        legend = top + max_y + 2
+        renderer.put_line(legend, f"{Colors.BOLD}Legend:{Colors.RESET}")
+        for i in range(len(self.rovers)):
+            renderer.put_line(legend + 1 + i, self._legend_line(i))
+        renderer.put_line(legend + 1 + len(self.rovers), f"  {Colors.WHITE}·{Colors.RESET} = Rover trail")
+        if self.plateau.obstacles is not None:
+            renderer.put_line(legend + 2 + len(self.rovers), f"  {OBSTACLE} = Obstacle")
+        renderer.present()
+
+    def _cell_text(self, cell: Tuple[int, int]) -> str:
+        occupants = self._occupants.get(cell)
+        if occupants:
+            return self._rover_symbol(max(occupants))  # later rovers are drawn on top
+        owner = self._trail_owner.get(cell)
+        if owner is not None:
+            return f"{self.rover_colors[owner % len(self.rover_colors)]}·{Colors.RESET}"
+        if self.plateau.is_blocked(*cell):
+            return OBSTACLE
+        return f"{Colors.BG_BLACK} {Colors.RESET}"
+
+    def _sync_scene(self) -> Optional[Set[Tuple[int, int]]]:
+        """Fold new trail points and rover moves into the cell maps.
+
+        Returns the cells that changed, or None when everything must be repainted
+        (first frame, or a trail was cleared or replaced from outside).
+        """
+        rebuild = not self._painted
+        if not rebuild:
+            for rover_id, trail in enumerate(self.rover_trails):
+                if rover_id < len(self._trail_refs) and (
+                        trail is not self._trail_refs[rover_id] or len(trail) < self._trail_seen[rover_id]):
+                    rebuild = True
+                    break
+
+        if rebuild:
+            self._trail_owner = {}
+            self._trail_refs = []
+            self._trail_seen = []
+            self._occupants = {}
+            self._rover_states = []
+            self._block_counts = {}
+            self._painted = True
+
+        dirty: Set[Tuple[int, int]] = set()
+        for rover_id, trail in enumerate(self.rover_trails):
+            if rover_id == len(self._trail_refs):
+                self._trail_refs.append(trail)
+                self._trail_seen.append(0)
+            for cell in trail[self._trail_seen[rover_id]:]:
+                cell = tuple(cell)
+                owner = self._trail_owner.get(cell)
+                if owner is None and self._block_zoom > 1:
+                    block = (cell[0] // self._block_zoom, cell[1] // self._block_zoom)
+                    self._block_counts[block] = self._block_counts.get(block, 0) + 1
+                if owner is None or owner > rover_id:
+                    self._trail_owner[cell] = rover_id
+                    dirty.add(cell)
+            self._trail_seen[rover_id] = len(trail)
 
+        for rover_id, rover in enumerate(self.rovers):
+            state = (rover.x, rover.y, rover.heading)
+            if rover_id == len(self._rover_states):
+                self._rover_states.append(None)
+            old = self._rover_states[rover_id]
+            if state == old:
+                continue
+            if old is not None:
+                self._occupants[old[:2]].discard(rover_id)
+                dirty.add(old[:2])
+            self._occupants.setdefault(state[:2], set()).add(rover_id)
+            dirty.add(state[:2])
+            self._rover_states[rover_id] = state
+
+        return None if rebuild else dirty
+
+    # ---------- viewport / level-of-detail rendering ----------
+    def _viewport_window(self) -> Tuple[int, int, int, int, int]:
+        """Resolve the viewport to (left block, bottom block, columns, rows, zoom)"""
+        view = self.viewport
+        if view is None:
+            raise RuntimeError("No viewport set; see set_viewport()")
+        zoom = max(view.zoom, 1)
+        target = None  # (min x, max x, min y, max y) to keep in view
+        if isinstance(view.follow, int) and 0 <= view.follow < len(self.rovers):
+            rover = self.rovers[view.follow]
+            target = (rover.x, rover.x, rover.y, rover.y)
+        elif view.follow == "fleet" and self.rovers:
+            xs = [rover.x for rover in self.rovers]
+            ys = [rover.y for rover in self.rovers]
+            target = (min(xs), max(xs), min(ys), max(ys))
+            if view.zoom <= 0:
+                zoom = max(1, -(-(target[1] - target[0] + 1) // view.width),
+                           -(-(target[3] - target[2] + 1) // view.height))
+                # block boundaries may split the box, so grow until it really fits
+                while (target[1] // zoom - target[0] // zoom >= view.width
+                       or target[3] // zoom - target[2] // zoom >= view.height):
+                    zoom += 1
+
+        if target is None:
+            left, bottom = view.origin[0] // zoom, view.origin[1] // zoom
+        else:
+            lo_x, hi_x, lo_y, hi_y = (v // zoom for v in target)
+            left = lo_x - (view.width - (hi_x - lo_x + 1)) // 2
+            bottom = lo_y - (view.height - (hi_y - lo_y + 1)) // 2
+
+        # keep the window on the plateau where it fits
+        last_x, last_y = self.plateau.max_x // zoom, self.plateau.max_y // zoom
+        left = max(0, min(left, last_x - view.width + 1))
+        bottom = max(0, min(bottom, last_y - view.height + 1))
+        columns = min(view.width, last_x - left + 1)
+        rows = min(view.height, last_y - bottom + 1)
+        return left, bottom, columns, rows, zoom
+
+    def _block_text(self, bx: int, by: int, zoom: int, rovers_in_block: Dict[Tuple[int, int], List[int]]) -> str:
+        rover_ids = rovers_in_block.get((bx, by))
+        if rover_ids:
+            if len(rover_ids) == 1:
+                return self._rover_symbol(rover_ids[0])
+            count = str(len(rover_ids)) if len(rover_ids) < 10 else "+"
+            return f"{Colors.BOLD}{Colors.WHITE}{count}{Colors.RESET}"
+        if zoom == 1:
+            return self._cell_text((bx, by))
+        trail_cells = self._block_counts.get((bx, by), 0)
+        if not trail_cells:
+            return OBSTACLE if self._block_has_obstacle(bx, by, zoom) else f"{Colors.BG_BLACK} {Colors.RESET}"
+        shade = DENSITY_SHADES[min(len(DENSITY_SHADES) - 1, trail_cells * len(DENSITY_SHADES) // (zoom * zoom))]
+        return f"{Colors.YELLOW}{shade}{Colors.RESET}"
+
+    def _block_has_obstacle(self, bx: int, by: int, zoom: int) -> bool:
+        obstacles = self.plateau.obstacles
+        if obstacles is None:
+            return False
+        if self._obstacle_blocks_key != (zoom, obstacles.version):
+            self._obstacle_blocks_key = (zoom, obstacles.version)
+            self._obstacle_blocks = {}
+        found = self._obstacle_blocks.get((bx, by))
+        if found is None:
+            # one rectangle query per block and zoom level, answered a row of bits at a time
+            found = any_blocked(obstacles, bx * zoom, by * zoom, min(self.plateau.max_x, (bx + 1) * zoom - 1),
+                                min(self.plateau.max_y, (by + 1) * zoom - 1))
+            self._obstacle_blocks[(bx, by)] = found
+        return found
+
+    def _viewport_lines(self, step_info: str, command_info: str) -> List[str]:
+        block_left, block_bottom, columns, rows, zoom = self._viewport_window()
+        if zoom != self._block_zoom:
+            # re-bucket the distinct trail cells for the new zoom level
+            self._block_zoom = zoom
+            self._block_counts = {}
+            if zoom > 1:
+                for x, y in self._trail_owner:
+                    block = (x // zoom, y // zoom)
+                    self._block_counts[block] = self._block_counts.get(block, 0) + 1
+        self._sync_scene()
+
+        # Rovers bucketed by block once per frame; later rovers are drawn on top
+        rovers_in_block: Dict[Tuple[int, int], List[int]] = {}
+        for rover_id, rover in enumerate(self.rovers):
+            rovers_in_block.setdefault((rover.x // zoom, rover.y // zoom), []).insert(0, rover_id)
+
+        left, bottom = block_left * zoom, block_bottom * zoom
+        right = min(self.plateau.max_x, (block_left + columns) * zoom - 1)
+        top = min(self.plateau.max_y, (block_bottom + rows) * zoom - 1)
+        label_width = len(str(self.plateau.max_y))
+
+        lines = [
+            f"{Colors.BOLD}{Colors.YELLOW}🚀 MARS ROVER MISSION CONTROL 🚀{Colors.RESET}",
+            f"{Colors.CYAN}{'=' * 50}{Colors.RESET}",
+            f"{Colors.WHITE}View x {left}..{right}, y {bottom}..{top} of "
+            f"{self.plateau.max_x} x {self.plateau.max_y} (zoom 1:{zoom}){Colors.RESET}",
+            f"{Colors.WHITE}{step_info}{Colors.RESET}",
+            f"{Colors.YELLOW}{command_info}{Colors.RESET}",
+            "",
+        ]
+        for row in range(rows):
+            by = block_bottom + rows - 1 - row
+            cells = "".join(f"{self._block_text(bx, by, zoom, rovers_in_block)} "
+                            for bx in range(block_left, block_left + columns))
+            lines.append(f"{Colors.WHITE}{by * zoom:>{label_width}}{Colors.RESET} {cells}")
+
+        lines.append("")
+        lines.append(f"{Colors.BOLD}Legend:{Colors.RESET}")
+        in_view = [i for i, rover in enumerate(self.rovers)
+                   if left <= rover.x <= right and bottom <= rover.y <= top]
+        for rover_id in in_view[:VIEWPORT_LEGEND_ROWS]:
+            lines.append(self._legend_line(rover_id))
+        if len(in_view) > VIEWPORT_LEGEND_ROWS:
+            lines.append(f"  ... and {len(in_view) - VIEWPORT_LEGEND_ROWS} more rovers in view")
+        if zoom > 1:
+            lines.append(f"  {Colors.YELLOW}{DENSITY_SHADES}{Colors.RESET} = trail density, "
+                         f"{Colors.BOLD}2-9/+{Colors.RESET} = rovers per block")
+        else:
+            lines.append(f"  {Colors.WHITE}·{Colors.RESET} = Rover trail")
+        if self.plateau.obstacles is not None:
+            lines.append(f"  {OBSTACLE} = Obstacle")
+        return lines
+
+    def _draw_viewport(self, step_info: str, command_info: str):
+        """Draw only what fits in the viewport: cost scales with its size, not the plateau's"""
+        lines = self._viewport_lines(step_info, command_info)
+        if self.renderer is not None:
+            for row, line in enumerate(lines):
+                self.renderer.put_line(row, line)
+            self.renderer.present()
+        else:
+            self.clear_screen()
+            self._write("\n".join(lines) + "\n")
+
+    def animate_rover_commands(self, rover_id: int, commands: str, outcomes: Optional[Iterable[bool]] = None):
+        """Animate a rover executing commands step by step.
+
+        When replaying a recorded mission, `outcomes` says whether each M actually
+        moved (rovers the visualizer knows nothing about may have blocked it).
+        """
+        rover = self.rovers[rover_id]
+        outcomes = iter(outcomes) if outcomes is not None else None
+
+        announcement = f"Executing commands for Rover {rover_id + 1}: {commands}"
+        if self.renderer is not None:
+            self.draw_plateau(announcement)  # keep the message inside the frame
+        else:
+            self._write(f"{Colors.BOLD}{Colors.GREEN}{announcement}{Colors.RESET}\n")
+        self.pause(1)
+
+        last_step = max((i for i, command in enumerate(commands) if command in 'LRM'), default=-1)
+        steps = 0
         for i, command in enumerate(commands):
             # Record current position before move
             old_pos = (rover.x, rover.y)
+            blocked = False
 
             # Execute command
             if command == 'L':
@@ -134,59 +465,110 @@ class MarsRoverVisualizer:
                 rover.turn_right()
                 action = "Turned RIGHT"
             elif command == 'M':
-                rover.move()
+                if outcomes is None or next(outcomes):
+                    rover.move()
                 action = "Moved FORWARD"
                 # Add old position to trail if rover actually moved
                 if (rover.x, rover.y) != old_pos:
                     self.rover_trails[rover_id].append(old_pos)
+                else:
+                    blocked = True
+                    action = "BLOCKED"
             else:
                 continue
 
+            steps += 1
+            if not self._should_draw(steps, key_event=blocked or i == last_step):
+                continue
+
             step_info = f"Rover {rover_id + 1} - Step {i + 1}/{len(commands)}: {action}"
             command_info = f"Command: '{command}' | Position: ({rover.x}, {rover.y}, {rover.heading})"
 
             self.draw_plateau(step_info, command_info)
-            time.sleep(self.delay)
+            self.pause(self.delay)
+
+    def _should_draw(self, step: int, key_event: bool) -> bool:
+        """Frame selection: every Nth step (plus each rover's last), or key events only"""
+        if self.key_events_only:
+            return key_event
+        return key_event and self.frame_every > 1 or step % self.frame_every == 0
+
+    def play(self, rover_commands: List[Tuple]):
+        """Run a whole mission: (rover_id, commands[, outcomes]) per rover, in order"""
+        # Show initial state
+        self.draw_plateau("🌍 INITIAL SETUP", "All rovers deployed and ready for mission!")
+        self.pause(2)
+
+        # Execute commands for each rover
+        for rover_id, commands, *outcomes in rover_commands:
+            self.animate_rover_commands(rover_id, commands, *outcomes)
+            self.pause(1)
+
+        # Show final state
+        self.show_final_state()
 
     def show_final_state(self):
         """Show the final state of all rovers"""
         self.draw_plateau("🎯 MISSION COMPLETE! Final positions:", "All rovers have completed their missions.")
 
-        print(f"{Colors.BOLD}{Colors.GREEN}Final Rover Positions:{Colors.RESET}")
+        lines = [f"{Colors.BOLD}{Colors.GREEN}Final Rover Positions:{Colors.RESET}"]
         for i, rover in enumerate(self.rovers):
-            print(f"  Rover {i + 1}: {rover}")
-        print()
+            lines.append(f"  Rover {i + 1}: {rover}")
+        self._write("\n".join(lines) + "\n\n")
 
 
-def visualize_simulation(input_str: str, delay: float = 0.8):
-    """Main function to run the visual simulation"""
+def visualize_simulation(input_str: str, delay: float = 0.8, differential: bool = True,
+                         viewport: Optional[Viewport] = None, headless: bool = False,
+                         frame_every: int = 1, key_events_only: bool = False,
+                         record: Optional[str] = None, obstacles=None):
+    """Main function to run the visual simulation.
+
+    headless skips every sleep (and frame-rate cap); record writes the frames to an
+    asciicast file stamped with the intended timing so it can be replayed later.
+    """
     lines = input_str.strip().splitlines()
     max_x, max_y = map(int, lines[0].split())
-    plateau = Plateau(max_x, max_y)
-
-    # Create visualizer
-    visualizer = MarsRoverVisualizer(plateau, delay)
-
-    # Parse and add rovers
-    rover_commands = []
-    for i in range(1, len(lines), 2):
-        x, y, heading = lines[i].split()
-        rover = Rover(int(x), int(y), heading, plateau)
-        rover_id = visualizer.add_rover(rover)
-        commands = lines[i + 1].strip()
-        rover_commands.append((rover_id, commands))
-
-    # Show initial state
-    visualizer.draw_plateau("🌍 INITIAL SETUP", "All rovers deployed and ready for mission!")
-    time.sleep(2)
-
-    # Execute commands for each rover
-    for rover_id, commands in rover_commands:
-        visualizer.animate_rover_commands(rover_id, commands)
-        time.sleep(1)
-
-    # Show final state
-    visualizer.show_final_state()
+
+    def run(visualizer: MarsRoverVisualizer):
+        # Parse and add rovers
+        rover_commands = []
+        for i in range(1, len(lines), 2):
+            x, y, heading = lines[i].split()
+            rover = Rover(int(x), int(y), heading, visualizer.plateau)
+            rover_id = visualizer.add_rover(rover)
+            commands = lines[i + 1].strip()
+            rover_commands.append((rover_id, commands))
+        visualizer.play(rover_commands)
+
+    _visual_session(Plateau(max_x, max_y, obstacles), run, delay, differential, viewport,
+                    headless, frame_every, key_events_only, record)
+
+
+def visualize_trace(path: str, delay: float = 0.8, differential: bool = True,
+                    viewport: Optional[Viewport] = None, headless: bool = False,
+                    frame_every: int = 1, key_events_only: bool = False,
+                    record: Optional[str] = None):
+    """Replay a mission trace (see mission_trace) with the same options as visualize_simulation"""
+    from mission_trace import MissionTrace
+    with MissionTrace(path) as trace:
+        _visual_session(Plateau(trace.max_x, trace.max_y), trace.replay, delay, differential, viewport,
+                        headless, frame_every, key_events_only, record)
+
+
+def _visual_session(plateau: Plateau, run: Callable[[MarsRoverVisualizer], None], delay: float,
+                    differential: bool, viewport: Optional[Viewport], headless: bool,
+                    frame_every: int, key_events_only: bool, record: Optional[str]):
+    stream = AsciicastRecorder(record) if record else None
+    try:
+        # Create visualizer (differential mode repaints only the cells that changed)
+        renderer = DifferentialRenderer(stream, max_fps=None if headless else 30.0) if differential else None
+        visualizer = MarsRoverVisualizer(plateau, delay, renderer, stream=stream, headless=headless,
+                                         frame_every=frame_every, key_events_only=key_events_only)
+        visualizer.set_viewport(viewport)
+        run(visualizer)
+    finally:
+        if stream is not None:
+            stream.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,39 @@
+import sys, os
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+import pytest
+
+pytest.importorskip("numpy")
+
+from main import run_simulation
+from batch_engine import run_batch_simulation, step_rovers, SCALAR_TAIL
+
+
+def test_original_example_matches():
+    input_str = """5 5
+1 2 N
+LMLMLMLMM
+3 3 E
+MMRMMRMRRM"""
+    assert run_batch_simulation(input_str) == "1 3 N\n5 1 E"
+
+
+def test_empty_input():
+    assert run_batch_simulation("   ") == ""
+
+
+def test_ragged_fleet_matches_scalar_engine():
+    rng = random.Random(7)
+    lines = ["6 4"]
+    for _ in range(SCALAR_TAIL * 4):
+        lines.append(f"{rng.randint(-1, 7)} {rng.randint(-1, 5)} {rng.choice('NESWnesw')}")
+        lines.append("".join(rng.choice("LRMlrmX") for _ in range(rng.randint(1, 120))))
+    input_str = "\n".join(lines)
+    assert run_batch_simulation(input_str) == run_simulation(input_str)
+
+
+def test_per_rover_bounds():
+    xs, ys, hs = step_rovers([0, 0], [0, 0], [1, 1], [b"MMMM", b"MMMM"], [2, 10], 0)
+    assert xs.tolist() == [2, 4]
+    assert ys.tolist() == [0, 0]
@@ -0,0 +1,104 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import contextlib
+import io
+import subprocess
+
+import pytest
+
+import main_enhanced
+from main_enhanced import build_parser, legacy_command, main
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+def _run_main(argv):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        main(argv)
+    return out.getvalue()
+
+
+def test_run_subcommand_and_legacy_flags_agree(tmp_path):
+    mission = tmp_path / "mission.txt"
+    mission.write_text("5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM\n")
+    for argv in (["run", "-f", str(mission)], ["-f", str(mission)], []):
+        assert _run_main(argv).splitlines()[-2:] == ["1 3 N", "5 1 E"]
+
+
+def test_legacy_flags_route_to_subcommands():
+    def route(*flags):
+        return legacy_command(build_parser().parse_args(list(flags)))
+
+    assert route() == "run"
+    assert route("--stream") == "run"
+    assert route("--load-trace", "t.trace") == "run"
+    assert route("--visual") == "visualize"
+    assert route("--record", "a.cast") == "visualize"
+    assert route("--replay", "a.cast") == "visualize"
+    assert route("--load-trace", "t.trace", "--visual") == "visualize"
+    assert route("--interactive", "--visual") == "interactive"
+
+
+def test_subcommands_only_accept_their_own_flags():
+    with pytest.raises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+        build_parser("run").parse_args(["--speed", "0.5"])
+    args = build_parser("visualize").parse_args(["--speed", "0.5", "--headless"])
+    assert args.speed == 0.5 and args.headless
+
+
+def test_plain_run_stays_within_import_budget():
+    """A fresh `run` process loads no repo module outside RUN_IMPORT_BUDGET"""
+    script = (
+        "import sys, io, contextlib\n"
+        "import main_enhanced\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    main_enhanced.main(['run'])\n"
+        "local = {m for m, mod in sys.modules.items()\n"
+        "         if (getattr(mod, '__file__', None) or '').startswith(sys.argv[1])}\n"
+        "print(' '.join(sorted(local - main_enhanced.RUN_IMPORT_BUDGET)))\n"
+        "print(' '.join(sorted(m for m in ('numpy', 'asyncio', 'multiprocessing', 'gzip')\n"
+        "                      if m in sys.modules)))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", script, SRC], cwd=SRC, capture_output=True,
+                         text=True, check=True).stdout
+    extra_repo_modules, heavy_stdlib = out.split("\n")[:2]
+    assert extra_repo_modules == ""
+    assert heavy_stdlib == ""
+
+
+def test_colors_live_outside_the_visualizer():
+    import colors
+    import visualizer
+    assert visualizer.Colors is colors.Colors is main_enhanced.Colors
+
+
+def test_bench_times_a_generated_mission():
+    out = _run_main(["bench", "--rovers", "3", "--commands", "20", "--plateau", "5", "--repeat", "1"])
+    assert "3 rovers, 60 commands" in out
+    assert "standard" in out and "commands/s" in out
+
+
+def test_bench_repeats_start_from_a_cold_run_cache():
+    from hexrover.cache import default_cache
+    _run_main(["bench", "--rovers", "3", "--commands", "20", "--plateau", "5", "--repeat", "3",
+               "--engine", "standard"])
+    assert default_cache.info().hits == 0  # the last repeat found nothing left by the others
+
+
+def test_tracing_a_run_does_not_change_its_results(tmp_path):
+    mission = tmp_path / "mission.txt"
+    mission.write_text("5 5\n0 0 E\nMMM\n2 0 W\nMMM\n")  # the rovers cross paths
+    plain = _run_main(["run", "-f", str(mission)]).splitlines()
+    traced = _run_main(["run", "-f", str(mission), "--trace", str(tmp_path / "t.trace")]).splitlines()
+    assert plain[-2:] == traced[-3:-1] == ["3 0 E", "0 0 W"]
+
+
+def test_batch_engine_rejects_workers(tmp_path):
+    mission = tmp_path / "mission.txt"
+    mission.write_text("5 5\n1 2 N\nLMLMLMLMM\n")
+    out = io.StringIO()
+    with pytest.raises(SystemExit), contextlib.redirect_stdout(out):
+        main(["run", "-f", str(mission), "--engine", "batch", "--workers", "2"])
+    assert "--workers needs the standard engine" in out.getvalue()
@@ -0,0 +1,100 @@
+import sys, os
+import random
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from hexrover.adapters.terrain import BitmapObstacles
+from hexrover.compat.plateau_compat import Plateau
+from hexrover.coverage import partition, plan_coverage
+from enhanced_rover import MissionControl
+
+
+def _run(plateau, starts):
+    mission = MissionControl(plateau)
+    for x, y, heading in starts:
+        mission.add_rover(x, y, heading)
+    mission.execute_mission(mission.plan_coverage())
+    return mission.get_mission_statistics()["aggregates"]
+
+
+def test_partition_is_balanced_and_covers_the_grid():
+    for width, height, count in [(10, 10, 4), (7, 30, 5), (100, 3, 9), (3, 2, 8)]:
+        regions = partition(width, height, count)
+        assert len(regions) == count
+        cells = [(x, y) for r in regions if r for x in range(r[0], r[2] + 1) for y in range(r[1], r[3] + 1)]
+        assert sorted(cells) == sorted((x, y) for x in range(width) for y in range(height))
+        areas = [(r[2] - r[0] + 1) * (r[3] - r[1] + 1) for r in regions if r]
+        if count <= width * height:
+            assert max(areas) <= 2 * min(areas)
+
+
+def test_fleet_covers_an_open_plateau_without_blocked_moves():
+    stats = _run(Plateau(9, 9), [(0, 0, "N"), (9, 9, "S"), (4, 4, "E"), (4, 5, "W")])
+    assert stats["plateau_coverage"] == "100.0%"
+    assert stats["total_blocked_moves"] == 0
+    # one straight sweep needs two turns per line change, plus getting into place
+    assert stats["total_moves"] < 100 + 4 * 10
+
+
+def test_single_rover_sweep_is_a_plain_boustrophedon():
+    (commands,) = plan_coverage(Plateau(3, 5), [(0, 0, "N")])
+    assert commands == "MMMMM" + "RMR" + "MMMMM" + "LML" + "MMMMM" + "RMR" + "MMMMM"
+
+
+def test_fleet_routes_around_obstacles_and_parked_rovers():
+    rng = random.Random(15)
+    rocks = BitmapObstacles.for_plateau(20, 20, [(rng.randint(0, 20), rng.randint(0, 20)) for _ in range(40)])
+    plateau = Plateau(20, 20, rocks)
+    starts = []
+    while len(starts) < 12:
+        x, y = rng.randint(0, 20), rng.randint(0, 20)
+        if plateau.is_free(x, y) and (x, y) not in [s[:2] for s in starts]:
+            starts.append((x, y, rng.choice("NESW")))
+    stats = _run(plateau, starts)
+    assert stats["total_blocked_moves"] == 0
+    free = 21 * 21 - len(set(rocks))
+    assert stats["unique_positions_explored"] >= free - 2  # a boulder ring may seal off a cell or two
+
+
+def _reachable(plateau, starts):
+    seen, todo = set(), [start[:2] for start in starts]
+    while todo:
+        x, y = cell = todo.pop()
+        if cell not in seen and plateau.is_free(x, y):
+            seen.add(cell)
+            todo += [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+    return seen
+
+
+def _explored(plateau, starts):
+    mission = MissionControl(plateau)
+    for x, y, heading in starts:
+        mission.add_rover(x, y, heading)
+    mission.execute_mission(mission.plan_coverage())
+    assert mission.get_mission_statistics()["aggregates"]["total_blocked_moves"] == 0
+    return mission.occupancy.explored
+
+
+def test_parked_rovers_never_wall_in_later_ones():
+    # the first rover parks so the third can still get past it to (0, 0)
+    corridor = Plateau(0, 6)
+    starts = [(0, 5, "N"), (0, 3, "S"), (0, 6, "N")]
+    assert _explored(corridor, starts) == _reachable(corridor, starts)
+    rng = random.Random(15)
+    for _ in range(300):
+        width, height = rng.randint(0, 7), rng.randint(0, 7)
+        rocks = {(rng.randint(0, width), rng.randint(0, height)) for _ in range(rng.randint(0, 12))}
+        plateau = Plateau(width, height, BitmapObstacles.for_plateau(width, height, rocks))
+        free = [(x, y) for x in range(width + 1) for y in range(height + 1) if (x, y) not in rocks]
+        starts = [(x, y, rng.choice("NESW")) for x, y in rng.sample(free, min(len(free), rng.randint(2, 6)))]
+        assert _explored(plateau, starts) == _reachable(plateau, starts), (width, height, sorted(rocks), starts)
+
+
+def test_rejects_starts_and_obstacles_off_the_plateau():
+    with pytest.raises(ValueError, match=r"Rover start \(6, 0\) is outside the 6 x 4 plateau"):
+        plan_coverage(Plateau(5, 3), [(0, 0, "N"), (6, 0, "N")])
+    rocks = BitmapObstacles.for_plateau(9, 9, [(8, 8)])
+    with pytest.raises(ValueError, match=r"Obstacle map is 10 x 10 but the plateau is 6 x 6"):
+        plan_coverage(Plateau(5, 5, rocks), [(0, 0, "N")])
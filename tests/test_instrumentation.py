@@ -0,0 +1,67 @@
+import sys, os
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from hexrover.adapters.collision_nav import CollisionNavigator, Occupancy
+from hexrover.adapters.grid_nav import GridNavigator, Plateau as HexPlateau
+from hexrover.adapters.terrain import BitmapObstacles
+from hexrover.cache import RunCache
+from hexrover.compat.plateau_compat import Plateau
+from hexrover.domain import Rover
+from hexrover.instrumentation import InstrumentedNavigator, Instrumentation
+from hexrover.ports import Heading, Position
+from enhanced_rover import MissionControl
+from main_enhanced import run_simulation
+
+MISSION = "5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM"
+
+
+def test_navigator_wrapper_counts_moves_turns_and_stop_reasons():
+    instrumentation = Instrumentation()
+    occ = Occupancy({"A": Position(0, 0), "B": Position(0, 2)})
+    grid = GridNavigator(HexPlateau(3, 3, BitmapObstacles.for_plateau(3, 3, [(1, 1)])))
+    nav = instrumentation.navigator(CollisionNavigator(grid, occ, "A"), "A")
+    # N: step to (0, 1), bump into B; E: bump into the boulder; S, S: one step, then the edge
+    rover = Rover(Position(0, 0), Heading.N, nav).run("MMRMRMMM")
+    assert rover.position == Position(0, 0)
+    assert occ.positions == {"A": Position(0, 0), "B": Position(0, 2)}
+    snapshot = instrumentation.snapshot()["rovers"]["A"]
+    assert (snapshot["forwards"], snapshot["turns"]) == (6, 2)
+    assert (snapshot["boundary_stops"], snapshot["collision_stops"]) == (3, 1)
+    # the wrapper passes the end of a run on to the occupancy it wraps
+    assert Rover(Position(0, 0), Heading.N, nav).run("M").position == occ.positions["A"] == Position(0, 1)
+
+
+def test_instrumented_runs_bypass_the_cache_and_keep_results():
+    cache = RunCache()
+    nav = InstrumentedNavigator(GridNavigator(HexPlateau(5, 5)), Instrumentation().rover("R"))
+    rover = Rover(Position(1, 2), Heading.N, nav)
+    assert cache.run(rover, "LMLMLMLMM").position == Position(1, 3)
+    cache.run(rover, "LMLMLMLMM")
+    assert nav.metrics.forwards == 10 and cache.info().currsize == 0
+
+
+def test_run_simulation_times_every_rover():
+    instrumentation = Instrumentation()
+    assert run_simulation(MISSION, instrumentation=instrumentation) == run_simulation(MISSION)
+    snapshot = json.loads(instrumentation.to_json())
+    assert sorted(snapshot["rovers"]) == ["Rover-1", "Rover-2"]
+    assert snapshot["totals"]["forwards"] == 11 and snapshot["totals"]["runs"] == 2
+    for rover in snapshot["rovers"].values():
+        assert sum(rover["latency_histogram"].values()) == 1 and rover["seconds"] > 0
+    assert "Rover-2: 6 forwards, 4 turns" in instrumentation.format_report()
+
+
+def test_mission_control_reports_collisions_and_boundaries():
+    for lockstep in (False, True):
+        mission = MissionControl(Plateau(5, 5), Instrumentation())
+        first = mission.add_rover(0, 0, "N")
+        second = mission.add_rover(0, 2, "S")
+        run = mission.execute_lockstep if lockstep else mission.execute_mission
+        run([(first, "MMLM"), (second, "M")])
+        stats = mission.get_mission_statistics()["instrumentation"]["rovers"]
+        assert stats["Rover-1"]["collision_stops"] == 1
+        assert stats["Rover-1"]["boundary_stops"] == 1
+        assert stats["Rover-1"]["turns"] == 1
+        assert stats["Rover-2"]["forwards"] == 1
@@ -0,0 +1,98 @@
+import sys, os
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from hexrover.adapters.grid_nav import GridNavigator, Plateau
+from hexrover.adapters.terrain import BitmapObstacles
+from hexrover.compat.plateau_compat import Plateau as CompatPlateau
+from hexrover.domain import Rover
+from hexrover.kernel import (CODES, ENUMS, HEADINGS, LEFT, LEFT_OF, LEFT_OF_HEADING, RIGHT, long_runs, run,
+                             run_lengths, transition)
+from hexrover.ports import Heading, Position
+from enhanced_rover import EnhancedRover
+
+
+def test_tables_agree_with_heading_names_and_enums():
+    for h, name in enumerate(HEADINGS):
+        assert CODES[name] == CODES[Heading(name)] == h
+        assert RIGHT[LEFT[h]] == LEFT[RIGHT[h]] == h
+        assert LEFT_OF[name] == HEADINGS[LEFT[h]]
+        assert LEFT_OF_HEADING[ENUMS[h]] is ENUMS[LEFT[h]]
+    assert transition((0, 0, 0), "M", lambda x, y: False) == (0, 0, 0)
+    assert transition((0, 0, 0), "X", lambda x, y: True) == (0, 0, 0)
+
+
+def test_every_rover_implementation_follows_the_kernel():
+    rng = random.Random(19)
+    rocks = BitmapObstacles.for_plateau(6, 6, [(rng.randint(0, 6), rng.randint(0, 6)) for _ in range(8)])
+    plateau = Plateau(6, 6, rocks)
+    for _ in range(50):
+        x, y = rng.randint(0, 6), rng.randint(0, 6)
+        h = rng.randrange(4)
+        commands = "".join(rng.choice("LRM") for _ in range(40))
+
+        expected = (x, y, h)
+        for c in commands:
+            expected = transition(expected, c, plateau.is_free)
+        assert run((x, y, h), commands, plateau.is_free) == expected
+
+        core = Rover(Position(x, y), ENUMS[h], GridNavigator(plateau)).run(commands)
+        assert (core.position.x, core.position.y, CODES[core.heading]) == expected
+
+        enhanced = EnhancedRover(x, y, HEADINGS[h], CompatPlateau(6, 6, rocks))
+        enhanced.execute_commands(commands)
+        assert (enhanced.x, enhanced.y, CODES[enhanced.heading]) == expected
+
+
+def long_run_mission(rng, runs=30):
+    return "".join(rng.choice(("L", "R", "LL", "RRR", "")) + "M" * rng.randint(0, 30) for _ in range(runs))
+
+
+def test_run_lengths_matches_stepping_with_counts():
+    rng = random.Random(24)
+    plateau = Plateau(9, 7)
+    # includes starts off the plateau, which only a single step straight back can leave
+    starts = [(rng.randint(0, 9), rng.randint(0, 7)) for _ in range(40)] + [(12, 3), (4, -1), (-2, -5)]
+    for x, y in starts:
+        h = rng.randrange(4)
+        commands = long_run_mission(rng)
+        state, moves, blocked = (x, y, h), 0, 0
+        for c in commands:
+            after = transition(state, c, plateau.is_free)
+            if c == "M":
+                moved = after[:2] != state[:2]
+                moves += moved
+                blocked += not moved
+            state = after
+        assert run_lengths((x, y, h), commands, 9, 7) == state + (moves, blocked)
+        assert GridNavigator(plateau).execute(x, y, h, commands) == state
+    assert long_runs("M" * 40 + "L" + "M" * 30) and not long_runs("MLMRMM" * 10)
+
+
+def test_packed_execute_matches_text_execute():
+    from mission_format import pack_commands
+    rng = random.Random(22)
+    obstacles = BitmapObstacles.for_plateau(30, 30, [(rng.randint(0, 30), rng.randint(0, 30)) for _ in range(60)])
+    for plateau in (Plateau(30, 30), Plateau(30, 30, obstacles), Plateau(3, 2)):
+        nav = GridNavigator(plateau)
+        for length in (0, 1, 2, 3, 4, 7, 250, 1001):
+            commands = "".join(rng.choice("LRMMM") for _ in range(length))
+            packed, count = pack_commands(commands)
+            x, y, h = rng.randint(0, plateau.max_x), rng.randint(0, plateau.max_y), rng.randrange(4)
+            assert nav.execute_packed(x, y, h, memoryview(packed), count) == nav.execute(x, y, h, commands)
+
+
+def test_enhanced_rover_run_fast_path_keeps_history_and_statistics():
+    rng = random.Random(240)
+    for _ in range(30):
+        x, y, h = rng.randint(0, 9), rng.randint(0, 7), rng.choice(HEADINGS)
+        commands = long_run_mission(rng)
+        assert long_runs(commands)
+        fast = EnhancedRover(x, y, h, CompatPlateau(9, 7))
+        fast.execute_commands(commands)
+        stepped = EnhancedRover(x, y, h, CompatPlateau(9, 7))
+        stepped.execute_commands(commands, other_rovers=[stepped])  # itself never blocks: stepwise
+        assert fast.get_statistics() == stepped.get_statistics()
+        assert fast.path_history == stepped.path_history
+        assert fast.get_visited_positions() == stepped.get_visited_positions()
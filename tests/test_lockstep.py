@@ -0,0 +1,81 @@
+import sys, os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from hexrover.compat.plateau_compat import Plateau
+from enhanced_rover import EnhancedRover, MissionControl
+from lockstep import LockstepScheduler
+import pytest
+
+
+def _mission(*rovers, size=5):
+    mission = MissionControl(Plateau(size, size))
+    return mission, [mission.add_rover(x, y, h) for x, y, h in rovers]
+
+
+def test_rovers_take_turns_in_the_same_tick():
+    mission, (a, b) = _mission((0, 0, "N"), (5, 5, "S"))
+    ticks = mission.execute_lockstep([(a, "MM"), (b, "RMMM")])
+    assert ticks == 4
+    assert a.get_position() == "0 2 N"
+    assert b.get_position() == "2 5 W"
+
+
+def test_same_target_goes_to_first_listed_rover():
+    mission, (a, b) = _mission((0, 1, "E"), (2, 1, "W"))
+    mission.execute_lockstep([(b, "M"), (a, "M")])
+    assert b.get_position() == "1 1 W"
+    assert a.get_position() == "0 1 E"
+    assert a.blocked_moves == 1
+
+
+def test_swapping_rovers_are_both_blocked():
+    mission, (a, b) = _mission((0, 0, "E"), (1, 0, "W"))
+    mission.execute_lockstep([(a, "M"), (b, "M")])
+    assert (a.x, b.x) == (0, 1)
+    assert a.blocked_moves == b.blocked_moves == 1
+
+
+def test_rotation_cycle_is_blocked():
+    mission, rovers = _mission((0, 0, "N"), (0, 1, "E"), (1, 1, "S"), (1, 0, "W"))
+    mission.execute_lockstep([(rover, "M") for rover in rovers])
+    assert all(rover.blocked_moves == 1 for rover in rovers)
+    assert [(r.x, r.y) for r in rovers] == [(0, 0), (0, 1), (1, 1), (1, 0)]
+
+
+def test_followers_move_with_the_leader():
+    mission, (tail, middle, head) = _mission((0, 0, "E"), (1, 0, "E"), (2, 0, "E"))
+    # listed tail first so resolution has to walk the whole chain
+    mission.execute_lockstep([(tail, "MM"), (middle, "MM"), (head, "MM")])
+    assert [(r.x, r.y) for r in (tail, middle, head)] == [(2, 0), (3, 0), (4, 0)]
+    assert mission.detect_collisions() == []
+
+
+def test_chain_stalls_behind_stationary_rover():
+    mission, (a, b, wall) = _mission((0, 0, "E"), (1, 0, "E"), (2, 0, "N"))
+    mission.execute_lockstep([(a, "M"), (b, "M"), (wall, "L")])
+    assert (a.x, b.x) == (0, 1)
+    assert a.blocked_moves == b.blocked_moves == 1
+
+
+def test_plateau_edge_blocks_move():
+    mission, (a,) = _mission((5, 5, "N"))
+    mission.execute_lockstep([(a, "MRM")])
+    assert a.get_position() == "5 5 E"
+    assert a.blocked_moves == 2
+
+
+def test_step_by_step_time_slices():
+    mission, (a,) = _mission((0, 0, "N"))
+    scheduler = LockstepScheduler(mission, [(a, "MMM")])
+    assert scheduler.step()
+    assert (a.x, a.y) == (0, 1)
+    assert scheduler.run() == 3
+    assert scheduler.finished
+    assert not scheduler.step()
+
+
+def test_undeployed_rover_rejected():
+    mission, _ = _mission((0, 0, "N"))
+    stray = EnhancedRover(3, 3, "N", mission.plateau, "Stray")
+    with pytest.raises(ValueError, match="Stray"):
+        LockstepScheduler(mission, [(stray, "M")])
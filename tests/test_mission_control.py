@@ -0,0 +1,132 @@
+import sys, os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from hexrover.compat.plateau_compat import Plateau
+from enhanced_rover import MissionControl, OccupancyIndex, run_enhanced_simulation
+import pytest
+import random
+
+
+class TestOccupancyIndex:
+    """Test the cell index MissionControl uses for collision checks"""
+
+    def test_index_follows_moves(self):
+        mission = MissionControl(Plateau(5, 5))
+        rover = mission.add_rover(1, 1, "N")
+        rover.move()
+        assert mission.occupancy.occupant(1, 1) is None
+        assert mission.occupancy.occupant(1, 2) is rover
+
+    def test_is_occupied_excludes_self(self):
+        mission = MissionControl(Plateau(5, 5))
+        rover = mission.add_rover(2, 2, "E")
+        assert not mission.occupancy.is_occupied(2, 2, exclude=rover)
+        assert mission.occupancy.is_occupied(2, 2)
+
+    def test_collisions_match_pairwise_order(self):
+        mission = MissionControl(Plateau(5, 5))
+        rovers = [mission.add_rover(i, 0, "N") for i in range(4)]
+        # Stack rovers by hand the way a buggy caller might
+        rovers[3].x = rovers[1].x = 0
+        rovers[2].x = 1
+        expected = [(rovers[0], rovers[1]), (rovers[0], rovers[3]), (rovers[1], rovers[3])]
+        assert mission.detect_collisions() == expected
+        assert OccupancyIndex.from_rovers(rovers).collisions() == expected
+
+
+class TestMissionControl:
+    """Test deployment and mission execution with collision detection"""
+
+    def test_deploy_on_occupied_cell_rejected(self):
+        mission = MissionControl(Plateau(5, 5))
+        mission.add_rover(1, 1, "N", "Alpha")
+        with pytest.raises(ValueError, match="occupied by Alpha"):
+            mission.add_rover(1, 1, "S")
+
+    def test_rover_blocked_by_other_rover(self):
+        mission = MissionControl(Plateau(5, 5))
+        first = mission.add_rover(0, 0, "E")
+        second = mission.add_rover(2, 0, "W")
+        mission.execute_mission([(first, "MMM"), (second, "MMM")])
+        assert first.get_position() == "1 0 E"
+        assert first.blocked_moves == 2
+        assert second.get_position() == "2 0 W"
+        assert second.blocked_moves == 3
+        assert mission.detect_collisions() == []
+
+    def test_classic_example_statistics(self):
+        stats = run_enhanced_simulation("5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM")
+        assert [s.final_position for s in stats['rover_stats']] == ["1 3 N", "5 1 E"]
+        assert stats['aggregates']['total_blocked_moves'] == 0
+
+    def test_statistics_follow_moves_incrementally(self):
+        mission = MissionControl(Plateau(5, 5))
+        first = mission.add_rover(1, 2, "N")
+        second = mission.add_rover(3, 3, "E")
+        mission.execute_mission([(first, "LMLMLMLMM"), (second, "MMRMMRMRRM")])
+
+        stats = first.get_statistics()
+        assert stats.unique_positions == 5  # (1, 2) is visited twice
+        assert stats.path_length == len(first.path_history) == 10
+        assert stats[:3] == ("Rover-1", "1 3 N", 5)
+        assert stats._asdict()['blocked_moves'] == 0 and 'turns_made' in stats._asdict()
+        assert first.has_visited_position(0, 1) and not first.has_visited_position(3, 3)
+        visited = first.get_visited_positions()
+        assert visited == {(1, 2), (0, 2), (0, 1), (1, 1), (1, 3)}
+
+        everywhere = first.get_visited_positions() | second.get_visited_positions()
+        aggregates = mission.get_mission_statistics()['aggregates']
+        assert aggregates['unique_positions_explored'] == len(everywhere) == 11
+        assert aggregates['plateau_coverage'] == "30.6%"
+        first.execute_commands("RM")
+        assert (2, 3) not in visited  # a copy: later moves don't show up in it
+
+
+class TestRunLengthMissions:
+    """Long runs of moves resolved against the stationary fleet must match stepping"""
+
+    @staticmethod
+    def fleet(seed, stepwise):
+        rng = random.Random(seed)
+        mission = MissionControl(Plateau(20, 20))
+        starts = {(rng.randint(0, 20), rng.randint(0, 20)) for _ in range(40)} | {(23, 7), (4, -2)}
+        plan = []
+        for x, y in sorted(starts):
+            rover = mission.add_rover(x, y, rng.choice("NESW"))
+            if rng.random() < 0.3:  # short runs keep stepping, past an index built by others
+                commands = "".join(rng.choice("LRM") for _ in range(30))
+            else:
+                commands = "".join(rng.choice("LR") + "M" * rng.randint(10, 40) for _ in range(6))
+            plan.append((rover, commands))
+        if not stepwise:
+            mission.execute_mission(plan)
+        else:
+            for rover, commands in plan:  # other_rovers alone forces the per-step loop
+                rover.execute_commands(commands, other_rovers=[rover], occupancy=mission.occupancy)
+        return mission
+
+    def test_execute_mission_matches_stepping(self):
+        for seed in range(5):
+            fast, stepped = self.fleet(seed, False), self.fleet(seed, True)
+            fast_stats, stepped_stats = fast.get_mission_statistics(), stepped.get_mission_statistics()
+            del fast_stats['mission_log'], stepped_stats['mission_log']  # only execute_mission logs runs
+            assert fast_stats == stepped_stats
+            for a, b in zip(fast.rovers, stepped.rovers):
+                assert a.get_statistics() == b.get_statistics()
+                assert a.path_history == b.path_history
+                assert a.get_visited_positions() == b.get_visited_positions()
+            assert fast.occupancy.explored == stepped.occupancy.explored
+            assert [(a.rover_id, b.rover_id) for a, b in fast.detect_collisions()] == \
+                [(a.rover_id, b.rover_id) for a, b in stepped.detect_collisions()]
+
+    def test_clear_steps_stops_in_front_of_rovers(self):
+        mission = MissionControl(Plateau(9, 9))
+        mission.add_rover(4, 7, "N")
+        mission.add_rover(1, 4, "N")
+        index = mission.occupancy
+        assert index.clear_steps(4, 0, 0, 9) == 6  # north, up to (4, 6)
+        assert index.clear_steps(4, 9, 2, 9) == 1  # south, onto (4, 8)
+        assert index.clear_steps(8, 4, 3, 9) == 6  # west, up to (2, 4)
+        assert index.clear_steps(0, 4, 1, 9) == 0  # east, already in front of (1, 4)
+        assert index.clear_steps(5, 0, 0, 9) == 9
+        assert index.clear_steps(4, 0, 0, 9, exclude=mission.rovers[0]) == 9
@@ -0,0 +1,111 @@
+import sys, os
+import gzip
+import random
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from main_enhanced import generate_mission, main, run_simulation
+from mission_format import (MissionFile, compile_mission, is_compiled_mission, pack_commands, run_compiled,
+                            unpack_commands)
+
+
+def _compile(tmp_path, text, name="mission"):
+    source = tmp_path / f"{name}.txt"
+    source.write_text(text)
+    target = str(tmp_path / f"{name}.mrm")
+    compile_mission(str(source), target)
+    return str(source), target
+
+
+class TestMissionFormat:
+    """Test the packed binary mission format"""
+
+    def test_commands_round_trip_through_packing(self):
+        rng = random.Random(3)
+        for length in (0, 1, 3, 4, 5, 8, 1001):
+            commands = "".join(rng.choice("LRM") for _ in range(length))
+            packed, count = pack_commands(commands)
+            assert (len(packed), count) == ((length + 3) // 4, length)
+            assert unpack_commands(memoryview(packed), count) == commands
+        # lower case is accepted, and anything that is not a command is dropped like the engines ignore it
+        assert unpack_commands(*pack_commands("lm Xér")) == "LMR"
+
+    def test_reader_matches_text_mission(self, tmp_path):
+        text = generate_mission(rovers=40, commands=97, plateau=9)
+        _, path = _compile(tmp_path, text)
+        assert is_compiled_mission(path)
+        with MissionFile(path) as mission:
+            assert (mission.max_x, mission.max_y, len(mission)) == (9, 9, 40)
+            assert mission.text() == text
+            rover = mission.rover(5)
+            assert isinstance(rover.commands, memoryview) and rover.commands.readonly
+            assert unpack_commands(rover.commands, rover.length) == mission.commands(5)
+            assert [r.length for r in mission] == [97] * 40
+            with pytest.raises(IndexError):
+                mission.rover(40)
+
+    def test_engines_give_text_results(self, tmp_path):
+        text = generate_mission(rovers=60, commands=250, plateau=7, seed=11)
+        _, path = _compile(tmp_path, text)
+        expected = run_simulation(text)
+        assert run_compiled(path) == expected
+        assert run_compiled(path, workers=2) == expected
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            return
+        assert run_compiled(path, engine="batch") == expected
+        with pytest.raises(ValueError, match="one process"):
+            run_compiled(path, workers=2, engine="batch")
+
+    def test_batch_engine_reads_ragged_packed_commands(self, tmp_path):
+        pytest.importorskip("numpy")
+        rng = random.Random(22)
+        lines = ["12 9"]
+        for length in [rng.randint(0, 300) for _ in range(80)] + [1, 2, 3, 5]:
+            lines.append(f"{rng.randint(0, 12)} {rng.randint(0, 9)} {rng.choice('NESW')}")
+            lines.append("".join(rng.choice("LRM") for _ in range(length)))
+        text = "\n".join(lines)
+        _, path = _compile(tmp_path, text)
+        assert run_compiled(path, engine="batch") == run_simulation(text)
+
+    def test_failed_compile_leaves_no_file(self, tmp_path):
+        source = tmp_path / "bad.txt"
+        source.write_text("5 5\n1 2 N\nLMLM\n3 3 Q\nMM\n")
+        target = tmp_path / "bad.mrm"
+        with pytest.raises(ValueError):
+            compile_mission(str(source), str(target))
+        target.write_bytes(b"previous")
+        with pytest.raises(ValueError):
+            compile_mission(str(source), str(target))
+        assert sorted(os.listdir(tmp_path)) == ["bad.mrm", "bad.txt"]  # no temporary left behind
+        assert target.read_bytes() == b"previous"
+
+    def test_compiled_file_is_about_four_times_smaller(self, tmp_path):
+        source, path = _compile(tmp_path, generate_mission(rovers=20, commands=4000, plateau=50))
+        assert os.path.getsize(source) / os.path.getsize(path) > 3.9
+
+    def test_compiles_compressed_text(self, tmp_path):
+        text = "5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM\n"
+        source = tmp_path / "mission.txt.gz"
+        with gzip.open(source, "wt") as f:
+            f.write(text)
+        path = str(tmp_path / "mission.mrm")
+        assert compile_mission(str(source), path) == 2
+        assert run_compiled(path) == "1 3 N\n5 1 E"
+
+    def test_run_subcommand_detects_compiled_files(self, tmp_path, capsys):
+        _, path = _compile(tmp_path, "5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM\n")
+        main(["run", "-f", path])
+        assert capsys.readouterr().out.splitlines()[-2:] == ["1 3 N", "5 1 E"]
+
+    def test_rejects_other_files(self, tmp_path):
+        source, _ = _compile(tmp_path, "5 5\n1 2 N\nM\n")
+        assert not is_compiled_mission(source)
+        with pytest.raises(ValueError, match="not a compiled mission"):
+            MissionFile(source)
+        empty = tmp_path / "empty.mrm"
+        empty.write_bytes(b"")
+        with pytest.raises(ValueError, match="not a compiled mission"):
+            MissionFile(str(empty))
@@ -0,0 +1,179 @@
+import sys, os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import pytest
+
+from main import run_simulation
+import mission_service
+from mission_service import MissionService, request, run_chunk, run_missions
+
+MISSION = "5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM"
+
+
+def _mission(i):
+    return f"9 9\n{i % 10} {i // 10 % 10} N\nM" + "RM" * (i % 7)
+
+
+async def _until(predicate):
+    for _ in range(500):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+class MeetingExecutor(ThreadPoolExecutor):
+    """Calls of `fn` wait for each other in twos: they only finish if two run at once"""
+
+    def __init__(self, fn):
+        super().__init__(max_workers=2)
+        self.fn = fn
+        self.meeting = threading.Barrier(2, timeout=5)
+
+    def submit(self, fn, *args, **kwargs):
+        if fn is not self.fn:
+            return super().submit(fn, *args, **kwargs)
+
+        def meet():
+            self.meeting.wait()
+            return fn(*args, **kwargs)
+        return super().submit(meet)
+
+
+class TestMissionService:
+    """Test the asyncio mission service against localhost"""
+
+    def test_round_trip_and_several_missions_per_connection(self):
+        async def scenario():
+            async with MissionService() as service:
+                assert await request(MISSION, port=service.port) == ["1 3 N", "5 1 E"]
+                reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+                writer.write(b"5 5\n1 2 N\nM\n\n5 5\n0 0 S\nM\n")
+                writer.write_eof()
+                replies = (await reader.read()).decode()
+                writer.close()
+                return replies
+        assert asyncio.run(scenario()) == "1 3 N\n\n0 0 S\n\n"
+
+    def test_concurrent_small_missions_share_engine_calls(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+
+        async def scenario():
+            async with MissionService(executor=executor) as service:
+                executor.submit(release.wait)  # keep the engine busy while requests pile up
+                tasks = [asyncio.ensure_future(request(_mission(i), port=service.port)) for i in range(20)]
+                # the first batch went to the busy engine; everything else is still queued
+                await _until(lambda: service._queue.qsize() + service.stats['batched_requests'] == 20)
+                release.set()
+                return service.stats, await asyncio.gather(*tasks)
+
+        stats, results = asyncio.run(scenario())
+        executor.shutdown()
+        assert results == [run_simulation(_mission(i)).splitlines() for i in range(20)]
+        assert stats['requests'] == stats['batched_requests'] == 20
+        assert stats['batches'] <= 2
+
+    def test_full_queue_stops_reading_until_the_engine_catches_up(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+
+        async def scenario():
+            async with MissionService(executor=executor, max_queue=2) as service:
+                executor.submit(release.wait)
+                tasks = [asyncio.ensure_future(request(_mission(i), port=service.port)) for i in range(8)]
+                await _until(lambda: service.stats['requests'] == 8)
+                await asyncio.sleep(0.05)
+                queued = service._queue.qsize()
+                release.set()
+                return queued, await asyncio.gather(*tasks)
+
+        queued, results = asyncio.run(scenario())
+        executor.shutdown()
+        assert queued == 2
+        assert results == [run_simulation(_mission(i)).splitlines() for i in range(8)]
+
+    def test_large_missions_are_chunked_and_errors_reported(self):
+        big = "9 9\n" + "\n".join(f"{i % 10} {i // 10} E\nMMLMRM" for i in range(100))
+
+        async def scenario():
+            async with MissionService(small_mission_bytes=64, chunk_weight=50) as service:
+                lines = await request(big, port=service.port)
+                with pytest.raises(ValueError, match="Missing command line"):
+                    await request("5 5\n1 2 N", port=service.port)
+                with pytest.raises(ValueError):
+                    await request("not a plateau", port=service.port)
+                return service.stats, lines
+
+        stats, lines = asyncio.run(scenario())
+        assert lines == run_simulation(big).splitlines()
+        assert stats['chunked_requests'] == 1 and stats['errors'] == 2
+
+    def test_bad_mission_fails_alone_in_its_batch(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        bad_large = "9 9\n" + "\n".join(f"{i % 10} {i // 10} E\nMMLMRM" for i in range(20)) + "\n1 2 Q\nM"
+
+        async def scenario():
+            async with MissionService(executor=executor, small_mission_bytes=64, chunk_weight=50) as service:
+                executor.submit(release.wait)
+                missions = [_mission(1), "5 5\n1 2 Q\nM", _mission(2), _mission(3)]
+                tasks = [asyncio.ensure_future(request(m, port=service.port)) for m in missions]
+                await _until(lambda: service._queue.qsize() + service.stats['batched_requests'] == 4)
+                release.set()
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                with pytest.raises(ValueError, match="Invalid heading 'Q'"):
+                    await request(bad_large, port=service.port)
+                return service.stats, results
+
+        stats, results = asyncio.run(scenario())
+        executor.shutdown()
+        assert isinstance(results[1], ValueError) and "Invalid heading 'Q'" in str(results[1])
+        assert [results[i] for i in (0, 2, 3)] == [run_simulation(_mission(i)).splitlines() for i in (1, 2, 3)]
+        assert stats['errors'] == 2
+
+    def test_batches_run_on_every_worker(self):
+        executor = MeetingExecutor(run_missions)
+
+        async def scenario():
+            async with MissionService(executor=executor) as service:
+                first = asyncio.ensure_future(request(_mission(1), port=service.port))
+                await _until(lambda: service.stats['batches'] == 1)
+                second = asyncio.ensure_future(request(_mission(2), port=service.port))
+                return service.stats, await asyncio.gather(first, second)
+
+        stats, results = asyncio.run(scenario())
+        executor.shutdown()
+        assert results == [run_simulation(_mission(i)).splitlines() for i in (1, 2)]
+        assert stats['batches'] == 2 and stats['errors'] == 0
+
+    def test_large_mission_chunks_run_on_every_worker(self):
+        executor = MeetingExecutor(run_chunk)  # the mission below is exactly two chunks
+        big = "9 9\n" + "\n".join(f"{i % 10} {i // 10} E\nMMLMRM" for i in range(14))
+
+        async def scenario():
+            async with MissionService(executor=executor, small_mission_bytes=64, chunk_weight=48) as service:
+                return await request(big, port=service.port)
+
+        lines = asyncio.run(scenario())
+        executor.shutdown()
+        assert lines == run_simulation(big).splitlines()
+
+    def test_unreadable_requests_get_an_error_and_a_closed_connection(self, monkeypatch):
+        monkeypatch.setattr(mission_service, "LINE_LIMIT", 64)
+
+        async def send(payload):
+            async with MissionService() as service:
+                reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+                writer.write(payload)
+                await writer.drain()
+                replies = (await reader.read()).decode()  # EOF: the service hung up
+                writer.close()
+                return replies, service.stats['errors']
+
+        assert asyncio.run(send(b"5 5\n1 2 \xff\nM\n\n")) == ("ERROR Request is not valid UTF-8\n\n", 1)
+        assert asyncio.run(send(b"5 5\n1 2 N\n" + b"M" * 200 + b"\n\n")) == ("ERROR Line longer than 64 bytes\n\n", 1)
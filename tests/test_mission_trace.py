@@ -0,0 +1,97 @@
+import sys, os
+import io
+import pickle
+import random
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from hexrover.compat.plateau_compat import Plateau
+from enhanced_rover import MissionControl
+from mission_trace import STEP_BLOCKED, MissionTrace, MissionTraceWriter
+from visualizer import MarsRoverVisualizer
+
+
+def _mission(seed=7, fleet=12, length=300, size=6):
+    rng = random.Random(seed)
+    mission = MissionControl(Plateau(size, size))
+    cells = rng.sample([(x, y) for x in range(size + 1) for y in range(size + 1)], fleet)
+    plan = [(mission.add_rover(x, y, rng.choice("NESW")), "".join(rng.choice("LRMM") for _ in range(length)))
+            for x, y in cells]
+    return mission, plan
+
+
+def _record(tmp_path, checkpoint_every=64, lockstep=False, idle=(), **kwargs):
+    mission, plan = _mission(**kwargs)
+    plan = [entry for i, entry in enumerate(plan) if i not in idle]  # idle rovers get no commands
+    path = str(tmp_path / "mission.trace")
+    with MissionTraceWriter(path, mission.plateau, checkpoint_every) as writer:
+        if lockstep:
+            mission.execute_lockstep(plan, writer)
+        else:
+            mission.execute_mission(plan, writer)
+    return mission, path
+
+
+class TestMissionTrace:
+    """Test recording and reading binary mission traces"""
+
+    def test_statistics_are_rebuilt_from_the_trace(self, tmp_path):
+        mission, path = _record(tmp_path)
+        with MissionTrace(path) as trace:
+            assert trace.get_mission_statistics() == mission.get_mission_statistics()
+            assert sum(rover.blocked for rover in trace.rovers()) > 0
+
+    def test_rover_summary_and_random_access(self, tmp_path):
+        mission, path = _record(tmp_path, checkpoint_every=5)
+        with MissionTrace(path) as trace:
+            assert len(trace) == len(mission.rovers)
+            for rover in mission.rovers:
+                index = mission.rovers.index(rover)
+                summary = trace.rover(index)
+                assert summary.rover_id == rover.rover_id
+                assert summary.final == (rover.x, rover.y, rover.heading)
+                assert summary.turns == rover.turn_count
+
+                states = [state[:3] for state in trace.states(index)]
+                moved = [state[:3] for state in trace.states(index) if state[3] != STEP_BLOCKED]
+                assert moved == rover.path_history[1:]
+                assert trace.state_at(index, 0) == rover.path_history[0]
+                for step in (1, 4, 5, 6, 99, len(states)):
+                    assert trace.state_at(index, step) == states[step - 1]
+                assert list(trace.steps(index, 3, 11)) == list(trace.steps(index))[3:11]
+            with pytest.raises(IndexError):
+                trace.rover(len(mission.rovers))
+
+    def test_lockstep_missions_are_traced(self, tmp_path):
+        mission, path = _record(tmp_path, lockstep=True)
+        with MissionTrace(path) as trace:
+            assert [rover.final for rover in trace.rovers()] == [
+                (rover.x, rover.y, rover.heading) for rover in mission.rovers]
+            assert trace.get_mission_statistics()['aggregates'] == mission.get_mission_statistics()['aggregates']
+
+    def test_rovers_without_commands_are_traced(self, tmp_path):
+        for lockstep in (False, True):
+            mission, path = _record(tmp_path, lockstep=lockstep, idle=(0, 5, 11))
+            with MissionTrace(path) as trace:
+                assert [rover.rover_id for rover in trace.rovers()] == [rover.rover_id for rover in mission.rovers]
+                assert trace.rover(5).steps == 0
+                assert trace.get_mission_statistics()['aggregates'] == mission.get_mission_statistics()['aggregates']
+
+    def test_trace_is_much_smaller_than_pickled_mission(self, tmp_path):
+        mission, path = _record(tmp_path, fleet=20, length=2000, size=20)
+        assert os.path.getsize(path) * 10 < len(pickle.dumps(mission))
+
+    def test_replay_keeps_recorded_collisions(self, tmp_path):
+        mission, path = _record(tmp_path)
+        with MissionTrace(path) as trace:
+            visualizer = MarsRoverVisualizer(Plateau(trace.max_x, trace.max_y), delay=0,
+                                             stream=io.StringIO(), headless=True, key_events_only=True)
+            trace.replay(visualizer)
+        assert [str(rover) for rover in visualizer.rovers] == [rover.get_position() for rover in mission.rovers]
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "not.trace"
+        path.write_bytes(b"hello world, this is not a trace file at all")
+        with pytest.raises(ValueError):
+            MissionTrace(str(path))
@@ -1,9 +1,13 @@
 import sys, os
+
+import pytest
+
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
 from hexrover.adapters.grid_nav import Plateau, GridNavigator
 from hexrover.adapters.collision_nav import CollisionNavigator, Occupancy
 from hexrover.ports import Position, Heading
+from hexrover.domain import Rover
 
 
 def test_grid_navigator_forward_and_turns():
@@ -45,4 +49,72 @@ def test_collision_navigator_blocks_and_allows_moves_and_delegates_turns():
 
     # turns delegated to inner navigator
     assert col_nav2.turn_left(Heading.N) == inner.turn_left(Heading.N)
-    assert col_nav2.turn_right(Heading.N) == inner.turn_right(Heading.N)
\ No newline at end of file
+    assert col_nav2.turn_right(Heading.N) == inner.turn_right(Heading.N)
+
+
+def test_collision_navigator_commits_moves_to_occupancy():
+    plat = Plateau(5, 5)
+    occ = Occupancy(positions={"a": Position(0, 0), "b": Position(2, 0)})
+    nav_a = CollisionNavigator(inner=GridNavigator(plat), occ=occ, self_id="a")
+    nav_b = CollisionNavigator(inner=GridNavigator(plat), occ=occ, self_id="b")
+
+    # forward() only answers; trying a move leaves the fleet as it was
+    assert nav_a.forward(Position(0, 0), Heading.E) == Position(1, 0)
+    assert occ.positions["a"] == Position(0, 0)
+
+    # a run commits its final position; b sees it and cannot back into it
+    a = Rover(Position(0, 0), Heading.E, nav_a).run("MMM")
+    assert a.position == Position(1, 0) and occ.positions["a"] == Position(1, 0)
+    assert nav_b.forward(Position(2, 0), Heading.W) == Position(2, 0)
+
+    # a's old cell is free again
+    assert not occ.is_occupied_by_other(Position(0, 0), "b")
+    assert occ.is_occupied_by_other(Position(1, 0), "b")
+    assert not occ.is_occupied_by_other(Position(1, 0), "a")
+
+    # positions is a view over the index: writes must go through commit()
+    with pytest.raises(TypeError):
+        occ.positions["b"] = Position(5, 5)
+    occ.commit("c", Position(4, 4))
+    assert occ.positions["c"] == Position(4, 4) and occ.is_occupied_by_other(Position(4, 4), "a")
+
+
+def test_grid_navigator_execute_matches_stepwise_moves():
+    """execute() on raw ints agrees with forward/turn calls, with and without obstacles"""
+    import random
+    from hexrover.adapters.terrain import BitmapObstacles
+    from hexrover.kernel import CODES, ENUMS
+
+    rng = random.Random(7)
+    commands = "".join(rng.choice("LRMMMX") for _ in range(2000))
+    for obstacles in (None, BitmapObstacles.for_plateau(6, 6, [(2, 2), (3, 4), (5, 1)])):
+        nav = GridNavigator(Plateau(6, 6, obstacles))
+        pos, heading = Position(1, 1), Heading.N
+        for c in commands:
+            if c == "M":
+                pos = nav.forward(pos, heading)
+            elif c == "L":
+                heading = nav.turn_left(heading)
+            elif c == "R":
+                heading = nav.turn_right(heading)
+        x, y, h = nav.execute(1, 1, CODES[Heading.N], commands)
+        assert (Position(x, y), ENUMS[h]) == (pos, heading)
+
+
+def test_rover_run_uses_fast_path_only_for_grid_navigators():
+    import pickle
+    from hexrover.instrumentation import Instrumentation
+
+    plateau = Plateau(5, 5)
+    fast = Rover(Position(1, 2), Heading.N, GridNavigator(plateau)).run("LMLMLMLMM")
+    instrumentation = Instrumentation()
+    slow = Rover(Position(1, 2), Heading.N,
+                 instrumentation.navigator(GridNavigator(plateau), "r")).run("LMLMLMLMM")
+    assert (fast.position, fast.heading) == (slow.position, slow.heading) == (Position(1, 3), Heading.N)
+    # wrappers without execute() still see every step
+    assert instrumentation.rover("r").forwards == 5
+
+    # slotted value types stay picklable and frozen
+    assert not hasattr(fast.position, "__dict__")
+    assert pickle.loads(pickle.dumps(fast.position)) == fast.position
+    assert pickle.loads(pickle.dumps(fast)).position == fast.position
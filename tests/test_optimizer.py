@@ -0,0 +1,87 @@
+import sys, os
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from hexrover.adapters.collision_nav import CollisionNavigator, Occupancy
+from hexrover.adapters.grid_nav import GridNavigator, Plateau as HexPlateau
+from hexrover.compat.plateau_compat import Plateau
+from hexrover.compat.rover_compat import Rover as CompatRover
+from hexrover.domain import Rover
+from hexrover.instrumentation import Instrumentation
+from hexrover.optimizer import count_turns, optimize_commands
+from hexrover.ports import Heading, Position
+from enhanced_rover import MissionControl, run_enhanced_simulation
+
+
+def _commands(rng, length=400):
+    return "".join(rng.choice("LLRRRMx") for _ in range(length))
+
+
+class TestOptimizer:
+    """Test the turn-run peephole optimizer"""
+
+    def test_turn_runs_collapse_to_canonical_forms(self):
+        assert optimize_commands("LR") == ""
+        assert optimize_commands("RL") == ""
+        assert optimize_commands("LLLL") == ""
+        assert optimize_commands("RRR") == "L"
+        assert optimize_commands("RR") == "LL"
+        assert optimize_commands("LMRRRMLLLLM") == "LMLMM"
+        # single turns and moves stay as they are; characters the engines ignore may go
+        assert optimize_commands("LMMRMMMMMM") == "LMMRMMMMMM"
+        assert optimize_commands("LRMxRMLx") in ("MxRML", "MRML")
+        assert count_turns("LMRRx") == 3
+
+    def test_every_optimized_run_is_at_most_one_turn_pair(self):
+        rng = random.Random(5)
+        for _ in range(50):
+            for run in optimize_commands(_commands(rng)).split("M"):
+                assert count_turns(run) <= 2
+
+    def test_domain_and_compat_final_states_are_identical(self):
+        rng = random.Random(9)
+        plateau = HexPlateau(6, 6)
+        for _ in range(30):
+            commands = _commands(rng)
+            start = Rover(Position(rng.randint(0, 6), rng.randint(0, 6)), Heading.N, GridNavigator(plateau))
+            plain, optimized = start.run(commands), start.run(commands, optimize=True)
+            assert (plain.position, plain.heading) == (optimized.position, optimized.heading)
+
+            legacy = CompatRover(start.position.x, start.position.y, "N", Plateau(6, 6), optimize=True)
+            legacy.execute_commands(commands)
+            assert legacy.get_state() == (plain.position.x, plain.position.y, plain.heading.value)
+
+    def test_navigator_wrappers_see_fewer_turns(self):
+        instrumentation = Instrumentation()
+        occupancy = Occupancy({"r": Position(1, 2)})
+        nav = instrumentation.navigator(CollisionNavigator(GridNavigator(HexPlateau(5, 5)), occupancy, "r"), "r")
+        rover = Rover(Position(1, 2), Heading.N, nav).run("LRLMLLLLMLMRRRMLMM", optimize=True)
+        assert (rover.position, rover.heading) == (Position(1, 3), Heading.N)
+        assert instrumentation.rover("r").turns == 4
+
+    def test_mission_turn_counts_follow_configuration(self):
+        rng = random.Random(13)
+        plan = [((x, y, h), _commands(rng, 300)) for x, y, h in ((0, 0, "N"), (3, 3, "E"), (5, 1, "S"))]
+
+        def run(**options):
+            mission = MissionControl(Plateau(5, 5), **options)
+            mission.execute_mission([(mission.add_rover(*start), commands) for start, commands in plan])
+            return mission.get_mission_statistics()
+
+        plain = run()
+        original = run(optimize=True)
+        optimized = run(optimize=True, count_original_turns=False)
+        for stats in (original, optimized):
+            assert [s.final_position for s in stats['rover_stats']] == \
+                [s.final_position for s in plain['rover_stats']]
+            assert stats['aggregates']['total_blocked_moves'] == plain['aggregates']['total_blocked_moves']
+        assert original['aggregates']['total_turns'] == plain['aggregates']['total_turns'] == \
+            sum(count_turns(commands) for _, commands in plan)
+        assert optimized['aggregates']['total_turns'] == \
+            sum(count_turns(optimize_commands(commands)) for _, commands in plan)
+        assert optimized['rover_stats'][0].path_length < plain['rover_stats'][0].path_length
+
+    def test_enhanced_simulation_opt_in(self):
+        text = "5 5\n1 2 N\nLRLMLLLLMLMRRRMLMM\n3 3 E\nMMRMMRMRRM"
+        stats = run_enhanced_simulation(text, optimize=True)
+        assert [s.final_position for s in stats['rover_stats']] == ["1 3 N", "5 1 E"]
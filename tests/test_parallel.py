@@ -0,0 +1,40 @@
+import sys, os
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from main import run_simulation
+from parallel import iter_chunks, run_simulation_parallel, simulate_parallel
+
+
+def _mission(rovers, seed=3):
+    rng = random.Random(seed)
+    lines = ["7 7"]
+    for _ in range(rovers):
+        lines.append(f"{rng.randint(0, 7)} {rng.randint(0, 7)} {rng.choice('NESW')}")
+        lines.append("".join(rng.choice("LRM") for _ in range(rng.randint(1, 40))))
+    return "\n".join(lines)
+
+
+def test_chunks_are_contiguous_and_balanced():
+    rovers = [(0, 0, "N", "M" * n) for n in (1, 1, 1, 50, 1, 1, 1, 1)]
+    chunks = list(iter_chunks(rovers, target_weight=6))
+    assert [rover for chunk in chunks for rover in chunk] == rovers
+    # the giant rover closes its own chunk instead of dragging the rest along
+    assert chunks[1] == [rovers[3]]
+    assert [len(chunk) for chunk in chunks] == [3, 1, 3, 1]
+
+
+def test_parallel_matches_sequential_order():
+    mission = _mission(200)
+    assert run_simulation_parallel(mission, workers=2) == run_simulation(mission)
+    assert run_simulation(mission, workers=2) == run_simulation(mission)
+
+
+def test_parallel_accepts_lazy_rover_streams():
+    rovers = ((i % 5, 0, "E", "M") for i in range(10))
+    results = list(simulate_parallel(5, 5, rovers, workers=2, target_weight=4))
+    assert results == [f"{min(i % 5 + 1, 5)} 0 E" for i in range(10)]
+
+
+def test_empty_mission():
+    assert run_simulation_parallel("", workers=2) == ""
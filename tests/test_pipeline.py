@@ -0,0 +1,64 @@
+import sys, os
+import bz2
+import gzip
+import io
+import lzma
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+import pytest
+
+from main import run_simulation
+from pipeline import open_input, parse_mission, run_pipeline, simulate, write_results
+
+MISSION = """5 5
+
+1 2 N
+LMLMLMLMM
+3 3 e
+mmrmmrmrrm
+"""
+
+
+def test_stages_match_run_simulation():
+    max_x, max_y, rovers = parse_mission(io.StringIO(MISSION))
+    out = io.StringIO()
+    count = write_results(simulate(max_x, max_y, rovers), out)
+    assert count == 2
+    assert out.getvalue() == run_simulation(MISSION)
+
+
+def test_rovers_are_parsed_lazily():
+    def lines():
+        yield "5 5"
+        yield "0 0 N"
+        yield "M"
+        raise AssertionError("pipeline read ahead of the rover being simulated")
+
+    _, _, rovers = parse_mission(lines())
+    results = simulate(5, 5, rovers)
+    assert next(results) == "0 1 N"
+
+
+def test_missing_command_line_is_reported():
+    _, _, rovers = parse_mission(io.StringIO("5 5\n1 1 N\n"))
+    with pytest.raises(ValueError, match="Missing command line"):
+        list(rovers)
+
+
+@pytest.mark.parametrize("opener, ext", [(gzip.open, ".gz"), (bz2.open, ".bz2"), (lzma.open, ".xz")])
+def test_compressed_input_and_output(tmp_path, opener, ext):
+    source = tmp_path / ("mission.txt" + ext)
+    with opener(source, "wt") as f:
+        f.write(MISSION)
+    sink = tmp_path / ("results.txt" + ext)
+
+    assert run_pipeline(str(source), str(sink)) == 2
+    with opener(sink, "rt") as f:
+        assert f.read() == run_simulation(MISSION)
+
+
+def test_compression_is_sniffed_not_guessed_from_name(tmp_path):
+    source = tmp_path / "mission.dat"
+    source.write_bytes(gzip.compress(MISSION.encode()))
+    with open_input(str(source)) as f:
+        assert f.read() == MISSION
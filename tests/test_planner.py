@@ -0,0 +1,107 @@
+import sys, os
+import random
+from collections import deque
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from hexrover.adapters.grid_nav import GridNavigator, Plateau
+from hexrover.adapters.terrain import BitmapObstacles
+from hexrover.domain import Rover
+from hexrover.planner import RoutePlanner, open_grid_distance, plan_route
+from hexrover.ports import Heading, Position
+
+DX = (0, 1, 0, -1)
+DY = (1, 0, -1, 0)
+
+
+def _bfs(plateau, start):
+    """Brute-force shortest command counts from `start` to every reachable state"""
+    x, y, h = start
+    dist = {(x, y, "NESW".index(h)): 0}
+    queue = deque(dist)
+    while queue:
+        x, y, h = state = queue.popleft()
+        nx, ny = x + DX[h], y + DY[h]
+        moves = [(x, y, (h + 1) % 4), (x, y, (h - 1) % 4)]
+        if plateau.is_free(nx, ny):
+            moves.append((nx, ny, h))
+        for n in moves:
+            if n not in dist:
+                dist[n] = dist[state] + 1
+                queue.append(n)
+    return dist
+
+
+def _drive(plateau, start, commands):
+    x, y, h = start
+    rover = Rover(Position(x, y), Heading(h), GridNavigator(plateau)).run(commands)
+    return rover.position.x, rover.position.y, rover.heading.value
+
+
+def test_plans_are_shortest_and_drive_to_the_goal():
+    rng = random.Random(14)
+    for _ in range(12):
+        size = rng.randint(3, 9)
+        cells = [(rng.randint(0, size), rng.randint(0, size)) for _ in range(size * 2)]
+        plateau = Plateau(size, size, BitmapObstacles.for_plateau(size, size, cells))
+        free = [(x, y) for x in range(size + 1) for y in range(size + 1) if plateau.is_free(x, y)]
+        planner = RoutePlanner(plateau)
+        goal = rng.choice(free)
+        for _ in range(8):
+            start = (*rng.choice(free), rng.choice("NESW"))
+            dist = _bfs(plateau, start)
+            best = min((d for (x, y, _), d in dist.items() if (x, y) == goal), default=None)
+            commands = planner.plan(start, goal)
+            if best is None:
+                assert commands is None
+                continue
+            assert len(commands) == best
+            assert _drive(plateau, start, commands)[:2] == goal
+
+            heading = rng.choice("NESW")
+            commands = planner.plan(start, (*goal, heading))
+            assert len(commands) == dist[(*goal, "NESW".index(heading))]
+            assert _drive(plateau, start, commands) == (*goal, heading)
+
+
+def test_open_grid_distance_is_exact_without_obstacles():
+    plateau = Plateau(6, 6)
+    for start in [(0, 0, "N"), (3, 3, "S"), (6, 2, "W")]:
+        dist = _bfs(plateau, start)
+        x, y, h = start
+        for (tx, ty, th), d in dist.items():
+            assert open_grid_distance(x, y, "NESW".index(h), tx, ty, th) == d
+
+
+def test_routes_around_a_wall_and_reports_unreachable_goals():
+    wall = BitmapObstacles.for_plateau(6, 6, [(3, y) for y in range(6)])
+    plateau = Plateau(6, 6, wall)
+    commands = plan_route(plateau, (0, 0, "E"), (6, 0))
+    assert _drive(plateau, (0, 0, "E"), commands)[:2] == (6, 0)
+    assert len(commands) == 6 + 6 + 6 + 3  # up to row 6, across, back down, three turns
+
+    wall.add(3, 6)
+    assert plan_route(Plateau(6, 6, wall), (0, 0, "E"), (6, 0)) is None
+    assert plan_route(plateau, (3, 2, "N"), (0, 0)) is None  # starting on a boulder
+
+
+def test_repeated_goal_reuses_the_search():
+    planner = RoutePlanner(Plateau(1999, 1999))
+    assert len(planner.plan((0, 0, "N"), (1999, 1999))) == 3998 + 1
+    assert planner.distance((0, 5, "E"), (1999, 1999)) == 1999 + 1994 + 1
+    assert len(planner._searches) == 1
+
+
+def test_searches_are_not_reused_across_avoid_sets():
+    plateau = Plateau(4, 0)
+    planner = RoutePlanner(plateau)
+    assert planner.plan((0, 0, "E"), (4, 0)) == "MMMM"
+    planner.avoid = {(2, 0)}  # a rover parks in the only corridor
+    assert planner.plan((0, 0, "E"), (4, 0)) is None
+    with pytest.raises(AttributeError):
+        planner.avoid.add((3, 0))  # frozen: changes go through assignment
+    planner.avoid = ()
+    assert planner.plan((1, 0, "E"), (4, 0)) == "MMM"
+    assert planner.avoid_version == 2
@@ -0,0 +1,74 @@
+import sys, os
+import io
+import json
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from recording import AsciicastRecorder, replay_recording
+from visualizer import visualize_simulation
+
+MISSION = """5 5
+1 2 N
+LMLMLMLMM
+3 3 E
+MMRMMRMRRM"""
+
+
+def _events(path):
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        return header, [json.loads(line) for line in f]
+
+
+def _no_sleeping(monkeypatch):
+    def fail(seconds):
+        raise AssertionError(f"slept {seconds}s in headless mode")
+    monkeypatch.setattr(time, "sleep", fail)
+
+
+class TestRecording:
+    """Test headless visual runs and asciicast recording"""
+
+    def test_headless_recording_never_sleeps(self, tmp_path, monkeypatch, capsys):
+        _no_sleeping(monkeypatch)
+        path = str(tmp_path / "run.cast")
+        visualize_simulation(MISSION, delay=0.5, headless=True, record=path)
+
+        header, events = _events(path)
+        assert header["version"] == 2
+        assert events
+        # Virtual time still reflects the configured delays: 2 + 9 + 10 steps * 0.5 + 1 per announcement/rover
+        assert events[-1][0] == 2 + 19 * 0.5 + 2 * 2
+        assert "1 3 N" in "".join(data for _, _, data in events)
+        assert capsys.readouterr().out == ""
+
+    def test_fewer_frames_with_every_and_key_events(self, tmp_path, monkeypatch):
+        _no_sleeping(monkeypatch)
+        counts = {}
+        for name, kwargs in [("all", {}), ("every", {"frame_every": 5}), ("keys", {"key_events_only": True})]:
+            path = str(tmp_path / f"{name}.cast")
+            visualize_simulation(MISSION, delay=0.1, differential=False, headless=True, record=path, **kwargs)
+            counts[name] = sum(data.count("\033[2J") for _, _, data in _events(path)[1])
+        # initial + 19 steps + final
+        assert counts["all"] == 21
+        # steps are counted per rover: 5 and 9 (last) for the first, 5 and 10 for the second
+        assert counts["every"] == 2 + 4
+        # no blocked moves here, so only the last step of each rover
+        assert counts["keys"] == 2 + 2
+
+    def test_replay_reproduces_output(self, tmp_path):
+        path = str(tmp_path / "run.cast")
+        with AsciicastRecorder(path) as recorder:
+            recorder.write("one ")
+            recorder.advance(1.5)
+            recorder.write("two")
+
+        waits = []
+        out = io.StringIO()
+        assert replay_recording(path, speed=3.0, stream=out, sleep=waits.append) == 2
+        assert out.getvalue() == "one two"
+        assert waits == [0.5]
+
+        waits.clear()
+        replay_recording(path, speed=0, stream=io.StringIO(), sleep=waits.append)
+        assert waits == []
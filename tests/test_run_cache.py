@@ -0,0 +1,84 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import pytest
+
+from hexrover.adapters.collision_nav import CollisionNavigator, Occupancy
+from hexrover.adapters.grid_nav import GridNavigator, Plateau
+from hexrover.cache import DIGEST_ABOVE, RunCache, default_cache
+from hexrover.domain import Rover
+from hexrover.ports import Heading, Position
+from main import run_simulation
+
+MISSION = """5 5
+1 2 N
+LMLMLMLMM
+3 3 E
+MMRMMRMRRM
+1 2 N
+LMLMLMLMM"""
+
+
+def test_cached_runs_match_and_count_hits():
+    cache = RunCache(maxsize=8)
+    rover = Rover(Position(1, 2), Heading.N, GridNavigator(Plateau(5, 5)))
+    first = cache.run(rover, "LMLMLMLMM")
+    second = cache.run(rover, "LMLMLMLMM")
+    assert first == second == rover.run("LMLMLMLMM")
+    assert cache.info() == (1, 1, 8, 1)
+
+    # an equal plateau is the same navigator as far as the cache is concerned
+    twin = Rover(Position(1, 2), Heading.N, GridNavigator(Plateau(5, 5)))
+    assert cache.run(twin, "LMLMLMLMM").position == Position(1, 3)
+    assert cache.info().hits == 2
+    # a different plateau is not
+    cache.run(Rover(Position(1, 2), Heading.N, GridNavigator(Plateau(1, 2))), "LMLMLMLMM")
+    assert cache.info().misses == 2
+
+
+def test_long_commands_are_keyed_by_digest():
+    cache = RunCache()
+    rover = Rover(Position(0, 0), Heading.N, GridNavigator(Plateau(5, 5)))
+    commands = "MMRMLL" * 5000
+    key = RunCache.key_for(rover, commands)
+    assert commands not in key and key[2][0] == len(commands)
+    assert RunCache.key_for(rover, "LMLMLMLMM")[2] == "LMLMLMLMM"  # short ones stay readable
+    assert cache.run(rover, commands) == cache.run(rover, commands) == rover.run(commands)
+    assert cache.info()[:2] == (1, 1)
+    # a one-command difference past DIGEST_ABOVE is a different entry
+    assert cache.run(rover, commands[:-1] + "R").heading == Heading.S
+    assert cache.info()[:2] == (1, 2) and len(commands) > DIGEST_ABOVE
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RunCache(maxsize=2)
+    rover = Rover(Position(0, 0), Heading.N, GridNavigator(Plateau(5, 5)))
+    cache.run(rover, "M")
+    cache.run(rover, "MM")
+    cache.run(rover, "M")      # refresh "M"
+    cache.run(rover, "MMM")    # evicts "MM"
+    assert cache.info().currsize == 2
+    cache.run(rover, "M")
+    cache.run(rover, "MM")
+    assert cache.info()[:2] == (2, 4)
+
+
+def test_stateful_navigators_are_never_cached():
+    cache = RunCache()
+    occ = Occupancy({"A": Position(0, 0), "B": Position(0, 1)})
+    nav = CollisionNavigator(GridNavigator(Plateau(5, 5)), occ, "A")
+    rover = Rover(Position(0, 0), Heading.N, nav)
+    assert cache.run(rover, "M").position == Position(0, 0)
+    occ.commit("B", Position(3, 3))
+    assert cache.run(rover, "M").position == Position(0, 1)
+    assert cache.info() == (0, 0, cache.maxsize, 0)
+
+
+def test_run_simulation_and_batch_engine_share_the_default_cache():
+    default_cache.clear()
+    assert run_simulation(MISSION) == "1 3 N\n5 1 E\n1 3 N"
+    assert default_cache.info()[:2] == (1, 2)
+
+    batch_engine = pytest.importorskip("batch_engine")
+    assert batch_engine.run_batch_simulation(MISSION) == "1 3 N\n5 1 E\n1 3 N"
+    assert default_cache.info()[:2] == (4, 2)
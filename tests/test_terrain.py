@@ -0,0 +1,160 @@
+import sys, os
+import io
+import pickle
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import pytest
+
+from hexrover.adapters.grid_nav import GridNavigator, Plateau as HexPlateau
+from hexrover.adapters.terrain import BitmapObstacles, MmapObstacles, load_obstacles
+from hexrover.cache import RunCache
+from hexrover.compat.plateau_compat import Plateau
+from hexrover.compat.rover_compat import Rover
+from hexrover.domain import Rover as CoreRover
+from hexrover.ports import Heading, Position
+from enhanced_rover import MissionControl
+from main import run_simulation
+from visualizer import MarsRoverVisualizer
+
+ROCKS = [(1, 3), (4, 1), (0, 0), (5, 5)]
+
+
+class TestObstacleMaps:
+    """Test the bitmap and memory-mapped obstacle backends"""
+
+    def test_bitmap_marks_cells(self):
+        obstacles = BitmapObstacles.for_plateau(5, 5, ROCKS)
+        assert all(obstacles.is_blocked(x, y) for x, y in ROCKS)
+        assert not obstacles.is_blocked(3, 1)
+        assert not obstacles.is_blocked(-1, 0) and not obstacles.is_blocked(6, 0)
+        assert sorted(obstacles) == sorted(ROCKS)
+
+        version = obstacles.version
+        obstacles.remove(1, 3)
+        assert not obstacles.is_blocked(1, 3)
+        assert obstacles.version > version
+        with pytest.raises(ValueError):
+            obstacles.add(6, 6)
+
+    def test_mmap_file_matches_bitmap_and_pickles_by_path(self, tmp_path):
+        path = str(tmp_path / "terrain.mrob")
+        bitmap = BitmapObstacles(7, 3, [(6, 2), (0, 1), (3, 0)])
+        bitmap.save(path)
+
+        mapped = load_obstacles(path)
+        assert isinstance(mapped, MmapObstacles)
+        assert (mapped.width, mapped.height) == (7, 3)
+        assert sorted(mapped) == sorted(bitmap)
+        assert all(mapped.is_blocked(x, y) == bitmap.is_blocked(x, y) for x in range(-1, 8) for y in range(-1, 4))
+
+        clone = pickle.loads(pickle.dumps(mapped))
+        assert clone.path == path and sorted(clone) == sorted(bitmap)
+        assert len(pickle.dumps(mapped)) < 200
+
+    def test_rectangle_queries_match_cell_probes(self, tmp_path):
+        path = str(tmp_path / "terrain.mrob")
+        bitmap = BitmapObstacles(13, 9, [(12, 8), (0, 4), (7, 0), (5, 5)])
+        bitmap.save(path)
+        for obstacles in (bitmap, MmapObstacles(path)):
+            for x0, y0, x1, y1 in ((0, 0, 12, 8), (0, 1, 12, 3), (6, 0, 6, 8), (8, 1, 11, 7), (1, 5, 5, 5),
+                                   (-4, -4, 0, 4), (12, 8, 20, 20), (3, 3, 2, 9)):
+                expected = any(obstacles.is_blocked(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+                assert obstacles.any_blocked(x0, y0, x1, y1) == expected
+
+    def test_text_obstacle_list(self, tmp_path):
+        path = tmp_path / "rocks.txt"
+        path.write_text("# boulders\n1 3\n\n4 1  # crater rim\n")
+        obstacles = load_obstacles(str(path), 5, 5)
+        assert sorted(obstacles) == [(1, 3), (4, 1)]
+        with pytest.raises(ValueError):
+            load_obstacles(str(path))
+
+
+class TestObstacleNavigation:
+    """Test that every rover type stops in front of obstacles"""
+
+    def test_grid_navigator_stops_before_obstacles(self):
+        nav = GridNavigator(HexPlateau(5, 5, BitmapObstacles.for_plateau(5, 5, ROCKS)))
+        assert nav.forward(Position(1, 2), Heading.N) == Position(1, 2)
+        assert nav.forward(Position(1, 2), Heading.E) == Position(2, 2)
+
+    def test_compat_rover_and_run_simulation(self):
+        plateau = Plateau(5, 5, BitmapObstacles.for_plateau(5, 5, ROCKS))
+        rover = Rover(1, 2, "N", plateau)
+        rover.execute_commands("MMM")
+        assert str(rover) == "1 2 N"
+
+        mission = "5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM"
+        assert run_simulation(mission) == "1 3 N\n5 1 E"
+        assert run_simulation(mission, obstacles=BitmapObstacles.for_plateau(5, 5, ROCKS)) == "1 2 N\n5 1 E"
+
+    def test_cached_runs_see_obstacle_edits(self):
+        cache = RunCache()
+        obstacles = BitmapObstacles.for_plateau(5, 5)
+        rover = CoreRover(Position(0, 0), Heading.N, GridNavigator(HexPlateau(5, 5, obstacles)))
+        assert cache.run(rover, "MM").position == Position(0, 2)
+        obstacles.add(0, 2)
+        assert cache.run(rover, "MM").position == Position(0, 1)
+
+    def test_mission_control_respects_obstacles(self):
+        mission = MissionControl(Plateau(5, 5, BitmapObstacles.for_plateau(5, 5, ROCKS)))
+        with pytest.raises(ValueError):
+            mission.add_rover(4, 1, "N")
+        rover = mission.add_rover(4, 2, "S")
+        assert not rover.can_move()
+        mission.execute_mission([(rover, "MMRM")])
+        assert rover.get_position() == "3 2 W" and rover.blocked_moves == 2
+
+    def test_parallel_workers_share_a_mapped_terrain(self, tmp_path):
+        path = str(tmp_path / "terrain.mrob")
+        BitmapObstacles.for_plateau(5, 5, ROCKS).save(path)
+        mission = "5 5\n" + "\n".join(f"{x} 2 N\nMMMRMMLM" for x in range(6))
+        obstacles = MmapObstacles(path)
+        assert run_simulation(mission, workers=2, obstacles=obstacles) == run_simulation(mission, obstacles=obstacles)
+
+
+def test_visualizer_draws_obstacles():
+    plateau = Plateau(3, 2, BitmapObstacles.for_plateau(3, 2, [(2, 1)]))
+    out = io.StringIO()
+    visualizer = MarsRoverVisualizer(plateau, delay=0, stream=out, headless=True)
+    visualizer.add_rover(Rover(0, 0, "N", plateau))
+    visualizer.draw_plateau()
+    frame = out.getvalue()
+    assert "#" in frame and "= Obstacle" in frame
+
+
+def test_zoomed_viewport_marks_blocks_holding_obstacles():
+    from visualizer import Viewport
+    plateau = Plateau(99, 99, BitmapObstacles.for_plateau(99, 99, [(57, 3), (10, 90)]))
+    visualizer = MarsRoverVisualizer(plateau, delay=0, stream=io.StringIO(), headless=True)
+    visualizer.add_rover(Rover(0, 0, "N", plateau))
+    visualizer.set_viewport(Viewport(width=10, height=10, follow=None, zoom=10))
+    blocks = {(bx, by) for bx in range(10) for by in range(10) if visualizer._block_has_obstacle(bx, by, 10)}
+    assert blocks == {(5, 0), (1, 9)}
+
+
+class RockList:
+    """Duck-typed obstacle map with only the required members (no any_blocked)"""
+    def __init__(self, width, height, cells):
+        self.width, self.height, self.version = width, height, 0
+        self.cells = set(cells)
+
+    def is_blocked(self, x, y):
+        return (x, y) in self.cells
+
+
+def test_zoomed_viewport_probes_maps_without_any_blocked():
+    from visualizer import Viewport
+    plateau = Plateau(19, 19, RockList(20, 20, [(7, 13)]))
+    visualizer = MarsRoverVisualizer(plateau, delay=0, stream=io.StringIO(), headless=True)
+    visualizer.set_viewport(Viewport(width=4, height=4, follow=None, zoom=5))
+    blocks = {(bx, by) for bx in range(4) for by in range(4) if visualizer._block_has_obstacle(bx, by, 5)}
+    assert blocks == {(1, 2)}
+
+
+def test_obstacle_maps_must_match_the_plateau():
+    with pytest.raises(ValueError, match=r"Obstacle map is 6 x 6 but the plateau is 4 x 6"):
+        Plateau(3, 5, BitmapObstacles.for_plateau(5, 5, ROCKS))
+    with pytest.raises(ValueError, match=r"Obstacle map is 3 x 3 but the plateau is 6 x 6"):
+        HexPlateau(5, 5, RockList(3, 3, []))
@@ -0,0 +1,126 @@
+import sys, os
+import io
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from hexrover.compat.plateau_compat import Plateau
+from hexrover.compat.rover_compat import Rover
+from terminal_renderer import DifferentialRenderer, CLEAR_SCREEN
+from visualizer import MarsRoverVisualizer, Viewport
+
+
+def _visualizer(plateau, *rovers):
+    renderer = DifferentialRenderer(io.StringIO(), max_fps=None)
+    visualizer = MarsRoverVisualizer(plateau, delay=0, renderer=renderer)
+    for x, y, h in rovers:
+        visualizer.add_rover(Rover(x, y, h, plateau))
+    return visualizer, renderer
+
+
+class TestDifferentialRenderer:
+    """Test the framebuffer diffing and throttling"""
+
+    def test_only_changed_cells_are_written(self):
+        stream = io.StringIO()
+        renderer = DifferentialRenderer(stream, max_fps=None)
+        renderer.put(0, 0, "a")
+        renderer.put(0, 2, "b")
+        assert renderer.present() == 2
+        assert stream.getvalue().startswith(CLEAR_SCREEN)
+
+        renderer.put(0, 0, "a")
+        renderer.put(0, 2, "c")
+        assert renderer.present() == 1
+        assert stream.getvalue().endswith("\033[1;3Hc\033[2;1H")
+
+    def test_frame_rate_is_capped(self):
+        now = [0.0]
+        slept = []
+        renderer = DifferentialRenderer(io.StringIO(), max_fps=10, clock=lambda: now[0], sleep=slept.append)
+        renderer.present()
+        now[0] = 0.04
+        renderer.present()
+        assert len(slept) == 1 and abs(slept[0] - 0.06) < 1e-9
+
+
+class TestDifferentialVisualizer:
+    """Test that incremental frames match a full repaint"""
+
+    def test_moving_a_rover_repaints_two_cells(self):
+        plateau = Plateau(20, 20)
+        visualizer, renderer = _visualizer(plateau, (1, 2, "N"), (5, 5, "E"))
+        visualizer.draw_plateau("start")
+        full = renderer.cells_written
+
+        visualizer.rover_trails[0].append((1, 2))
+        visualizer.rovers[0].move()
+        visualizer.draw_plateau("step")
+        # old cell (now trail), new cell, info line and the moved rover's legend line
+        assert renderer.cells_written - full == 4
+
+    def test_incremental_frames_match_full_paint(self):
+        plateau = Plateau(6, 4)
+        visualizer, renderer = _visualizer(plateau, (1, 2, "N"), (3, 3, "E"))
+        visualizer.draw_plateau()
+        for rover_id, commands in ((0, "LMLMRM"), (1, "MMRMM")):
+            rover = visualizer.rovers[rover_id]
+            for command in commands:
+                before = (rover.x, rover.y)
+                rover.execute_commands(command)
+                if (rover.x, rover.y) != before:
+                    visualizer.rover_trails[rover_id].append(before)
+                visualizer.draw_plateau()
+
+        fresh, fresh_renderer = _visualizer(plateau)
+        fresh.rovers, fresh.rover_trails = visualizer.rovers, visualizer.rover_trails
+        fresh.draw_plateau()
+        assert renderer._screen == fresh_renderer._screen
+
+    def test_cleared_trail_triggers_full_repaint(self):
+        plateau = Plateau(3, 3)
+        visualizer, renderer = _visualizer(plateau, (0, 0, "N"))
+        visualizer.rover_trails[0].extend([(1, 1), (2, 2)])
+        visualizer.draw_plateau()
+        visualizer.rover_trails[0] = []
+        visualizer.draw_plateau()
+        grid = [text for (row, col), text in renderer._screen.items() if col > 0]
+        assert len(grid) == 16
+        assert not any("·" in text for text in grid)
+
+
+class TestViewport:
+    """Test viewport windows and zoomed-out aggregation"""
+
+    def test_window_follows_rover_and_stays_on_plateau(self):
+        plateau = Plateau(999, 999)
+        visualizer, _ = _visualizer(plateau, (500, 500, "N"), (998, 2, "E"))
+        visualizer.set_viewport(Viewport(width=10, height=6, follow=0))
+        assert visualizer._viewport_window() == (496, 498, 10, 6, 1)
+
+        visualizer.viewport.follow = 1
+        assert visualizer._viewport_window() == (990, 0, 10, 6, 1)
+
+    def test_auto_zoom_fits_fleet(self):
+        plateau = Plateau(9999, 9999)
+        visualizer, _ = _visualizer(plateau, (10, 10, "N"), (5000, 8000, "E"))
+        visualizer.set_viewport(Viewport(width=30, height=12, follow="fleet", zoom=0))
+        left, bottom, columns, rows, zoom = visualizer._viewport_window()
+        for x, y in ((10, 10), (5000, 8000)):
+            assert left <= x // zoom < left + columns
+            assert bottom <= y // zoom < bottom + rows
+
+    def test_frame_size_depends_on_viewport_not_plateau(self):
+        plateau = Plateau(9999, 9999)
+        visualizer, renderer = _visualizer(plateau, (10, 10, "E"))
+        visualizer.rover_trails[0].extend((x, 10) for x in range(10))
+        visualizer.set_viewport(Viewport(width=8, height=4, follow=0, zoom=4))
+        visualizer.draw_plateau()
+        assert renderer.cells_written < 20
+
+    def test_zoomed_blocks_show_trail_density(self):
+        plateau = Plateau(99, 99)
+        visualizer, _ = _visualizer(plateau, (99, 99, "N"))
+        visualizer.set_viewport(Viewport(width=5, height=5, follow=None, zoom=2))
+        visualizer.rover_trails[0].extend([(0, 0), (1, 0), (0, 1), (1, 1), (2, 0)])
+        lines = visualizer._viewport_lines("", "")
+        bottom_row = lines[6 + 4]
+        assert "█" in bottom_row and "▒" in bottom_row
@@ -0,0 +1,238 @@
+"""Standard-library benchmark suite for every rover execution path.
+
+Usage (from the repo root):
+    python tools/benchmark.py                          # medium workload, print report
+    python tools/benchmark.py --scale small --save bench/baseline.json
+    python tools/benchmark.py --compare bench/baseline.json --threshold 0.15
+
+Workloads are generated deterministically from the fleet size, command
+length and plateau size, so a saved baseline can be compared later on the
+same machine. Each benchmark reports its best wall time over several
+repeats, throughput (commands/s, or frames/s for rendering) and the peak
+Python memory of one traced run. Every run starts with an empty shared run
+cache (hexrover.cache), so repeats time real work, not cache hits. With
+--compare the script exits with status 1 if any throughput dropped by more
+than --threshold.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from hexrover.adapters.grid_nav import GridNavigator, Plateau as HexPlateau  # noqa: E402
+from hexrover.cache import default_cache  # noqa: E402
+from hexrover.compat.plateau_compat import Plateau  # noqa: E402
+from hexrover.compat.rover_compat import Rover  # noqa: E402
+from hexrover.domain import Rover as CoreRover  # noqa: E402
+from hexrover.ports import Heading, Position  # noqa: E402
+from enhanced_rover import EnhancedRover, MissionControl, run_enhanced_simulation  # noqa: E402
+from visualizer import MarsRoverVisualizer  # noqa: E402
+
+SCALES = {
+    "small": dict(fleet=20, commands=200, plateau=20),
+    "medium": dict(fleet=200, commands=1000, plateau=60),
+    "large": dict(fleet=2000, commands=5000, plateau=200),
+}
+
+
+@dataclass(frozen=True)
+class Workload:
+    fleet: int
+    commands: int
+    plateau: int
+    seed: int = 473
+
+    def rovers(self) -> List[Tuple[int, int, str, str]]:
+        """Distinct start cells (so MissionControl accepts them) with random L/R/M strings"""
+        rng = random.Random(self.seed)
+        side = self.plateau + 1
+        if self.fleet > side * side:
+            raise ValueError(f"A {self.plateau} x {self.plateau} plateau cannot hold {self.fleet} rovers")
+        cells = rng.sample(range(side * side), self.fleet)
+        return [(cell % side, cell // side, rng.choice("NESW"),
+                 "".join(rng.choice("LRMM") for _ in range(self.commands)))
+                for cell in cells]
+
+    def mission_text(self) -> str:
+        lines = [f"{self.plateau} {self.plateau}"]
+        for x, y, heading, commands in self.rovers():
+            lines.append(f"{x} {y} {heading}")
+            lines.append(commands)
+        return "\n".join(lines)
+
+
+# A benchmark prepares fresh state and returns (run, operations performed by run)
+Prepare = Callable[[Workload], Tuple[Callable[[], object], int]]
+
+
+def bench_domain_run(w: Workload):
+    nav = GridNavigator(HexPlateau(w.plateau, w.plateau))
+    rovers = [(CoreRover(Position(x, y), Heading[h], nav), cmds) for x, y, h, cmds in w.rovers()]
+    return (lambda: [rover.run(cmds) for rover, cmds in rovers]), w.fleet * w.commands
+
+
+def bench_compat_execute(w: Workload):
+    plateau = Plateau(w.plateau, w.plateau)
+    rovers = [(Rover(x, y, h, plateau), cmds) for x, y, h, cmds in w.rovers()]
+    return (lambda: [rover.execute_commands(cmds) for rover, cmds in rovers]), w.fleet * w.commands
+
+
+def bench_enhanced_execute(w: Workload):
+    plateau = Plateau(w.plateau, w.plateau)
+    rovers = [(EnhancedRover(x, y, h, plateau), cmds) for x, y, h, cmds in w.rovers()]
+    return (lambda: [rover.execute_commands(cmds) for rover, cmds in rovers]), w.fleet * w.commands
+
+
+def bench_mission_collisions(w: Workload):
+    mission = MissionControl(Plateau(w.plateau, w.plateau))
+    plan = [(mission.add_rover(x, y, h), cmds) for x, y, h, cmds in w.rovers()]
+    return (lambda: mission.execute_mission(plan)), w.fleet * w.commands
+
+
+def bench_run_enhanced_simulation(w: Workload):
+    text = w.mission_text()
+    return (lambda: run_enhanced_simulation(text)), w.fleet * w.commands
+
+
+def bench_draw_plateau(w: Workload):
+    plateau = Plateau(w.plateau, w.plateau)
+    visualizer = MarsRoverVisualizer(plateau, delay=0)
+    visualizer.clear_screen = lambda: None  # never shell out from a benchmark
+    for x, y, h, cmds in w.rovers():
+        visualizer.add_rover(Rover(x, y, h, plateau))
+        visualizer.rover_trails[-1].extend((x, (y + i) % (w.plateau + 1)) for i in range(min(len(cmds), 50)))
+    frames = 10
+
+    def run():
+        with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+            for i in range(frames):
+                visualizer.draw_plateau(f"Frame {i}", "benchmark")
+
+    return run, frames
+
+
+BENCHMARKS: Dict[str, Tuple[Prepare, str]] = {
+    "domain.Rover.run": (bench_domain_run, "commands/s"),
+    "compat.Rover.execute_commands": (bench_compat_execute, "commands/s"),
+    "EnhancedRover.execute_commands": (bench_enhanced_execute, "commands/s"),
+    "MissionControl.execute_mission": (bench_mission_collisions, "commands/s"),
+    "run_enhanced_simulation": (bench_run_enhanced_simulation, "commands/s"),
+    "MarsRoverVisualizer.draw_plateau": (bench_draw_plateau, "frames/s"),
+}
+
+
+def measure(prepare: Prepare, workload: Workload, repeat: int) -> dict:
+    best = float("inf")
+    ops = 0
+    for _ in range(repeat):
+        run, ops = prepare(workload)
+        default_cache.clear()  # cold: earlier repeats must not turn this one into cache hits
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    # Prepare before tracing so the peak reflects the run, not workload generation
+    run, _ = prepare(workload)
+    default_cache.clear()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "operations": ops,
+        "throughput": ops / best if best > 0 else float("inf"),
+        "peak_kib": peak / 1024,
+    }
+
+
+def run_suite(workload: Workload, repeat: int, selected: List[str]) -> dict:
+    results = {}
+    for name, (prepare, unit) in BENCHMARKS.items():
+        if selected and not any(s in name for s in selected):
+            continue
+        result = measure(prepare, workload, repeat)
+        result["unit"] = unit
+        results[name] = result
+        print(f"  {name:36} {result['throughput']:>14,.0f} {unit:11} "
+              f"{result['seconds'] * 1000:9.1f} ms  peak {result['peak_kib']:10,.1f} KiB")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Names whose throughput fell more than `threshold` (a fraction) below the baseline"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            continue
+        change = result["throughput"] / old["throughput"] - 1
+        flag = "REGRESSION" if change < -threshold else "ok"
+        print(f"  {name:36} {change * 100:+7.1f}%  {flag}")
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every rover execution path")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium", help="Preset workload size")
+    parser.add_argument("--fleet", type=int, help="Number of rovers (overrides --scale)")
+    parser.add_argument("--commands", type=int, help="Commands per rover (overrides --scale)")
+    parser.add_argument("--plateau", type=int, help="Plateau max_x = max_y (overrides --scale)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repeats per benchmark (best is kept)")
+    parser.add_argument("--only", action="append", default=[], help="Run benchmarks whose name contains this")
+    parser.add_argument("--save", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed throughput drop before flagging a regression (default 0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    preset = SCALES[args.scale]
+    workload = Workload(fleet=args.fleet or preset["fleet"],
+                        commands=args.commands or preset["commands"],
+                        plateau=args.plateau or preset["plateau"])
+
+    print(f"Workload: {workload.fleet} rovers x {workload.commands} commands "
+          f"on {workload.plateau} x {workload.plateau}")
+    results = run_suite(workload, args.repeat, args.only)
+    report = {
+        "workload": {"fleet": workload.fleet, "commands": workload.commands,
+                     "plateau": workload.plateau, "seed": workload.seed},
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {os.path.abspath(args.save)}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("workload") != report["workload"]:
+            print("Warning: baseline was recorded with a different workload")
+        print(f"Compared with {args.compare} (threshold {args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())